@@ -13,19 +13,66 @@ Fusion optimale du moteur V2 avancé avec infrastructure FastAPI/Supabase
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any, Tuple, Set
+from typing import List, Optional, Dict, Any, Tuple, Set, Iterator, Iterable, Sequence
 from enum import Enum
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 import os
-from datetime import datetime, timedelta
+import sys
+from datetime import date, datetime
 import logging
+import asyncio
+import bisect
+import contextlib
+import pickle
+import random
+import stat
+import struct
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from supabase import create_client, Client
 import json
 import math
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+import hashlib
+import heapq
+import itertools
+import threading
 import time
 
+from batch_worker import WorkerCatalog, init_worker, score_chunk
+from catalog_providers import CatalogProvider, SQLiteCatalogProvider, SupabaseCatalogProvider
+from resolver_cache import resolver_cache_stats
+from scoring_core import (
+    FIELD_CATEGORIES,
+    INTERNATIONAL_KEYWORDS,
+    LANGUAGE_TOKENS,
+    LANGUAGE_VARIANTS,
+    LEVEL_HIERARCHY,
+    OPEN_FIELD_KEYWORDS,
+    OPEN_LEVEL_KEYWORDS,
+    OPEN_ORIGIN_KEYWORDS,
+    REGIONS,
+    SCHOLARSHIP_SELECTIVITY,
+    SELECTIVITY_KEYWORDS,
+    WEIGHTS_V2,
+    ResolvedProfile,
+    ScholarshipFeatures,
+    ScoringCore,
+    country_key,
+    estimate_memory,
+    field_key,
+    select_diversified
+)
+
+try:
+    import numpy as np
+except ImportError:  # backend vectorisé optionnel
+    np = None
+
 # ==========================================
 # CONFIGURATION LOGGING
 # ==========================================
@@ -54,165 +101,294 @@ class ScholarshipType(str, Enum):
     NEED = "Besoin"
 
 # ==========================================
-# DICTIONNAIRES DONNÉES V2 - RÉGIONS & DOMAINES
+# CATALOGUE COMPACT (LIGNES EN COLONNES)
 # ==========================================
 
-REGIONS = {
-    'europe': {
-        'countries': [
-            'france', 'allemagne', 'royaume-uni', 'suisse', 'pays-bas', 'belgique',
-            'suede', 'norvege', 'danemark', 'espagne', 'italie', 'portugal', 'grece',
-            'autriche', 'pologne', 'republique tcheque', 'hongrie', 'roumanie',
-            'bulgarie', 'croatie', 'slovenie', 'slovaquie', 'luxembourg', 'malte',
-            'chypre', 'finlande', 'irlande', 'lettonie', 'lituanie', 'estonie'
-        ],
-        'continent': 'Europe'
-    },
-    'asie_du_sud_est': {
-        'countries': [
-            'vietnam', 'thaïlande', 'cambodge', 'laos', 'malaisie', 'singapour',
-            'indonésie', 'philippines', 'birmanie', 'brunei'
-        ],
-        'continent': 'Asie'
-    },
-    'asie_du_sud': {
-        'countries': ['inde', 'pakistan', 'bangladesh', 'nepal', 'sri_lanka', 'afghanistan'],
-        'continent': 'Asie'
-    },
-    'asie_centrale': {
-        'countries': ['kazakhstan', 'ouzbekistan', 'turkmenistan', 'tadjikistan', 'kirghizstan'],
-        'continent': 'Asie'
-    },
-    'asie_de_l_est': {
-        'countries': [
-            'japon', 'chine', 'corée_du_sud', 'corée_du_nord', 'mongolie',
-            'taiwan', 'hongkong', 'macao'
-        ],
-        'continent': 'Asie'
-    },
-    'moyen_orient': {
-        'countries': [
-            'arabie_saoudite', 'iran', 'irak', 'israel', 'palestine', 'liban',
-            'syrie', 'jordanie', 'yemen', 'oman', 'emirats_arabes_unis',
-            'qatar', 'bahrein', 'koweït', 'turquie'
-        ],
-        'continent': 'Asie'
-    },
-    'afrique_du_nord': {
-        'countries': ['maroc', 'algerie', 'tunisie', 'libye', 'égypte', 'soudan'],
-        'continent': 'Afrique'
-    },
-    'afrique_subsaharienne': {
-        'countries': [
-            'afrique_du_sud', 'kenya', 'nigeria', 'ghana', 'senegal', 'ethiopie',
-            'cameroun', 'congo', 'tanzanie', 'uganda', 'malawi', 'zambie',
-            'zimbabwe', 'mozambique', 'botswana', 'namibie', 'mauritius'
-        ],
-        'continent': 'Afrique'
-    },
-    'amerique_du_nord': {
-        'countries': ['usa', 'états-unis', 'canada', 'mexique'],
-        'continent': 'Amérique du Nord'
-    },
-    'amerique_centrale': {
-        'countries': [
-            'guatemala', 'honduras', 'salvador', 'nicaragua', 'costa_rica',
-            'panama', 'belize'
-        ],
-        'continent': 'Amérique Centrale'
-    },
-    'amerique_du_sud': {
-        'countries': [
-            'colombie', 'venezuela', 'guyana', 'surinam', 'brésil', 'pérou',
-            'bolivie', 'chili', 'argentine', 'uruguay', 'paraguay', 'équateur'
-        ],
-        'continent': 'Amérique du Sud'
-    },
-    'oceanie': {
-        'countries': [
-            'australie', 'nouvelle-zélande', 'fidji', 'samoa', 'vanuatu',
-            'tonga', 'kiribati', 'marshall'
-        ],
-        'continent': 'Océanie'
-    }
-}
-
-FIELD_CATEGORIES = {
-    'informatique': [
-        'computer science', 'cs', 'software', 'programmation', 'coding',
-        'développement', 'data science', 'ia', 'machine learning', 'ai',
-        'cybersécurité', 'network', 'web development', 'développement web'
-    ],
-    'ingénierie': [
-        'engineering', 'génie', 'civil', 'mécanique', 'électrique',
-        'électronique', 'aéronautique', 'chimie', 'matériaux', 'géotechnique'
-    ],
-    'santé': [
-        'médecine', 'medicine', 'nursing', 'infirmerie', 'pharmacie',
-        'pharmacy', 'dentaire', 'dentistry', 'psychologie', 'psychology',
-        'santé publique', 'public health'
-    ],
-    'sciences': [
-        'physique', 'physics', 'chimie', 'biologie', 'biology', 'mathématiques',
-        'mathematics', 'géologie', 'astronomie', 'environnement'
-    ],
-    'commerce': [
-        'business', 'économie', 'economics', 'finance', 'accounting',
-        'comptabilité', 'management', 'marketing', 'mba', 'gestion'
-    ],
-    'droit': [
-        'law', 'droit', 'jurisprudence', 'légal', 'international_law',
-        'droit_international', 'constitutionnel'
-    ],
-    'arts': [
-        'art', 'design', 'musique', 'music', 'théâtre', 'dance', 'film',
-        'cinéma', 'photographie', 'architecture', 'beaux-arts'
-    ],
-    'humaines': [
-        'philosophie', 'histoire', 'littérature', 'langue', 'linguistics',
-        'sociologie', 'anthropologie', 'géographie', 'sciences_humaines'
-    ],
-    'éducation': [
-        'education', 'enseignement', 'pédagogie', 'formation', 'training'
-    ]
-}
-
-LANGUAGE_VARIANTS = {
-    'français': ['fr', 'french', 'fra'],
-    'anglais': ['en', 'english', 'eng'],
-    'espagnol': ['es', 'spanish', 'esp'],
-    'allemand': ['de', 'german', 'deu'],
-    'chinois': ['zh', 'chinese', 'zho', 'mandarin'],
-    'japonais': ['ja', 'japanese', 'jpn'],
-    'arabe': ['ar', 'arabic', 'ara'],
-    'russe': ['ru', 'russian', 'rus'],
-    'portugais': ['pt', 'portuguese', 'por']
-}
-
-LEVEL_HIERARCHY = {
-    'licence': 0, 'bachelor': 0, 'undergrad': 0, 'bac+3': 0,
-    'master': 1, 'maitrise': 1, 'msc': 1, 'ma': 1, 'bac+5': 1,
-    'doctorat': 2, 'phd': 2, 'doctorate': 2, 'bac+8': 2,
-    'post-doctorat': 3, 'postdoc': 3, 'post-doc': 3
-}
-
-# Poids V2 optimisés
-WEIGHTS_V2 = {
-    'country_match': 0.28,
-    'field_match': 0.22,
-    'level_match': 0.18,
-    'type_match': 0.10,
-    'origin_bonus': 0.08,
-    'language_match': 0.08,
-    'gpa_match': 0.06,
-}
-
-SCHOLARSHIP_SELECTIVITY = {
-    'très_sélective': {'gpa_min': 3.7, 'multiplier': 1.0},
-    'sélective': {'gpa_min': 3.3, 'multiplier': 0.85},
-    'modérée': {'gpa_min': 3.0, 'multiplier': 0.7},
-    'accessible': {'gpa_min': 2.5, 'multiplier': 0.5}
-}
+class _Missing:
+    """Colonne absente d'une ligne (distincte de None), picklable par référence"""
+    __slots__ = ()
+    
+    def __reduce__(self):
+        return '_MISSING'
+
+_MISSING = _Missing()
+
+class CatalogRows:
+    """
+    Lignes chaudes du catalogue stockées en colonnes (une liste par colonne)
+    au lieu d'un dict par bourse. Les chaînes sont internées : pays, domaines,
+    niveaux, types et devises répétés ne sont stockés qu'une fois. Le dict
+    d'une ligne n'est reconstruit qu'à la lecture (top-k, synchronisation).
+    """
+    __slots__ = ('columns', '_values', '_size')
+    
+    def __init__(self, columns: Tuple[str, ...], values: Tuple[List[Any], ...], size: int):
+        self.columns = columns
+        self._values = values
+        self._size = size
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "CatalogRows":
+        """Encoder des lignes (itérable consommé une seule fois)"""
+        values: Dict[str, List[Any]] = {}
+        size = 0
+        for row in rows:
+            for column, value in row.items():
+                column_values = values.get(column)
+                if column_values is None:
+                    column_values = values[column] = [_MISSING] * size
+                column_values.append(cls._compact(value))
+            size += 1
+            for column_values in values.values():
+                if len(column_values) < size:
+                    column_values.append(_MISSING)
+        return cls(tuple(values), tuple(values.values()), size)
+    
+    @staticmethod
+    def _compact(value: Any) -> Any:
+        return sys.intern(value) if type(value) is str else value
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, position: int) -> Dict:
+        row = {}
+        for column, values in zip(self.columns, self._values):
+            value = values[position]
+            if value is not _MISSING:
+                row[column] = value
+        return row
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for position in range(self._size):
+            yield self[position]
+    
+    def column(self, name: str) -> List[Any]:
+        """Valeurs d'une colonne (None si absente)"""
+        if name not in self.columns:
+            return [None] * self._size
+        return [None if v is _MISSING else v for v in self._values[self.columns.index(name)]]
+    
+    def patched(self, updates: Dict[int, Dict], appended: List[Dict]) -> "CatalogRows":
+        """Nouvelle version : lignes remplacées (par position) puis lignes ajoutées"""
+        new_rows = [*updates.values(), *appended]
+        columns = tuple(dict.fromkeys([*self.columns, *(k for row in new_rows for k in row)]))
+        values = []
+        for column in columns:
+            if column in self.columns:
+                column_values = list(self._values[self.columns.index(column)])
+            else:
+                column_values = [_MISSING] * self._size
+            for position, row in updates.items():
+                column_values[position] = self._compact(row.get(column, _MISSING))
+            column_values.extend(self._compact(row.get(column, _MISSING)) for row in appended)
+            values.append(column_values)
+        return CatalogRows(columns, tuple(values), self._size + len(appended))
+
+# ==========================================
+# CATALOGUE COLONNAIRE (BACKEND NUMPY)
+# ==========================================
+
+LANGUAGE_TOKEN_BITS = {token: 1 << i for i, token in enumerate(LANGUAGE_TOKENS)}
+SELECTIVITY_TIERS = tuple(SCHOLARSHIP_SELECTIVITY)
+
+class ColumnarCatalog:
+    """
+    Catalogue encodé en colonnes NumPy (une entrée par bourse scorable).
+    
+    - Colonnes textuelles (pays + pays cibles, domaine, type) encodées en
+      identifiants entiers : chaque valeur distincte est scorée une seule
+      fois par requête puis propagée par indexation.
+    - Niveaux (bitmask + bornes), langues (bitmask), sélectivité et
+      deadline (numéro de jour) évalués en opérations sur tableaux.
+    """
+    
+    def __init__(self, features: List[Optional[ScholarshipFeatures]]):
+        valid = [(i, f) for i, f in enumerate(features) if f is not None]
+        self.rows = np.array([i for i, _ in valid], dtype=np.int64)
+        items = [f for _, f in valid]
+        self.size = len(items)
+        
+        self.location_ids, self.locations = self._encode(items, lambda f: (f.country, f.targets))
+        self.field_ids, self.fields = self._encode(items, lambda f: f.field)
+        self.type_ids, self.types = self._encode(items, lambda f: f.scholarship_type)
+        
+        self.level_mask = np.array(
+            [sum(1 << v for v in f.level_values) for f in items], dtype=np.int64)
+        self.level_min = np.array(
+            [f.level_values[0] if f.level_values else -1 for f in items], dtype=np.int64)
+        self.level_max = np.array(
+            [f.level_values[-1] if f.level_values else -1 for f in items], dtype=np.int64)
+        self.open_level = np.array([f.open_level for f in items], dtype=bool)
+        
+        self.language_mask = np.array(
+            [sum(LANGUAGE_TOKEN_BITS[t] for t in f.languages) for f in items], dtype=np.int64)
+        self.language_probes = [f.language_probes for f in items]  # > 64 bits : entiers Python
+        self._probe_hits: Dict[int, Any] = {}
+        self.francophone = np.array([f.francophone for f in items], dtype=bool)
+        self.anglophone = np.array([f.anglophone for f in items], dtype=bool)
+        self.international = np.array([f.international for f in items], dtype=bool)
+        
+        self.selectivity = np.array(
+            [SELECTIVITY_TIERS.index(f.selectivity) for f in items], dtype=np.int64)
+        self.gpa_min = np.array(
+            [SCHOLARSHIP_SELECTIVITY[t]['gpa_min'] for t in SELECTIVITY_TIERS], dtype=np.float64)
+        
+        self.has_deadline = np.array([f.deadline_day is not None for f in items], dtype=bool)
+        self.deadline_day = np.array(
+            [f.deadline_day if f.deadline_day is not None else 0 for f in items], dtype=np.int64)
+    
+    def probe_hits(self, bit: int) -> Any:
+        """Bourses dont le texte contient la langue saisie (bit LANGUAGE_PROBE_BITS), colonne mise en cache"""
+        hits = self._probe_hits.get(bit)
+        if hits is None:
+            hits = self._probe_hits[bit] = np.array([m & bit != 0 for m in self.language_probes], dtype=bool)
+        return hits
+    
+    @staticmethod
+    def _encode(items: List[ScholarshipFeatures], key) -> Tuple[Any, List[ScholarshipFeatures]]:
+        """Encoder une colonne : identifiants entiers + représentant par valeur distincte"""
+        codes: Dict[Any, int] = {}
+        representatives = []
+        ids = np.empty(len(items), dtype=np.int64)
+        for i, f in enumerate(items):
+            k = key(f)
+            code = codes.get(k)
+            if code is None:
+                code = codes[k] = len(representatives)
+                representatives.append(f)
+            ids[i] = code
+        return ids, representatives
+
+class CandidateIndex:
+    """
+    Index inversés du catalogue (backend scalaire) : valeur distincte d'un
+    critère -> positions des bourses. Les valeurs "ouvertes" (monde, tous
+    domaines, tous niveaux) forment leurs propres entrées.
+    
+    - locations : (pays, pays cibles) -> scores pays + origine
+    - fields : domaine -> score domaine
+    - levels : (niveaux, ouvert) -> score niveau
+    - types : type de bourse -> score type
+    - languages : langues détectées -> score langue (scindé par requête si la
+      langue saisie est cherchée dans le texte)
+    - selectivities : sélectivité -> score GPA
+    - deadlines : numéros de jour triés (paliers de boost par bissection)
+    """
+    
+    def __init__(self, features: List[Optional[ScholarshipFeatures]]):
+        self.positions = [i for i, f in enumerate(features) if f is not None]
+        self.size = len(self.positions)
+        self.locations = self._postings(features, lambda f: (f.country, f.targets))
+        self.fields = self._postings(features, lambda f: f.field)
+        self.levels = self._postings(features, lambda f: (f.level_values, f.open_level))
+        self.types = self._postings(features, lambda f: f.scholarship_type)
+        self.languages = self._postings(
+            features, lambda f: (f.languages, f.francophone, f.anglophone, f.international))
+        self.selectivities = self._postings(features, lambda f: f.selectivity)
+        
+        deadlines = sorted((f.deadline_day, i) for i, f in enumerate(features)
+                           if f is not None and f.deadline_day is not None)
+        self.deadline_keys = [d for d, _ in deadlines]
+        self.deadline_positions = [i for _, i in deadlines]
+    
+    @staticmethod
+    def _postings(features: List[Optional[ScholarshipFeatures]],
+                  key) -> List[Tuple[ScholarshipFeatures, List[int]]]:
+        """(représentant, positions) par valeur distincte"""
+        postings: Dict[Any, Tuple[ScholarshipFeatures, List[int]]] = {}
+        for i, f in enumerate(features):
+            if f is None:
+                continue
+            entry = postings.get(key(f))
+            if entry is None:
+                entry = postings[key(f)] = (f, [])
+            entry[1].append(i)
+        return list(postings.values())
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Version immuable du catalogue, publiée atomiquement : une requête lit
+    une seule référence et ne voit jamais un catalogue à moitié reconstruit.
+    """
+    version: int
+    scholarships: CatalogRows
+    features: List[Optional[ScholarshipFeatures]]
+    columnar: Optional[ColumnarCatalog]
+    index: Optional[CandidateIndex]
+    countries: int
+    positions_by_id: Dict[Any, int]
+    fingerprint: str  # empreinte du contenu scoré, stable entre processus
+
+# ==========================================
+# SNAPSHOT DISQUE DU CATALOGUE (DÉMARRAGE À FROID)
+# ==========================================
+
+class CatalogFile:
+    """
+    Catalogue pré-calculé persisté sur disque : lignes, caractéristiques et
+    structures de scoring picklées derrière un en-tête versionné (format +
+    empreinte des règles d'extraction). Écriture atomique (fichier temporaire
+    + os.replace). Chaque processus désérialise sa propre copie au démarrage.
+    
+    Le contenu est désérialisé par pickle : le répertoire doit appartenir à
+    l'utilisateur du service et n'être inscriptible que par lui, le fichier
+    aussi (sinon snapshot refusé).
+    """
+    MAGIC = b'SMCATLG\x00'
+    FORMAT_VERSION = 2
+    HEADER = struct.Struct('<8sI32s')  # magic, format, empreinte du schéma
+    
+    def __init__(self, path: str, schema: Sequence[Any]):
+        self.path = path
+        payload = json.dumps([self.FORMAT_VERSION, *schema], sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.sha256(payload.encode('utf-8')).digest()
+    
+    @staticmethod
+    def _check_owner(st: os.stat_result, what: str):
+        """Refuser un fichier / répertoire d'un autre utilisateur ou inscriptible par d'autres"""
+        if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+            raise PermissionError(f"{what} n'appartient pas à l'utilisateur du service")
+        if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"{what} est inscriptible par d'autres utilisateurs")
+    
+    def _check_directory(self):
+        """Répertoire du snapshot privé au service (PermissionError sinon)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        self._check_owner(os.stat(directory), f"Répertoire {directory}")
+    
+    def save(self, payload: Dict[str, Any]):
+        """Écrire le snapshot (les lecteurs voient l'ancien ou le nouveau fichier, jamais un mélange)"""
+        self._check_directory()
+        fd, tmp_path = tempfile.mkstemp(prefix='.catalog-', dir=os.path.dirname(self.path) or '.')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, self.digest))
+                pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Contenu du snapshot (None si absent, d'un autre format ou d'autres règles).
+        PermissionError si le répertoire ou le fichier n'est pas privé au service.
+        """
+        self._check_directory()
+        try:
+            fh = open(self.path, 'rb')
+        except FileNotFoundError:
+            return None
+        with fh:
+            self._check_owner(os.fstat(fh.fileno()), f"Fichier {self.path}")
+            header = fh.read(self.HEADER.size)
+            if len(header) < self.HEADER.size or \
+               self.HEADER.unpack(header) != (self.MAGIC, self.FORMAT_VERSION, self.digest):
+                return None
+            return pickle.load(fh)
 
 # ==========================================
 # MODÈLES PYDANTIC
@@ -284,6 +460,257 @@ class BatchRecommendationsResponse(BaseModel):
     results: List[RecommendationsResponse]
     timestamp: str
 
+class BatchStreamSummary(BaseModel):
+    """Dernière ligne d'un batch en streaming (NDJSON)"""
+    status: str = "success"
+    totalProcessed: int
+    totalFailed: int
+    timestamp: str
+
+# ==========================================
+# CACHE DES RÉSULTATS PAR PROFIL
+# ==========================================
+
+class RecommendationCache:
+    """Cache LRU + TTL des recommandations formatées, thread-safe"""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Lire une entrée (None si absente ou expirée)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, value: Any):
+        """Ajouter une entrée (éviction LRU au-delà de max_entries)"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Vider le cache (nouvelle version du catalogue)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques hit/miss"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxEntries': self.max_entries,
+                'ttlSeconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / total, 3) if total else 0.0
+            }
+
+# ==========================================
+# EXÉCUTION DU SCORING (HORS BOUCLE ASYNCIO)
+# ==========================================
+
+class ScoringOverloaded(Exception):
+    """Capacité de scoring saturée (workers occupés + file d'attente pleine)"""
+    
+    def __init__(self, retry_after_seconds: int):
+        super().__init__("Capacité de scoring saturée, réessayez plus tard")
+        self.retry_after_seconds = retry_after_seconds
+
+class ScoringExecutor:
+    """
+    Pool borné de threads pour le scoring (CPU) : la boucle asyncio reste libre
+    (/health, autres requêtes). Au-delà de max_workers + max_queue tâches en
+    cours, les nouvelles tâches sont refusées (ScoringOverloaded) au lieu de
+    s'accumuler.
+    """
+    
+    def __init__(self, max_workers: int, max_queue: int, retry_after_seconds: int = 1):
+        if max_workers < 1:
+            raise ValueError("max_workers doit être >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue doit être >= 0")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scoring')
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    async def run(self, func, *args):
+        """
+        Exécuter func(*args) dans le pool (ScoringOverloaded si saturé). La tâche
+        reste comptée jusqu'à la fin de son exécution, même si l'appelant est
+        annulé entre-temps (client déconnecté).
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ScoringOverloaded(self.retry_after_seconds)
+            self._in_flight += 1
+        
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+    
+    def _release(self, future):
+        """Libérer la place d'une tâche terminée (ou annulée avant son démarrage)"""
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+    
+    def shutdown(self):
+        """Arrêter le pool (tâches en cours terminées)"""
+        self._executor.shutdown(wait=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Occupation du pool"""
+        with self._lock:
+            return {
+                'maxWorkers': self.max_workers,
+                'maxQueue': self.max_queue,
+                'inFlight': self._in_flight,
+                'queued': max(0, self._in_flight - self.max_workers),
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+class BatchProcessPool:
+    """
+    Pool de processus pour /recommendations/batch : les profils (résolus) sont
+    répartis en lots entre les workers, qui scorent et diversifient ; raisons
+    et formatage restent dans ce processus, cache de résultats compris.
+    
+    Les workers démarrent sur batch_worker (noyau de scoring seul : ni l'API,
+    ni Supabase, ni le moteur global) et reçoivent une fois, à l'initialisation,
+    les caractéristiques des bourses et leurs clés de diversification. Chaque
+    worker en garde sa propre copie (pas de mémoire partagée : ce sont des
+    objets Python) : environ catalogMemoryBytes.features (/health) de plus par
+    worker. Scoring complet en Python (ScoringCore) : utile sans NumPy ou sur
+    une machine à nombreux cœurs. Pool recréé à chaque nouvelle version du
+    catalogue ; désactivé par défaut (max_workers = 0).
+    """
+    
+    CHUNKS_PER_WORKER = 4  # lots par worker (équilibrage de charge)
+    MIN_PROFILES = 16  # en dessous, scoring dans le processus courant
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._catalog_version: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def accepts(self, batch_size: int) -> bool:
+        """Batch assez grand pour justifier le pool de processus"""
+        return self.max_workers > 0 and batch_size >= self.MIN_PROFILES
+    
+    def recommend_many(self, engine: "HybridRecommendationEngineV2Plus", profiles: List["UserProfileRequest"],
+                       today: Optional[int] = None) -> List[Tuple[bool, Any]]:
+        """
+        Scorer les profils en parallèle ; résultats dans l'ordre d'entrée, au
+        format de recommend_batch (profils identiques et résultats en cache
+        calculés une fois)
+        """
+        snapshot = engine._current_snapshot()
+        if snapshot is None:
+            raise RuntimeError("Catalogue non chargé")
+        if today is None:
+            today = engine.core.today()
+        
+        executor = self._executor_for(engine, snapshot)
+        total_analyzed = len(snapshot.scholarships)
+        outcomes: List[Optional[Tuple[bool, Any]]] = [None] * len(profiles)
+        
+        pending: "OrderedDict[str, List[int]]" = OrderedDict()
+        for index, profile in enumerate(profiles):
+            cache_key = engine._result_cache_key(profile, snapshot.version, today)
+            cached = engine._result_cache.get(cache_key)
+            if cached is not None:
+                outcomes[index] = (True, (cached, total_analyzed, 0.0))
+            else:
+                pending.setdefault(cache_key, []).append(index)
+        
+        keys = list(pending)
+        users = [profiles[pending[key][0]] for key in keys]
+        resolved = [engine.resolve_profile(user) for user in users]
+        chunk_size = max(1, math.ceil(len(keys) / (self.max_workers * self.CHUNKS_PER_WORKER)))
+        chunks = [resolved[i:i + chunk_size] for i in range(0, len(resolved), chunk_size)]
+        results: List[Tuple[bool, Any]] = []
+        for chunk_outcomes in executor.map(score_chunk, chunks, itertools.repeat(today),
+                                           itertools.repeat(engine.MAX_RESULTS)):
+            results.extend(chunk_outcomes)
+        
+        for cache_key, user, (succeeded, result) in zip(keys, users, results):
+            if succeeded:
+                selected, execution_time = result
+                formatted_recs = engine._format_results(user, [
+                    {'scholarship': snapshot.scholarships[position], 'score_data': score_data}
+                    for position, score_data in selected
+                ])
+                engine._result_cache.put(cache_key, formatted_recs)
+                outcome = (True, (formatted_recs, total_analyzed, execution_time))
+            else:
+                outcome = (False, result)
+            for index in pending[cache_key]:
+                outcomes[index] = outcome
+        return outcomes
+    
+    def _executor_for(self, engine: "HybridRecommendationEngineV2Plus",
+                      snapshot: "CatalogSnapshot") -> ProcessPoolExecutor:
+        """Pool courant, recréé si le catalogue a changé de version"""
+        with self._lock:
+            if self._executor is None or self._catalog_version != snapshot.version:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)  # lots en cours terminés
+                logger.info(f"⚙️  Pool batch: {self.max_workers} worker(s), catalogue v{snapshot.version}")
+                catalog = WorkerCatalog(
+                    features=snapshot.features,
+                    diversity_keys=[(country_key(row.get('pays')), field_key(row.get('domaine_etude')))
+                                    for row in snapshot.scholarships],
+                    countries=snapshot.countries,
+                    core=engine.core,
+                    candidate_pool=engine.CANDIDATE_POOL,
+                    max_per_country=engine.max_per_country,
+                    max_per_field=engine.max_per_field
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_worker,
+                    initargs=(catalog,)
+                )
+                self._catalog_version = snapshot.version
+            return self._executor
+    
+    def shutdown(self):
+        """Arrêter les workers"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._catalog_version = None
+
 # ==========================================
 # MOTEUR V2+ HYBRIDE INTÉGRÉ
 # ==========================================
@@ -297,21 +724,100 @@ class HybridRecommendationEngineV2Plus:
     ✅ Diversification intelligente
     ✅ Boost deadline
     ✅ Cache 1h
+    ✅ Cache des résultats par profil (LRU + TTL)
+    ✅ Rafraîchissement du catalogue en tâche de fond (stale-while-revalidate)
+    ✅ Noyau de scoring et source du catalogue interchangeables (Supabase, SQLite, mémoire)
     """
     
     MAX_RESULTS = 10
     CACHE_DURATION_MINUTES = 60
+    RESULT_CACHE_SIZE = 1024
+    RESULT_CACHE_TTL_SECONDS = 300
+    SYNC_WATERMARK_COLUMN = 'updated_at'  # synchronisation incrémentale
+    FULL_RELOAD_HOURS = 24  # rechargement complet (suppressions) au moins 1x/jour
+    CANDIDATE_POOL = 200  # meilleurs candidats entièrement triés avant diversification
+    PRUNED_CANDIDATE_POOL = 20  # pool initial du backend scalaire (chaque candidat coûte un scoring complet)
+    PRUNE_MAX_FRACTION = 0.5  # au-delà, l'index n'élague plus assez : scan complet
+    PRUNE_EPSILON = 1e-9  # marge sur la borne (ordre des additions flottantes)
+    PRUNE_MAX_TIERS = 16  # paliers choisis un à un par critère (au-delà : tous les paliers)
+    PRUNE_MAX_PLAN_NODES = 20000  # nœuds explorés par recherche de paliers (borne le coût)
+    REFRESH_INTERVAL_SECONDS = 300  # rafraîchissement en tâche de fond
+    REFRESH_JITTER = 0.1  # +/- 10% sur chaque intervalle
+    REFRESH_RETRY_SECONDS = 5  # backoff exponentiel après erreur Supabase
+    REFRESH_MAX_BACKOFF_SECONDS = 600
+    PRECOMPUTED_TABLE = 'profile_recommendations'  # résultats du job hors ligne
+    PRECOMPUTED_MAX_FAILURES = 3  # erreurs consécutives avant désactivation jusqu'au prochain catalogue
+    BATCH_BLOCK_CELLS = 2_000_000  # cellules (profils x bourses) par bloc de scoring batch
+    LOAD_PAGE_SIZE = 1000  # lignes par requête (chargement paginé)
+    LOAD_COLUMNS = (
+        'id', 'titre', 'description', 'pays', 'pays_cibles', 'domaine_etude',
+        'niveau_etude', 'type_bourse', 'date_limite', 'montant', 'devise'
+    )
+    COLD_COLUMNS = ('description',)  # lues pour le pré-calcul puis libérées
     
-    def __init__(self, supabase_client: Optional[Client] = None):
+    def __init__(self, supabase_client: Optional[Client] = None, scoring_backend: str = 'auto',
+                 max_per_country: Optional[int] = None, max_per_field: Optional[int] = None,
+                 use_precomputed: bool = False, snapshot_path: Optional[str] = None,
+                 catalog_provider: Optional[CatalogProvider] = None,
+                 scoring_core: Optional[ScoringCore] = None):
+        """
+        Args:
+            supabase_client: Client Supabase (None = mode déconnecté)
+            scoring_backend: 'vectorized' (NumPy), 'scalar' (boucle Python)
+                ou 'auto' (NumPy si disponible)
+            max_per_country: Plafond de bourses par pays (None = sans plafond)
+            max_per_field: Plafond de bourses par domaine (None = sans plafond)
+            use_precomputed: Servir les recommandations pré-calculées (PRECOMPUTED_TABLE)
+            snapshot_path: Fichier du snapshot disque du catalogue (None = désactivé)
+            catalog_provider: Source du catalogue (défaut : table scholarship de supabase_client)
+            scoring_core: Règles de scoring (défaut : ScoringCore())
+        """
+        if (max_per_country is not None and max_per_country < 1) or \
+           (max_per_field is not None and max_per_field < 1):
+            raise ValueError("Les plafonds de diversification doivent être >= 1")
+        
         self.supabase = supabase_client
-        self._scholarships_cache = None
+        if catalog_provider is None and supabase_client is not None:
+            catalog_provider = SupabaseCatalogProvider(supabase_client, self.LOAD_PAGE_SIZE)
+        self.catalog_provider = catalog_provider
+        self.core = scoring_core or ScoringCore()
+        self.max_per_country = max_per_country
+        self.max_per_field = max_per_field
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._watermark: Optional[str] = None
+        self._watermark_available = self.SYNC_WATERMARK_COLUMN is not None and \
+            catalog_provider is not None and catalog_provider.incremental
+        self._full_sync_timestamp: Optional[datetime] = None
         self._cache_timestamp = None
-        logger.info("✅ HybridRecommendationEngineV2Plus initialized")
+        self._refresh_lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._result_cache = RecommendationCache(self.RESULT_CACHE_SIZE, self.RESULT_CACHE_TTL_SECONDS)
+        self._deadline_columns_cache: Optional[Tuple[Any, int, Tuple[Any, Any, Any]]] = None
+        self._shared_values: Dict[Any, Any] = {}  # tuples / frozensets égaux partagés entre bourses
+        self._memory_report: Optional[Tuple[int, Dict[str, int]]] = None
+        self.use_precomputed = use_precomputed
+        self._precomputed_available = use_precomputed
+        self._precomputed_failures = 0
+        # Clés (profil, catalogue, jour) sans ligne pré-calculée : pas de nouvel aller-retour avant le TTL
+        self._precomputed_misses = RecommendationCache(self.RESULT_CACHE_SIZE, self.RESULT_CACHE_TTL_SECONDS)
+        self._catalog_file = CatalogFile(snapshot_path, self._catalog_schema()) if snapshot_path else None
+        
+        if scoring_backend == 'auto':
+            scoring_backend = 'vectorized' if np is not None else 'scalar'
+        if scoring_backend == 'vectorized' and np is None:
+            raise ValueError("Backend 'vectorized' indisponible: numpy non installé")
+        self.scoring_backend = scoring_backend
+        logger.info(f"✅ HybridRecommendationEngineV2Plus initialized (backend {scoring_backend})")
     
-    def recommend(self, user_profile: UserProfileRequest) -> Tuple[List[Dict[str, Any]], int, float]:
+    def recommend(self, user_profile: UserProfileRequest,
+                  today: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int, float]:
         """
         Générer recommandations pour utilisateur
         
+        Args:
+            user_profile: Profil de l'utilisateur
+            today: Jour de référence (numéro de jour, défaut : aujourd'hui)
+        
         Returns:
             - List of recommendations (max 10)
             - Total scholarships analyzed
@@ -320,44 +826,47 @@ class HybridRecommendationEngineV2Plus:
         start_time = time.time()
         
         try:
-            # 1. Charger les bourses
-            scholarships = self._load_scholarships()
-            if not scholarships:
+            # 1. Charger les bourses (snapshot courant du catalogue)
+            snapshot = self._current_snapshot()
+            if snapshot is None or not snapshot.scholarships:
                 logger.warning("❌ Aucune bourse trouvée")
                 return [], 0, 0
             
+            scholarships = snapshot.scholarships
             total_analyzed = len(scholarships)
-            logger.info(f"📊 Analyse de {total_analyzed} bourses")
             
-            # 2. Scorer toutes les bourses avec V2
-            scored_scholarships = []
-            for scholarship in scholarships:
-                score_result = self._calculate_score_v2(user_profile, scholarship)
-                if score_result:
-                    scored_scholarships.append({
-                        'scholarship': scholarship,
-                        'score_data': score_result
-                    })
+            # Jour de référence unique pour toute la requête (deadlines, cache, pré-calcul)
+            if today is None:
+                today = self.core.today()
             
-            # 3. Trier par score décroissant
-            scored_scholarships.sort(
-                key=lambda x: x['score_data']['overall_score'],
-                reverse=True
-            )
+            # Résultat déjà calculé pour ce profil (même catalogue, même jour)
+            cache_key = self._result_cache_key(user_profile, snapshot.version, today)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                execution_time = (time.time() - start_time) * 1000
+                logger.info(f"💾 Recommandations servies depuis le cache ({execution_time:.1f}ms)")
+                return cached, total_analyzed, execution_time
             
-            # 4. Appliquer diversification
-            final_recommendations = self._diversify_results(scored_scholarships, self.MAX_RESULTS)
+            # Résultat pré-calculé par le job hors ligne (même profil, même catalogue, même jour)
+            precomputed = self._load_precomputed(user_profile, snapshot, today, cache_key)
+            if precomputed is not None:
+                self._result_cache.put(cache_key, precomputed)
+                execution_time = (time.time() - start_time) * 1000
+                logger.info(f"📦 Recommandations pré-calculées servies ({execution_time:.1f}ms)")
+                return precomputed, total_analyzed, execution_time
             
-            logger.info(f"🎯 Retour de {len(final_recommendations)} recommandations (max {self.MAX_RESULTS})")
+            logger.info(f"📊 Analyse de {total_analyzed} bourses")
             
-            # 5. Formatter résultats
-            formatted_recs = []
-            for item in final_recommendations:
-                formatted = self._format_recommendation(
-                    item['scholarship'],
-                    item['score_data']
-                )
-                formatted_recs.append(formatted)
+            # 2. Scorer toutes les bourses avec V2
+            if snapshot.columnar is not None:
+                vectorized = self._score_vectorized(user_profile, snapshot.columnar, today)
+                formatted_recs = self._finalize_vectorized(user_profile, snapshot, vectorized)
+            else:
+                rank = self._pruned_ranker(user_profile, snapshot, today)
+                formatted_recs = self._finalize(user_profile, snapshot, rank, snapshot.index.size, None,
+                                                self.PRUNED_CANDIDATE_POOL)
+            
+            self._result_cache.put(cache_key, formatted_recs)
             
             execution_time = (time.time() - start_time) * 1000
             logger.info(f"⏱️  Temps d'exécution: {execution_time:.1f}ms")
@@ -368,373 +877,950 @@ class HybridRecommendationEngineV2Plus:
             logger.error(f"❌ Erreur: {str(e)}")
             raise
     
-    def _load_scholarships(self) -> List[Dict]:
-        """Charger bourses avec cache 1h"""
+    def recommend_batch(self, user_profiles: List[UserProfileRequest],
+                        today: Optional[int] = None) -> List[Tuple[bool, Any]]:
+        """
+        Recommandations pour plusieurs profils (jobs hors ligne, /recommendations/batch).
+        Backend vectorisé : les profils sont encodés en matrices (profils x bourses)
+        calculées par blocs d'au plus BATCH_BLOCK_CELLS cellules ; profils
+        identiques et résultats en cache ne sont calculés qu'une fois.
+        today : jour de référence commun à tous les profils (défaut : aujourd'hui).
+        
+        Returns:
+            Pour chaque profil, dans l'ordre : (True, (recommandations, total analysé,
+            temps ms)) ou (False, message d'erreur)
+        """
+        if today is None:
+            today = self.core.today()
+        snapshot = self._current_snapshot()
+        if snapshot is None or not snapshot.scholarships or snapshot.columnar is None:
+            return [self._recommend_outcome(profile, today) for profile in user_profiles]
+        
+        total_analyzed = len(snapshot.scholarships)
+        outcomes: List[Optional[Tuple[bool, Any]]] = [None] * len(user_profiles)
+        
+        # Résultats en cache, puis regroupement des profils identiques
+        pending: "OrderedDict[str, List[int]]" = OrderedDict()
+        for index, profile in enumerate(user_profiles):
+            cache_key = self._result_cache_key(profile, snapshot.version, today)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                outcomes[index] = (True, (cached, total_analyzed, 0.0))
+            else:
+                pending.setdefault(cache_key, []).append(index)
+        
+        columnar = snapshot.columnar
+        keys = list(pending)
+        block_size = max(1, self.BATCH_BLOCK_CELLS // max(1, columnar.size))
+        has_deadline, days_left, deadline_boost = self._deadline_columns(columnar, today)
+        logger.info(f"📦 Batch: {len(user_profiles)} profils, {len(keys)} à calculer "
+                    f"(blocs de {block_size} x {columnar.size})")
+        
+        for block_start in range(0, len(keys), block_size):
+            start_time = time.time()
+            block_keys = keys[block_start:block_start + block_size]
+            users = [user_profiles[pending[key][0]] for key in block_keys]
+            
+            # Matrices (profils x bourses) par critère, puis score global en une opération
+            memo: Dict[Tuple[str, Any], Any] = {}
+            columns = [self._vectorized_columns(user, columnar, memo) for user in users]
+            matrices = {name: np.stack([c[name] for c in columns]) for name in columns[0]}
+            overall_matrix = self._vectorized_overall(matrices, deadline_boost)
+            
+            block_outcomes = []
+            for row, (cache_key, user) in enumerate(zip(block_keys, users)):
+                try:
+                    vectorized = {
+                        'overall_score': overall_matrix[row],
+                        'scores': {name: matrix[row] for name, matrix in matrices.items()},
+                        'has_deadline': has_deadline,
+                        'days_left': days_left,
+                        'deadline_boost': deadline_boost
+                    }
+                    formatted_recs = self._finalize_vectorized(user, snapshot, vectorized)
+                    self._result_cache.put(cache_key, formatted_recs)
+                    block_outcomes.append((True, formatted_recs))
+                except Exception as e:
+                    logger.warning(f"⚠️  Erreur pour {user.full_name}: {str(e)}")
+                    block_outcomes.append((False, str(e)))
+            
+            # Temps du bloc réparti entre ses profils
+            execution_time = (time.time() - start_time) * 1000 / len(block_keys)
+            for cache_key, (succeeded, result) in zip(block_keys, block_outcomes):
+                outcome = (True, (result, total_analyzed, execution_time)) if succeeded else (False, result)
+                for index in pending[cache_key]:
+                    outcomes[index] = outcome
+        
+        return outcomes
+    
+    def _recommend_outcome(self, user_profile: UserProfileRequest,
+                           today: Optional[int] = None) -> Tuple[bool, Any]:
+        """recommend() sous forme (succès, résultat ou message d'erreur)"""
+        try:
+            return True, self.recommend(user_profile, today)
+        except Exception as e:
+            return False, str(e)
+    
+    def _finalize_vectorized(self, user: UserProfileRequest, snapshot: CatalogSnapshot,
+                             vectorized: Dict[str, Any]) -> List[Dict]:
+        """Top-k, diversification et formatage depuis les colonnes de scores NumPy"""
+        columnar = snapshot.columnar
+        
+        def rank(k: int) -> List[Dict]:
+            return [
+                {'scholarship': snapshot.scholarships[columnar.rows[p]], 'position': p}
+                for p in self._top_k_positions(vectorized['overall_score'], k)
+            ]
+        
+        return self._finalize(user, snapshot, rank, columnar.size, vectorized)
+    
+    def _finalize(self, user: UserProfileRequest, snapshot: CatalogSnapshot, rank,
+                  total_scored: int, vectorized: Optional[Dict[str, Any]],
+                  pool_size: Optional[int] = None) -> List[Dict]:
+        """Top-k (tri partiel), diversification puis formatage des résultats"""
+        final_recommendations = self._select_diversified(
+            rank, total_scored, self.MAX_RESULTS, snapshot.countries, pool_size
+        )
+        
+        logger.info(f"🎯 Retour de {len(final_recommendations)} recommandations (max {self.MAX_RESULTS})")
+        return self._format_results(user, final_recommendations, vectorized)
+    
+    def _format_results(self, user: UserProfileRequest, items: List[Dict],
+                        vectorized: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Raisons et formatage des bourses retenues (top-k seulement)"""
+        formatted_recs = []
+        for item in items:
+            score_data = item.get('score_data') or self._vectorized_score_data(vectorized, item['position'])
+            # Explications générées pour le top-k seulement
+            reasons = self._generate_reasons_v2(user, item['scholarship'], score_data['scores'])
+            formatted_recs.append(self._format_recommendation(item['scholarship'], score_data, reasons))
+        return formatted_recs
+    
+    @property
+    def catalog_version(self) -> int:
+        """Version du catalogue publié (0 = pas encore chargé)"""
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else 0
+    
+    @property
+    def catalog_fingerprint(self) -> Optional[str]:
+        """Empreinte du catalogue publié (identique d'un processus à l'autre)"""
+        snapshot = self._snapshot
+        return snapshot.fingerprint if snapshot else None
+    
+    def _current_snapshot(self) -> Optional[CatalogSnapshot]:
+        """
+        Snapshot courant du catalogue. Sans tâche de fond (scripts, tests),
+        le cache 1h est vérifié et rafraîchi en ligne comme auparavant.
+        """
+        if self._refresh_task is None:
+            self._load_scholarships()
+        return self._snapshot
+    
+    def _load_scholarships(self) -> Sequence[Dict]:
+        """Charger bourses avec cache 1h (synchronisation incrémentale si possible)"""
+        snapshot = self._snapshot
         try:
             # Vérifier cache
-            if self._scholarships_cache and self._cache_timestamp:
+            if snapshot and snapshot.scholarships and self._cache_timestamp:
                 age_minutes = (datetime.now() - self._cache_timestamp).total_seconds() / 60
                 if age_minutes < self.CACHE_DURATION_MINUTES:
-                    logger.info(f"💾 Cache utilisé ({age_minutes:.1f}min, {len(self._scholarships_cache)} bourses)")
-                    return self._scholarships_cache
+                    logger.info(f"💾 Cache utilisé ({age_minutes:.1f}min, {len(snapshot.scholarships)} bourses)")
+                    return snapshot.scholarships
             
-            # Charger depuis Supabase
-            if not self.supabase:
-                logger.warning("⚠️  Client Supabase non initialisé")
+            # Charger depuis la source du catalogue
+            if self.catalog_provider is None:
+                logger.warning("⚠️  Source du catalogue non configurée")
                 return []
             
-            logger.info("📥 Chargement depuis Supabase...")
-            response = self.supabase.table('scholarship').select('*').execute()
-            
-            scholarships = response.data if response.data else []
-            logger.info(f"✅ {len(scholarships)} bourses chargées")
-            
-            # Cache
-            self._scholarships_cache = scholarships
-            self._cache_timestamp = datetime.now()
-            
-            return scholarships
+            return self.refresh_catalog().scholarships
         
         except Exception as e:
             logger.error(f"❌ Erreur chargement: {str(e)}")
-            return []
+            # Stale-while-revalidate : conserver la dernière version connue
+            return snapshot.scholarships if snapshot else []
     
-    def _calculate_score_v2(self, user: UserProfileRequest, scholarship: Dict) -> Optional[Dict]:
+    def refresh_catalog(self) -> CatalogSnapshot:
         """
-        Calculer score global V2+ avec pondérations:
-        28% Pays | 22% Domaine | 18% Niveau | 10% Type | 8% Origine | 8% Langue | 6% GPA
+        Rafraîchir le catalogue depuis sa source et publier le nouveau snapshot.
+        Lève une exception en cas d'échec (le snapshot courant reste en place).
         """
-        try:
-            # Calculer chaque composante
-            scores = {
-                'country': self._score_country_v2(user, scholarship),
-                'field': self._score_field_v2(user, scholarship),
-                'level': self._score_level_v2(user, scholarship),
-                'type': self._score_type_v2(user, scholarship),
-                'origin': self._score_origin_v2(user, scholarship),
-                'language': self._score_language_v2(user, scholarship),
-                'gpa': self._score_gpa_v2(user, scholarship)
-            }
-            
-            # Score global pondéré
-            overall_score = (
-                scores['country'] * WEIGHTS_V2['country_match'] +
-                scores['field'] * WEIGHTS_V2['field_match'] +
-                scores['level'] * WEIGHTS_V2['level_match'] +
-                scores['type'] * WEIGHTS_V2['type_match'] +
-                scores['origin'] * WEIGHTS_V2['origin_bonus'] +
-                scores['language'] * WEIGHTS_V2['language_match'] +
-                scores['gpa'] * WEIGHTS_V2['gpa_match']
-            )
-            
-            # Boost deadline
-            deadline_status, days_left, deadline_boost = self._analyze_deadline_v2(scholarship)
-            overall_score = max(0, min(1, overall_score * (1 + deadline_boost)))
+        if self.catalog_provider is None:
+            raise RuntimeError("Source du catalogue non configurée")
+        
+        with self._refresh_lock:
+            previous = self._snapshot
+            snapshot = None
             
-            # Générer raisons
-            reasons = self._generate_reasons_v2(user, scholarship, scores)
+            # Synchronisation incrémentale (lignes modifiées depuis le watermark)
+            if self._can_sync_incrementally():
+                try:
+                    snapshot = self._sync_incremental()
+                except Exception as e:
+                    logger.warning(f"⚠️  Synchronisation incrémentale impossible, rechargement complet: {str(e)}")
             
-            return {
-                'overall_score': overall_score,
-                'scores': scores,
-                'reasons': reasons,
-                'deadline_status': deadline_status,
-                'days_until_deadline': days_left,
-                'deadline_boost': deadline_boost
-            }
+            if snapshot is None:
+                snapshot = self._reload_full()
+            if snapshot is not previous:
+                self._save_catalog_file(snapshot)
+            return snapshot
+    
+    # ===== RAFRAÎCHISSEMENT EN TÂCHE DE FOND =====
+    
+    async def start_background_refresh(self):
+        """
+        Charger le catalogue puis rafraîchir en tâche de fond (startup FastAPI).
+        Snapshot disque valide : service immédiat, réconciliation Supabase
+        lancée aussitôt en tâche de fond.
+        """
+        if self._refresh_task is not None or self.catalog_provider is None:
+            return
         
-        except Exception as e:
-            logger.warning(f"⚠️  Erreur scoring {scholarship.get('id')}: {str(e)}")
-            return None
+        failures = 0
+        reconcile_now = await asyncio.to_thread(self._load_catalog_file) is not None
+        if not reconcile_now:
+            try:
+                await asyncio.to_thread(self.refresh_catalog)
+            except Exception as e:
+                logger.error(f"❌ Chargement initial du catalogue échoué: {str(e)}")
+                failures = 1
+        
+        self._refresh_task = asyncio.create_task(self._background_refresh_loop(failures, reconcile_now))
+        logger.info("🔄 Rafraîchissement du catalogue en tâche de fond démarré")
+    
+    async def stop_background_refresh(self):
+        """Arrêter la tâche de rafraîchissement (shutdown FastAPI)"""
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
     
-    # ===== MÉTHODES DE SCORING V2 =====
+    async def _background_refresh_loop(self, failures: int = 0, reconcile_now: bool = False):
+        """Reconstruire le catalogue hors du chemin des requêtes, indéfiniment"""
+        while True:
+            if not reconcile_now:
+                await asyncio.sleep(self._next_refresh_delay(failures))
+            reconcile_now = False
+            try:
+                await asyncio.to_thread(self.refresh_catalog)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.warning(f"⚠️  Rafraîchissement du catalogue échoué ({failures}x): {str(e)}")
+    
+    def _next_refresh_delay(self, failures: int) -> float:
+        """Intervalle avec jitter, backoff exponentiel après erreurs"""
+        if failures:
+            delay = min(self.REFRESH_MAX_BACKOFF_SECONDS,
+                        self.REFRESH_RETRY_SECONDS * 2 ** (failures - 1))
+        else:
+            delay = self.REFRESH_INTERVAL_SECONDS
+        return delay * random.uniform(1 - self.REFRESH_JITTER, 1 + self.REFRESH_JITTER)
     
-    def _score_country_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score pays (28%) - V2 avancé"""
-        user_country = user.target_country.lower().strip()
-        scholarship_country = str(scholarship.get('pays', '')).lower().strip()
-        scholarship_targets = str(scholarship.get('pays_cibles', '')).lower().strip()
-        
-        # Match exact
-        if user_country == scholarship_country:
-            return 1.0
+    # ===== SNAPSHOT DISQUE =====
+    
+    def _catalog_schema(self) -> List[Any]:
+        """Tout ce qui détermine le contenu du snapshot disque (autre valeur = fichier ignoré)"""
+        return [
+            [f.name for f in fields(ScholarshipFeatures)],
+            self.LOAD_COLUMNS, self.COLD_COLUMNS, self.SYNC_WATERMARK_COLUMN,
+            REGIONS, FIELD_CATEGORIES, LANGUAGE_VARIANTS, LEVEL_HIERARCHY, SCHOLARSHIP_SELECTIVITY,
+            SELECTIVITY_KEYWORDS, self.core.open_world_keywords, OPEN_ORIGIN_KEYWORDS, OPEN_FIELD_KEYWORDS,
+            OPEN_LEVEL_KEYWORDS, INTERNATIONAL_KEYWORDS
+        ]
+    
+    def _save_catalog_file(self, snapshot: CatalogSnapshot):
+        """Persister le snapshot publié (un échec disque n'interrompt pas le rafraîchissement)"""
+        if self._catalog_file is None:
+            return
+        try:
+            self._catalog_file.save({
+                'fingerprint': snapshot.fingerprint,
+                'watermark': self._watermark,
+                'watermarkAvailable': self._watermark_available,
+                'fullSync': self._full_sync_timestamp,
+                'savedAt': datetime.now(),
+                'scholarships': snapshot.scholarships,
+                'features': snapshot.features,
+                'columnar': snapshot.columnar,
+                'index': snapshot.index
+            })
+            logger.info(f"💽 Snapshot disque écrit: {self._catalog_file.path} (v{snapshot.version})")
+        except Exception as e:
+            logger.warning(f"⚠️  Écriture du snapshot disque impossible: {str(e)}")
+    
+    def _load_catalog_file(self) -> Optional[CatalogSnapshot]:
+        """
+        Publier le catalogue du snapshot disque (démarrage à froid). Le
+        watermark et la date du dernier rechargement complet sont restaurés :
+        la réconciliation reprend là où le processus précédent s'était arrêté.
+        """
+        if self._catalog_file is None:
+            return None
+        try:
+            payload = self._catalog_file.load()
+        except Exception as e:
+            logger.warning(f"⚠️  Snapshot disque illisible, ignoré: {str(e)}")
+            return None
+        if payload is None:
+            logger.info(f"💽 Aucun snapshot disque compatible ({self._catalog_file.path})")
+            return None
         
-        # Match dans pays cibles
-        targets_list = [c.strip() for c in scholarship_targets.replace(';', ',').split(',')]
-        if any(user_country in target or target in user_country for target in targets_list):
-            return 0.95
+        with self._refresh_lock:
+            self._watermark = payload['watermark']
+            self._watermark_available = payload['watermarkAvailable'] and self.catalog_provider.incremental
+            self._full_sync_timestamp = payload['fullSync']
+            snapshot = self._install_catalog(payload['scholarships'], payload['features'],
+                                             payload['fingerprint'], payload['columnar'], payload['index'])
+            self._cache_timestamp = payload['savedAt']
         
-        # Monde ouvert
-        if any(kw in scholarship_targets for kw in ['monde', 'all', 'international', 'partout']):
-            return 0.70
+        logger.info(f"💽 {len(snapshot.scholarships)} bourses chargées depuis le snapshot disque "
+                    f"({payload['savedAt'].isoformat(timespec='seconds')})")
+        return snapshot
+    
+    # ===== CHARGEMENT DU CATALOGUE =====
+    
+    def _can_sync_incrementally(self) -> bool:
+        """Watermark connu et dernier rechargement complet récent"""
+        if self._snapshot is None or self._watermark is None or self._full_sync_timestamp is None \
+           or not self._watermark_available:
+            return False
+        age_hours = (datetime.now() - self._full_sync_timestamp).total_seconds() / 3600
+        return age_hours < self.FULL_RELOAD_HOURS
+    
+    def _reload_full(self) -> CatalogSnapshot:
+        """Rechargement complet de la table (fallback, et détection des suppressions)"""
+        logger.info("📥 Chargement du catalogue...")
+        try:
+            scholarships, features = self._fetch_catalog()
+        except Exception as first_error:
+            if not self._watermark_available:
+                raise
+            # Table sans colonne de watermark : recharger sans synchronisation incrémentale
+            self._watermark_available = False
+            try:
+                scholarships, features = self._fetch_catalog()
+            except Exception:
+                self._watermark_available = True
+                raise first_error
+            logger.warning(f"⚠️  Colonne {self.SYNC_WATERMARK_COLUMN} indisponible, "
+                           f"synchronisation incrémentale désactivée: {str(first_error)}")
         
-        # Même région
-        user_region = self._get_region(user_country)
-        scholarship_region = self._get_region(scholarship_country)
+        logger.info(f"✅ {len(scholarships)} bourses chargées")
         
-        if user_region and scholarship_region == user_region:
-            return 0.60
+        self._full_sync_timestamp = datetime.now()
+        self._watermark = self._max_watermark(scholarships, None)
         
-        # Même continent
-        if user_region and scholarship_region:
-            if REGIONS.get(user_region, {}).get('continent') == \
-               REGIONS.get(scholarship_region, {}).get('continent'):
-                return 0.40
+        # Catalogue inchangé : conserver la version (et les résultats en cache)
+        fingerprint = self._content_fingerprint(scholarships, features)
+        if self._snapshot is not None and fingerprint == self._snapshot.fingerprint:
+            self._cache_timestamp = datetime.now()
+            return self._snapshot
         
-        # Cible régionale
-        for region_name, region_data in REGIONS.items():
-            if any(c in scholarship_targets for c in region_data['countries']):
-                if user_region == region_name:
-                    return 0.65
-        
-        return 0.10
-    
-    def _score_field_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score domaine (22%) - V2 avancé"""
-        user_field = user.field_of_study.lower().strip()
-        scholarship_field = str(scholarship.get('domaine_etude', '')).lower().strip()
-        
-        # Match exact
-        if user_field == scholarship_field:
-            return 1.0
-        
-        # Substring match
-        if user_field in scholarship_field or scholarship_field in user_field:
-            return 0.92
-        
-        # Même catégorie
-        user_category = self._get_field_category(user_field)
-        scholarship_category = self._get_field_category(scholarship_field)
-        
-        if user_category and scholarship_category == user_category:
-            return 0.85
-        
-        # Synonymes
-        for category, synonyms in FIELD_CATEGORIES.items():
-            if any(syn in user_field for syn in synonyms) and \
-               any(syn in scholarship_field for syn in synonyms):
-                return 0.78
-        
-        # Tous les domaines
-        if any(kw in scholarship_field for kw in ['tous', 'all', 'any', 'toutes']):
-            return 0.60
-        
-        # Word similarity
-        user_words = set(user_field.split())
-        scholarship_words = set(scholarship_field.split())
-        if user_words & scholarship_words:
-            intersection = len(user_words & scholarship_words)
-            union = len(user_words | scholarship_words)
-            return 0.50 + (intersection / union if union > 0 else 0) * 0.30
-        
-        return 0.10
-    
-    def _score_level_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score niveau (18%) - V2 hiérarchique"""
-        user_level = user.education_level.value.lower()
-        scholarship_level = str(scholarship.get('niveau_etude', '')).lower().strip()
-        
-        # Get hierarchical values
-        user_level_value = self._get_level_value(user_level)
-        scholarship_level_values = self._get_level_values(scholarship_level)
-        
-        if user_level_value is None or not scholarship_level_values:
-            return 0.50
-        
-        # Match exact
-        if user_level_value in scholarship_level_values:
-            return 1.0
-        
-        # Fourchette acceptable
-        min_level = min(scholarship_level_values)
-        max_level = max(scholarship_level_values)
-        
-        if min_level <= user_level_value <= max_level:
-            return 0.95
-        
-        # Proche de fourchette
-        if user_level_value < min_level and (min_level - user_level_value) == 1:
-            return 0.80
-        
-        if user_level_value > max_level and (user_level_value - max_level) == 1:
-            return 0.60
-        
-        # Tous les niveaux
-        if 'tous' in scholarship_level or 'all' in scholarship_level:
-            return 0.70
-        
-        return 0.20
-    
-    def _score_type_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score type (10%)"""
-        if not user.scholarship_type:
-            return 0.65
-        
-        user_type = user.scholarship_type.value.lower()
-        scholarship_type = str(scholarship.get('type_bourse', '')).lower().strip()
-        
-        # Match exact
-        if user_type in scholarship_type or scholarship_type in user_type:
-            return 1.0
-        
-        # Mapping
-        type_mapping = {
-            'complète': ['full', 'complet', 'intégrale'],
-            'partielle': ['partial', 'partiell'],
-            'mérite': ['merit', 'excellence', 'académique'],
-            'besoin': ['need', 'besoin', 'financier', 'ressources']
-        }
+        return self._install_catalog(scholarships, features, fingerprint)
+    
+    def _fetch_catalog(self) -> Tuple[CatalogRows, List[Optional[ScholarshipFeatures]]]:
+        """
+        Lire la table page par page (colonnes utiles uniquement) : chaque page
+        alimente directement le pré-calcul, seules les colonnes chaudes sont
+        conservées (encodées en colonnes). Retourne (bourses, caractéristiques).
+        """
+        features: List[Optional[ScholarshipFeatures]] = []
+        self._shared_values = {}
         
-        for pref_type, variations in type_mapping.items():
-            if user_type in pref_type or pref_type in user_type:
-                if any(v in scholarship_type for v in variations):
-                    return 0.85
+        pages = self.catalog_provider.iter_pages(self._select_columns())
         
-        if 'complet' in scholarship_type and user_type in ['complète', 'full']:
-            return 0.90
+        def hot_rows() -> Iterator[Dict]:
+            for page in pages:
+                for row in page:
+                    features.append(self._build_features(row))
+                    yield self._hot_row(row)
         
-        return 0.50
+        scholarships = CatalogRows.from_rows(hot_rows())
+        return scholarships, features
     
-    def _score_origin_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score origine (8%)"""
-        user_origin = user.origin_country.lower().strip()
-        scholarship_targets = str(scholarship.get('pays_cibles', '')).lower().strip()
-        scholarship_country = str(scholarship.get('pays', '')).lower().strip()
+    def _select_columns(self) -> Tuple[str, ...]:
+        """Projection des colonnes lues (+ colonne de watermark si disponible)"""
+        columns = self.LOAD_COLUMNS
+        if self._watermark_available:
+            columns += (self.SYNC_WATERMARK_COLUMN,)
+        return columns
+    
+    def _hot_row(self, row: Dict) -> Dict:
+        """Ligne conservée en mémoire (sans le texte froid déjà exploité par le pré-calcul)"""
+        return {k: v for k, v in row.items() if k not in self.COLD_COLUMNS}
+    
+    def _sync_incremental(self) -> CatalogSnapshot:
+        """
+        Récupérer uniquement les bourses modifiées depuis le dernier watermark
+        (SYNC_WATERMARK_COLUMN), les fusionner par id et ne recalculer que
+        leurs caractéristiques.
+        """
+        current = self._snapshot
+        column = self.SYNC_WATERMARK_COLUMN
         
-        # Match exact
-        if user_origin in scholarship_targets or \
-           (user_origin in scholarship_country and scholarship_country in scholarship_targets):
-            return 1.0
+        scholarships = current.scholarships
+        features = list(current.features)
+        changed: List[Dict] = []
+        updates: Dict[int, Dict] = {}
+        appended: List[Dict] = []
+        patched = 0
         
-        # Même région
-        user_region = self._get_region(user_origin)
-        scholarship_region = self._get_region(scholarship_country)
+        pages = self.catalog_provider.iter_pages(self._select_columns(), since=(column, self._watermark))
+        for page in pages:
+            for row in page:
+                hot_row = self._hot_row(row)
+                row_features = self._build_features(row)
+                changed.append(hot_row)
+                
+                position = current.positions_by_id.get(row.get('id'))
+                if position is None:
+                    appended.append(hot_row)
+                    features.append(row_features)
+                    patched += 1
+                elif scholarships[position] != hot_row or features[position] != row_features:
+                    updates[position] = hot_row
+                    features[position] = row_features
+                    patched += 1
         
-        if user_region and scholarship_region == user_region:
-            region_data = REGIONS.get(user_region, {})
-            if any(c in scholarship_targets for c in region_data.get('countries', [])):
-                return 0.80
+        self._watermark = self._max_watermark(changed, self._watermark)
+        self._cache_timestamp = datetime.now()
         
-        # Même continent
-        if user_region and scholarship_region:
-            user_continent = REGIONS.get(user_region, {}).get('continent')
-            scholarship_continent = REGIONS.get(scholarship_region, {}).get('continent')
-            
-            if user_continent and user_continent == scholarship_continent:
-                return 0.50
-        
-        # Monde ouvert
-        if 'monde' in scholarship_targets or 'all' in scholarship_targets:
-            return 0.40
-        
-        return 0.0
-    
-    def _score_language_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score langue (8%)"""
-        user_lang = user.preferred_language.lower().strip()
-        scholarship_text = (str(scholarship.get('titre', '')) + " " + 
-                          str(scholarship.get('description', ''))).lower()
-        
-        # Check language variants
-        for lang, variants in LANGUAGE_VARIANTS.items():
-            if user_lang in lang or user_lang in variants:
-                if user_lang in scholarship_text or \
-                   any(v in scholarship_text for v in variants):
-                    return 1.0
-        
-        # Default pour pays
-        scholarship_country = str(scholarship.get('pays', '')).lower()
-        if 'france' in scholarship_country:
-            if user_lang == 'fr' or user_lang == 'français':
-                return 0.90
-        if 'usa' in scholarship_country or 'uk' in scholarship_country:
-            if user_lang == 'en' or user_lang == 'anglais':
-                return 0.90
-        
-        # International
-        if any(kw in scholarship_text for kw in ['international', 'multilingual', 'multiple languages']):
-            return 0.70
-        
-        # Default EN
-        if user_lang == 'en' or user_lang == 'english':
-            return 0.60
-        
-        return 0.40
-    
-    def _score_gpa_v2(self, user: UserProfileRequest, scholarship: Dict) -> float:
-        """Score GPA (6%)"""
-        if not user.gpa:
-            return 0.65
-        
-        # Estimer sélectivité
-        scholarship_text = (str(scholarship.get('titre', '')) + " " + 
-                          str(scholarship.get('domaine_etude', ''))).lower()
-        
-        selectivity = 'modérée'
-        if any(kw in scholarship_text for kw in ['excellence', 'prestigious', 'prestig', 'top']):
-            selectivity = 'très_sélective'
-        elif any(kw in scholarship_text for kw in ['advanced', 'competitive', 'master', 'phd']):
-            selectivity = 'sélective'
-        elif any(kw in scholarship_text for kw in ['accessible', 'open', 'ouvert', 'besoin']):
-            selectivity = 'accessible'
-        
-        gpa_req = SCHOLARSHIP_SELECTIVITY[selectivity]
-        gpa_min = gpa_req['gpa_min']
-        
-        if user.gpa >= gpa_min + 0.5:
-            return 1.0
-        elif user.gpa >= gpa_min:
-            return 0.85
-        elif user.gpa >= gpa_min - 0.3:
-            return 0.65
-        elif user.gpa >= gpa_min - 0.5:
-            return 0.45
+        if not patched:
+            logger.info(f"🔄 Synchronisation incrémentale: catalogue inchangé ({len(scholarships)} bourses)")
+            return current
+        
+        logger.info(f"🔄 Synchronisation incrémentale: {patched} bourse(s) mise(s) à jour")
+        return self._install_catalog(scholarships.patched(updates, appended), features)
+    
+    def _max_watermark(self, rows: List[Dict], current: Optional[str]) -> Optional[str]:
+        """Plus grande valeur de SYNC_WATERMARK_COLUMN (None si colonne absente)"""
+        values = [str(r[self.SYNC_WATERMARK_COLUMN]) for r in rows if r.get(self.SYNC_WATERMARK_COLUMN)]
+        if current is not None:
+            values.append(current)
+        return max(values) if values else None
+    
+    def _install_catalog(self, scholarships: CatalogRows, features: List[Optional[ScholarshipFeatures]],
+                         fingerprint: Optional[str] = None, columnar: Optional[ColumnarCatalog] = None,
+                         index: Optional[CandidateIndex] = None) -> CatalogSnapshot:
+        """
+        Construire et publier atomiquement un nouveau snapshot (résultats en
+        cache invalidés). columnar / index : structures déjà construites
+        (snapshot disque), utilisées si elles correspondent au backend.
+        """
+        if not isinstance(scholarships, CatalogRows):
+            scholarships = CatalogRows.from_rows(scholarships)
+        if self.scoring_backend == 'vectorized':
+            columnar, index = columnar if columnar is not None else ColumnarCatalog(features), None
         else:
-            return 0.20
+            columnar, index = None, index if index is not None else CandidateIndex(features)
+        
+        snapshot = CatalogSnapshot(
+            version=self.catalog_version + 1,
+            scholarships=scholarships,
+            features=features,
+            columnar=columnar,
+            index=index,
+            countries=len({
+                country_key(s.get('pays')) for s, f in zip(scholarships, features)
+                if f is not None
+            }),
+            positions_by_id={scholarship_id: i for i, scholarship_id in enumerate(scholarships.column('id'))},
+            fingerprint=fingerprint or self._content_fingerprint(scholarships, features)
+        )
+        
+        self._snapshot = snapshot
+        self._cache_timestamp = datetime.now()
+        self._result_cache.clear()
+        self._precomputed_misses.clear()
+        self._precomputed_available = self.use_precomputed
+        self._precomputed_failures = 0
+        return snapshot
     
-    def _analyze_deadline_v2(self, scholarship: Dict) -> Tuple[str, Optional[int], float]:
-        """Analyser deadline avec boost"""
+    def _content_fingerprint(self, scholarships: CatalogRows,
+                             features: List[Optional[ScholarshipFeatures]]) -> str:
+        """
+        Empreinte de tout ce qui influence le scoring : colonnes conservées
+        (hors watermark) + langues, mots-clés et sous-chaînes de langues
+        extraits de la description (colonne non conservée).
+        """
+        digest = hashlib.sha256()
+        for scholarship, f in zip(scholarships, features):
+            row = {k: v for k, v in scholarship.items() if k != self.SYNC_WATERMARK_COLUMN}
+            extracted = [sorted(f.languages), f.international, f.language_probes] if f is not None else None
+            digest.update(json.dumps([row, extracted], sort_keys=True, default=str,
+                                     ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def profile_hash(user: UserProfileRequest) -> str:
+        """Empreinte canonique des champs du profil qui influencent le scoring"""
+        payload = json.dumps([
+            user.origin_country,
+            user.target_country,
+            user.field_of_study,
+            user.education_level.value,
+            user.gpa,
+            user.preferred_language,
+            user.scholarship_type.value if user.scholarship_type else None
+        ], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _result_cache_key(self, user: UserProfileRequest, catalog_version: int, today: int) -> str:
+        """Clé canonique: profil + version catalogue + jour courant"""
+        return f"{self.profile_hash(user)}:{catalog_version}:{today}"
+    
+    def _load_precomputed(self, user: UserProfileRequest, snapshot: CatalogSnapshot,
+                          today: int, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Recommandations pré-calculées (job precompute_recommendations.py) pour ce
+        profil, valides si calculées aujourd'hui sur le même catalogue. Absence
+        de ligne mémorisée par clé de cache ; désactivé jusqu'au prochain
+        catalogue après PRECOMPUTED_MAX_FAILURES erreurs consécutives.
+        """
+        if not self._precomputed_available or not self.supabase:
+            return None
+        if self._precomputed_misses.get(cache_key) is not None:
+            return None
+        
         try:
-            deadline_str = scholarship.get('date_limite')
-            if not deadline_str:
-                return 'inconnu', None, 0.0
+            response = self.supabase.table(self.PRECOMPUTED_TABLE) \
+                .select('recommendations') \
+                .eq('profile_hash', self.profile_hash(user)) \
+                .eq('catalog_version', snapshot.fingerprint) \
+                .eq('valid_on', date.fromordinal(today).isoformat()) \
+                .limit(1) \
+                .execute()
+        except Exception as e:
+            # Erreur passagère : scoring en direct ; table absente : erreurs répétées, désactivation
+            self._precomputed_failures += 1
+            if self._precomputed_failures >= self.PRECOMPUTED_MAX_FAILURES:
+                self._precomputed_available = False
+            logger.warning(f"⚠️  Recommandations pré-calculées indisponibles "
+                           f"({self._precomputed_failures}x): {str(e)}")
+            return None
+        
+        self._precomputed_failures = 0
+        if not response.data:
+            self._precomputed_misses.put(cache_key, True)
+            return None
+        return response.data[0]['recommendations']
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache de résultats (exposées sur /health)"""
+        return {**self._result_cache.stats(), 'catalogVersion': self.catalog_version}
+    
+    def catalog_memory(self) -> Dict[str, int]:
+        """
+        Empreinte mémoire approximative (octets) du catalogue publié : lignes,
+        caractéristiques, structures de scoring. Calculée une fois par version.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {}
+        report = self._memory_report
+        if report is not None and report[0] == snapshot.version:
+            return report[1]
+        
+        footprint = {
+            'rows': estimate_memory(snapshot.scholarships, modules=(__name__,)),
+            'features': estimate_memory(snapshot.features, modules=(__name__,)),
+            'scoring': estimate_memory(snapshot.columnar, snapshot.index, snapshot.positions_by_id,
+                                       modules=(__name__,))
+        }
+        footprint['total'] = sum(footprint.values())
+        self._memory_report = (snapshot.version, footprint)
+        return footprint
+    
+    def catalog_stats(self) -> Dict[str, Any]:
+        """État du catalogue publié (exposé sur /health)"""
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version if snapshot else 0,
+            'scholarships': len(snapshot.scholarships) if snapshot else 0,
+            'lastSync': self._cache_timestamp.isoformat() if self._cache_timestamp else None,
+            'backgroundRefresh': self._refresh_task is not None
+        }
+    
+    def _pruned_ranker(self, user: UserProfileRequest, snapshot: CatalogSnapshot, today: int):
+        """
+        Backend scalaire : rank(k) ne score entièrement qu'un ensemble de
+        candidats tiré des index inversés, garanti sur-ensemble du vrai top-k.
+        
+        Chaque valeur distincte d'un critère est scorée une fois (pondérée par
+        WEIGHTS_V2) et les bourses sont regroupées par palier de score. Une
+        bourse hors candidats n'appartient, pour aucun critère, aux paliers
+        retenus : son score est au plus (somme des meilleurs paliers non
+        retenus) x (1 + meilleur boost deadline non retenu). Après un premier
+        top-k, on retient la combinaison de paliers la moins coûteuse qui
+        place cette borne sous le k-ième score ; scan complet si les
+        candidats dépassent PRUNE_MAX_FRACTION du catalogue. La recherche est
+        bornée : PRUNE_MAX_TIERS choix par critère, PRUNE_MAX_PLAN_NODES nœuds
+        (meilleure combinaison trouvée, sinon scan complet).
+        """
+        index = snapshot.index
+        profile = self.resolve_profile(user)
+        scored: Dict[int, Optional[Dict]] = {}
+        candidates: Set[int] = set()
+        
+        def ranked(postings, score) -> List[Tuple[float, List[int]]]:
+            """Positions regroupées par score pondéré, du meilleur au moins bon"""
+            by_score: Dict[float, List[int]] = defaultdict(list)
+            for f, positions in postings:
+                by_score[score(f)].extend(positions)
+            return sorted(by_score.items(), key=lambda x: -x[0])
+        
+        components = [
+            ranked(index.locations, lambda f: self.core.score_country(profile, f) * WEIGHTS_V2['country_match'] +
+                   self.core.score_origin(profile, f) * WEIGHTS_V2['origin_bonus']),
+            ranked(index.fields, lambda f: self.core.score_field(profile, f) * WEIGHTS_V2['field_match']),
+            ranked(index.levels, lambda f: self.core.score_level(profile, f) * WEIGHTS_V2['level_match']),
+            ranked(index.types, lambda f: self.core.score_type(profile, f) * WEIGHTS_V2['type_match']),
+            ranked(self._language_postings(profile, snapshot),
+                   lambda f: self.core.score_language(profile, f) * WEIGHTS_V2['language_match']),
+            ranked(index.selectivities, lambda f: self.core.score_gpa(profile, f) * WEIGHTS_V2['gpa_match'])
+        ]
+        
+        # Paliers de boost deadline (ScoringCore.analyze_deadline) : ouvertes, <= 7 jours, <= 30 jours
+        lo = bisect.bisect_left(index.deadline_keys, today + 1)
+        urgent = bisect.bisect_right(index.deadline_keys, today + 1 + 7)
+        near = bisect.bisect_right(index.deadline_keys, today + 1 + 30)
+        boost_tiers = [
+            (0.10, []),
+            (0.05, index.deadline_positions[lo:urgent]),
+            (0.0, index.deadline_positions[lo:near])
+        ]
+        
+        limit = self.PRUNE_MAX_FRACTION * index.size
+        
+        # p paliers retenus pour un critère : meilleur score restant values[p], coût costs[p]
+        values = [[score for score, _ in c] + [0.0] for c in components]
+        costs = [[0] for _ in components]
+        for c, cost in zip(components, costs):
+            for _, positions in c:
+                cost.append(cost[-1] + len(positions))
+        retained = [0] * len(components)
+        
+        # Choix par critère : PRUNE_MAX_TIERS premiers paliers, ou tous les paliers
+        choices = [
+            list(range(len(v))) if len(v) <= self.PRUNE_MAX_TIERS
+            else list(range(self.PRUNE_MAX_TIERS)) + [len(v) - 1]
+            for v in values
+        ]
+        
+        def retain(plan: List[int]):
+            for i, p in enumerate(plan):
+                for _, positions in components[i][retained[i]:p]:
+                    candidates.update(positions)
+                retained[i] = max(retained[i], p)
+        
+        def cheapest_plan(target: float, budget: float) -> Tuple[float, Optional[List[int]]]:
+            """
+            Paliers par critère, de coût minimal (< budget), dont la somme des
+            scores restants < target (recherche bornée à PRUNE_MAX_PLAN_NODES nœuds)
+            """
+            best: List[Any] = [budget, None, 0]
+            last = len(components) - 1
+            
+            def search(i: int, value: float, cost: int, plan: List[int]):
+                best[2] += 1
+                if cost >= best[0] or best[2] > self.PRUNE_MAX_PLAN_NODES:
+                    return
+                for p in choices[i]:
+                    if i < last:
+                        search(i + 1, value + values[i][p], cost + costs[i][p], plan + [p])
+                    elif value + values[i][p] < target:
+                        if cost + costs[i][p] < best[0]:
+                            best[0], best[1] = cost + costs[i][p], plan + [p]
+                        return
             
-            deadline_date = datetime.strptime(str(deadline_str), '%Y-%m-%d')
-            days_left = (deadline_date - datetime.now()).days
+            search(0, 0.0, 0, [])
+            return best[0], best[1]
+        
+        def score_candidates() -> List[Dict]:
+            items = []
+            for position in sorted(candidates):
+                if position not in scored:
+                    scored[position] = self._calculate_score_v2(
+                        profile, snapshot.scholarships[position], snapshot.features[position], today)
+                if scored[position]:
+                    items.append({'scholarship': snapshot.scholarships[position],
+                                  'score_data': scored[position]})
+            return items
+        
+        def rank(k: int) -> List[Dict]:
+            # 1. Premiers candidats : meilleurs paliers jusqu'à k bourses
+            while len(candidates) < k and len(candidates) <= limit:
+                open_components = [i for i, c in enumerate(components) if retained[i] < len(c)]
+                if not open_components:
+                    break
+                i = max(open_components, key=lambda i: values[i][retained[i]])
+                retain([retained[j] + (j == i) for j in range(len(components))])
+            
+            # 2. Paliers garantissant qu'aucune bourse écartée n'atteint le k-ième score
+            top_scores = heapq.nlargest(k, (x['score_data']['overall_score'] for x in score_candidates()))
+            best_plan = None
+            if len(top_scores) == k:
+                budget = limit
+                for boost, tier_positions in boost_tiers:
+                    target = (top_scores[-1] - self.PRUNE_EPSILON) / (1 + boost)
+                    cost, plan = cheapest_plan(target, budget - len(tier_positions))
+                    if plan is not None:
+                        budget = cost + len(tier_positions)
+                        best_plan = (plan, tier_positions)
             
+            if best_plan is None:
+                candidates.update(index.positions)
+            else:
+                retain(best_plan[0])
+                candidates.update(best_plan[1])
+            
+            items = score_candidates()
+            logger.info(f"✂️  {len(candidates)}/{index.size} bourses scorées (index inversés)")
+            return heapq.nlargest(k, items, key=lambda x: x['score_data']['overall_score'])
+        
+        return rank
+    
+    @staticmethod
+    def _language_postings(profile: ResolvedProfile, snapshot: CatalogSnapshot):
+        """
+        Entrées langue de l'index ; langue saisie cherchée dans le texte
+        (language_probe_bit) : chaque entrée scindée selon sa présence
+        """
+        bit = profile.language_probe_bit
+        if not bit:
+            return snapshot.index.languages
+        postings = []
+        for _, positions in snapshot.index.languages:
+            parts: Dict[bool, List[int]] = {}
+            for position in positions:
+                parts.setdefault(bool(snapshot.features[position].language_probes & bit), []).append(position)
+            postings.extend((snapshot.features[part[0]], part) for part in parts.values())
+        return postings
+    
+    def _score_vectorized(self, user: UserProfileRequest, catalog: ColumnarCatalog,
+                          today: int) -> Dict[str, Any]:
+        """
+        Scorer tout le catalogue en opérations NumPy (mêmes règles et mêmes
+        scores que le backend scalaire). Retourne les colonnes de scores.
+        """
+        scores = self._vectorized_columns(user, catalog, {})
+        has_deadline, days_left, deadline_boost = self._deadline_columns(catalog, today)
+        
+        return {
+            'overall_score': self._vectorized_overall(scores, deadline_boost),
+            'scores': scores,
+            'has_deadline': has_deadline,
+            'days_left': days_left,
+            'deadline_boost': deadline_boost
+        }
+    
+    def _vectorized_columns(self, user: UserProfileRequest, catalog: ColumnarCatalog,
+                            memo: Dict[Tuple[str, Any], Any]) -> Dict[str, Any]:
+        """
+        Colonnes de scores par critère pour un profil. Chaque critère ne dépend
+        que d'un champ du profil : memo (clé (critère, valeur du champ)) partage
+        les colonnes entre profils d'un même batch.
+        """
+        def column(name: str, value: Any, compute) -> Any:
+            key = (name, value)
+            result = memo.get(key)
+            if result is None:
+                result = memo[key] = compute()
+            return result
+        
+        profile = self.resolve_profile(user)
+        return {
+            'country': column('country', profile.target_country, lambda: np.array(
+                [self.core.score_country(profile, f) for f in catalog.locations])[catalog.location_ids]),
+            'field': column('field', profile.field, lambda: np.array(
+                [self.core.score_field(profile, f) for f in catalog.fields])[catalog.field_ids]),
+            'level': column('level', profile.level_value,
+                            lambda: self._vectorized_level(profile, catalog)),
+            'type': column('type', profile.scholarship_type, lambda: np.array(
+                [self.core.score_type(profile, f) for f in catalog.types])[catalog.type_ids]),
+            'origin': column('origin', profile.origin_country, lambda: np.array(
+                [self.core.score_origin(profile, f) for f in catalog.locations])[catalog.location_ids]),
+            'language': column('language', profile.language,
+                               lambda: self._vectorized_language(profile, catalog)),
+            'gpa': column('gpa', profile.gpa, lambda: self._vectorized_gpa(profile, catalog))
+        }
+    
+    def _vectorized_level(self, profile: ResolvedProfile, catalog: ColumnarCatalog) -> Any:
+        """Score niveau (bitmask + bornes de fourchette)"""
+        if profile.level_value is None:
+            return np.full(catalog.size, 0.50)
+        
+        v = profile.level_value
+        return np.select(
+            [
+                catalog.level_mask == 0,
+                (catalog.level_mask >> v) & 1 == 1,
+                (catalog.level_min <= v) & (v <= catalog.level_max),
+                (v < catalog.level_min) & (catalog.level_min - v == 1),
+                (v > catalog.level_max) & (v - catalog.level_max == 1),
+                catalog.open_level,
+            ],
+            [0.50, 1.0, 0.95, 0.80, 0.60, 0.70],
+            0.20
+        )
+    
+    def _vectorized_language(self, profile: ResolvedProfile, catalog: ColumnarCatalog) -> Any:
+        """Score langue (bitmask des langues détectées)"""
+        user_lang = profile.language
+        user_mask = 0
+        for token in profile.language_tokens:
+            user_mask |= LANGUAGE_TOKEN_BITS.get(token, 0)
+        if not profile.language_matched:
+            language_hit = np.zeros(catalog.size, dtype=bool)
+        elif not user_lang:
+            language_hit = np.ones(catalog.size, dtype=bool)
+        else:
+            language_hit = (catalog.language_mask & user_mask) != 0
+            if profile.language_probe_bit:
+                language_hit = language_hit | catalog.probe_hits(profile.language_probe_bit)
+        return np.select(
+            [
+                language_hit,
+                catalog.francophone & (user_lang == 'fr' or user_lang == 'français'),
+                catalog.anglophone & (user_lang == 'en' or user_lang == 'anglais'),
+                catalog.international,
+            ],
+            [1.0, 0.90, 0.90, 0.70],
+            0.60 if user_lang == 'en' or user_lang == 'english' else 0.40
+        )
+    
+    def _vectorized_gpa(self, profile: ResolvedProfile, catalog: ColumnarCatalog) -> Any:
+        """Score GPA (sélectivité pré-calculée)"""
+        gpa = profile.gpa
+        if not gpa:
+            return np.full(catalog.size, 0.65)
+        
+        gpa_min = catalog.gpa_min[catalog.selectivity]
+        return np.select(
+            [
+                gpa >= gpa_min + 0.5,
+                gpa >= gpa_min,
+                gpa >= gpa_min - 0.3,
+                gpa >= gpa_min - 0.5,
+            ],
+            [1.0, 0.85, 0.65, 0.45],
+            0.20
+        )
+    
+    def _deadline_columns(self, catalog: ColumnarCatalog, today: int) -> Tuple[Any, Any, Any]:
+        """
+        Colonnes deadline (présence, jours restants, boost) calculées une fois
+        par jour et par catalogue, recalculées au passage de minuit
+        """
+        cached = self._deadline_columns_cache
+        if cached is not None and cached[0] is catalog and cached[1] == today:
+            return cached[2]
+        
+        columns = self._vectorized_deadline(catalog, today)
+        self._deadline_columns_cache = (catalog, today, columns)
+        return columns
+    
+    @staticmethod
+    def _vectorized_deadline(catalog: ColumnarCatalog, today: int) -> Tuple[Any, Any, Any]:
+        """Boost deadline sur les numéros de jour pré-calculés"""
+        days_left = ScoringCore.days_left(catalog.deadline_day, today)
+        deadline_boost = np.select(
+            [~catalog.has_deadline, days_left < 0, days_left <= 7, days_left <= 30],
+            [0.0, -0.50, 0.10, 0.05],
+            0.0
+        )
+        return catalog.has_deadline, days_left, deadline_boost
+    
+    @staticmethod
+    def _vectorized_overall(scores: Dict[str, Any], deadline_boost: Any) -> Any:
+        """
+        Score global pondéré (même ordre d'opérations que le scalaire).
+        Colonnes (N,) pour un profil ou matrices (profils x N) pour un batch.
+        """
+        return np.clip(ScoringCore.weighted_score(scores) * (1 + deadline_boost), 0, 1)
+    
+    @staticmethod
+    def _vectorized_score_data(vectorized: Dict[str, Any], position: int) -> Dict:
+        """Reconstruire le score_data d'une bourse retenue depuis les colonnes NumPy"""
+        scores = {name: float(column[position]) for name, column in vectorized['scores'].items()}
+        
+        if not vectorized['has_deadline'][position]:
+            deadline_status, days_left = 'inconnu', None
+        else:
+            days_left = int(vectorized['days_left'][position])
             if days_left < 0:
-                return 'fermé', 0, -0.50
+                deadline_status, days_left = 'fermé', 0
             elif days_left <= 7:
-                return 'urgent', days_left, 0.10
+                deadline_status = 'urgent'
             elif days_left <= 30:
-                return 'proche', days_left, 0.05
+                deadline_status = 'proche'
             else:
-                return 'ouvert', days_left, 0.0
-        except:
-            return 'inconnu', None, 0.0
-    
-    def _diversify_results(self, recommendations: List[Dict], top_n: int) -> List[Dict]:
-        """Diversifier par pays et domaine"""
-        diverse = []
-        countries_used = set()
-        
-        # Passe 1: Meilleur de chaque pays
-        for rec in recommendations:
-            if len(diverse) >= top_n:
-                break
-            country = rec['scholarship'].get('pays', '').lower()
-            if country not in countries_used:
-                diverse.append(rec)
-                countries_used.add(country)
-        
-        # Passe 2: Compléter
-        for rec in recommendations:
-            if len(diverse) >= top_n:
-                break
-            if rec not in diverse:
-                diverse.append(rec)
+                deadline_status = 'ouvert'
         
-        return diverse[:top_n]
+        return {
+            'overall_score': float(vectorized['overall_score'][position]),
+            'scores': scores,
+            'deadline_status': deadline_status,
+            'days_until_deadline': days_left,
+            'deadline_boost': float(vectorized['deadline_boost'][position])
+        }
+    
+    def _build_features(self, scholarship: Dict) -> Optional[ScholarshipFeatures]:
+        """Normaliser une bourse une seule fois (ScoringCore.build_features)"""
+        try:
+            return self.core.build_features(scholarship, share=self._share)
+        except Exception as e:
+            logger.warning(f"⚠️  Erreur pré-calcul {scholarship.get('id')}: {str(e)}")
+            return None
+    
+    def _share(self, value: Any) -> Any:
+        """Instance partagée d'une valeur immuable déjà vue (tuple, frozenset)"""
+        return self._shared_values.setdefault(value, value)
+    
+    def _calculate_score_v2(self, profile: ResolvedProfile, scholarship: Dict,
+                            features: ScholarshipFeatures, today: int) -> Optional[Dict]:
+        """
+        Calculer score global V2+ (ScoringCore.score) :
+        28% Pays | 22% Domaine | 18% Niveau | 10% Type | 8% Origine | 8% Langue | 6% GPA
+        (sans les raisons, générées pour les recommandations retenues seulement)
+        """
+        try:
+            return self.core.score(profile, features, today)
+        except Exception as e:
+            logger.warning(f"⚠️  Erreur scoring {scholarship.get('id')}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _top_k_positions(scores: Any, k: int) -> Any:
+        """
+        Positions des k meilleurs scores, triées par score décroissant.
+        Départage des égalités par position (identique à un tri stable complet).
+        """
+        n = len(scores)
+        if k >= n:
+            return np.argsort(-scores, kind='stable')
+        
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        pool = np.concatenate([above, ties])
+        return pool[np.argsort(-scores[pool], kind='stable')]
+    
+    def _select_diversified(self, rank, total: int, top_n: int, catalog_countries: int,
+                            pool_size: Optional[int] = None) -> List[Dict]:
+        """Diversifier sur les CANDIDATE_POOL meilleurs candidats (cf. select_diversified)"""
+        return select_diversified(
+            rank, total, top_n, catalog_countries, pool_size or self.CANDIDATE_POOL,
+            self._diversity_keys, self.max_per_country, self.max_per_field
+        )
+    
+    @staticmethod
+    def _diversity_keys(item: Dict) -> Tuple[str, str]:
+        """Clés (pays, domaine) d'un candidat pour la diversification"""
+        scholarship = item['scholarship']
+        return country_key(scholarship.get('pays')), field_key(scholarship.get('domaine_etude'))
     
     def _generate_reasons_v2(self, user: UserProfileRequest, scholarship: Dict, 
                             scores: Dict) -> List[str]:
@@ -769,7 +1855,7 @@ class HybridRecommendationEngineV2Plus:
         
         return reasons
     
-    def _format_recommendation(self, scholarship: Dict, score_data: Dict) -> Dict:
+    def _format_recommendation(self, scholarship: Dict, score_data: Dict, reasons: List[str]) -> Dict:
         """Formatter pour output TypeScript"""
         deadline_status, days_until = score_data['deadline_status'], score_data['days_until_deadline']
         
@@ -790,51 +1876,30 @@ class HybridRecommendationEngineV2Plus:
                 'language': round(score_data['scores']['language'], 3),
                 'gpa': round(score_data['scores']['gpa'], 3)
             },
-            'reasons': score_data['reasons'],
+            'reasons': reasons,
             'deadline': scholarship.get('date_limite'),
             'deadlineStatus': deadline_status,
             'daysUntilDeadline': days_until
         }
     
-    # ===== HELPERS GÉOGRAPHIE =====
-    
-    def _get_region(self, country: str) -> Optional[str]:
-        """Obtenir région d'un pays"""
-        country = country.lower().strip()
-        for region_name, region_data in REGIONS.items():
-            if any(c in country for c in region_data['countries']):
-                return region_name
-        return None
+    # ===== PROFIL RÉSOLU =====
     
-    # ===== HELPERS DOMAINES =====
-    
-    def _get_field_category(self, field: str) -> Optional[str]:
-        """Obtenir catégorie d'un domaine"""
-        field = field.lower().strip()
-        for category, synonyms in FIELD_CATEGORIES.items():
-            if field in synonyms or any(syn in field for syn in synonyms):
-                return category
-        return None
-    
-    # ===== HELPERS NIVEAUX =====
-    
-    def _get_level_value(self, level: str) -> Optional[int]:
-        """Obtenir valeur hiérarchique"""
-        level = level.lower().strip()
-        for key, value in LEVEL_HIERARCHY.items():
-            if key in level or level in key:
-                return value
-        return None
+    def resolve_profile(self, user: UserProfileRequest) -> ResolvedProfile:
+        """Normaliser et résoudre les champs du profil (une fois par requête)"""
+        return self.core.resolve_profile(
+            target_country=user.target_country,
+            origin_country=user.origin_country,
+            field_of_study=user.field_of_study,
+            education_level=user.education_level.value,
+            preferred_language=user.preferred_language,
+            scholarship_type=user.scholarship_type.value if user.scholarship_type else None,
+            gpa=user.gpa
+        )
     
-    def _get_level_values(self, level_str: str) -> List[int]:
-        """Obtenir valeurs possibles"""
-        level_str = level_str.lower().strip()
-        values = []
-        for key, value in LEVEL_HIERARCHY.items():
-            if key in level_str or level_str in key:
-                if value not in values:
-                    values.append(value)
-        return sorted(values) if values else []
+    @staticmethod
+    def resolver_stats() -> Dict[str, Any]:
+        """Statistiques des caches de résolveurs (exposées sur /health)"""
+        return resolver_cache_stats()
 
 # ==========================================
 # FASTAPI APPLICATION
@@ -855,15 +1920,47 @@ def init_supabase() -> Optional[Client]:
         logger.error(f"❌ Erreur Supabase: {e}")
         return None
 
+def init_catalog_provider() -> Optional[CatalogProvider]:
+    """Source du catalogue : base SQLite si SCHOLARSHIP_DB_FILE est défini, sinon table Supabase"""
+    db_file = os.getenv('SCHOLARSHIP_DB_FILE')
+    if not db_file:
+        return None
+    logger.info(f"🗄️  Catalogue lu depuis la base SQLite {db_file}")
+    return SQLiteCatalogProvider(db_file)
+
 # Initialiser
 supabase = init_supabase()
-engine = HybridRecommendationEngineV2Plus(supabase)
+engine = HybridRecommendationEngineV2Plus(
+    supabase,
+    catalog_provider=init_catalog_provider(),
+    use_precomputed=os.getenv('USE_PRECOMPUTED_RECOMMENDATIONS', 'false').lower() in ('1', 'true', 'yes'),
+    snapshot_path=os.getenv('CATALOG_SNAPSHOT_PATH') or None
+)
+scoring_executor = ScoringExecutor(
+    max_workers=int(os.getenv('SCORING_MAX_WORKERS', '4')),
+    max_queue=int(os.getenv('SCORING_MAX_QUEUE', '32')),
+    retry_after_seconds=int(os.getenv('SCORING_RETRY_AFTER_SECONDS', '1'))
+)
+batch_pool = BatchProcessPool(
+    max_workers=int(os.getenv('BATCH_PROCESS_WORKERS', '0'))
+)
+BATCH_STREAM_CHUNK = 32  # profils calculés par lot en mode streaming
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Démarrage: chargement du catalogue puis rafraîchissement en tâche de fond"""
+    await engine.start_background_refresh()
+    yield
+    await engine.stop_background_refresh()
+    scoring_executor.shutdown()
+    batch_pool.shutdown()
 
 # FastAPI app
 app = FastAPI(
     title="🎓 API Recommandation Bourses V2+",
     description="Moteur hybride V2+ - Scoring multicritères avancé",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -901,9 +1998,23 @@ async def health():
     return {
         "status": "healthy",
         "database": "connected" if supabase else "disabled",
+        "catalog": engine.catalog_stats(),
+        "catalogMemoryBytes": await asyncio.to_thread(engine.catalog_memory),
+        "resultCache": engine.cache_stats(),
+        "scoring": scoring_executor.stats(),
+        "resolvers": engine.resolver_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
+def _overloaded(error: ScoringOverloaded) -> HTTPException:
+    """Réponse 429 (back-pressure) avec Retry-After"""
+    logger.warning("⚠️  Scoring saturé, requête refusée (429)")
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after_seconds)}
+    )
+
 @app.post("/recommendations", response_model=RecommendationsResponse, tags=["Recommendations"])
 async def get_recommendations(profile: UserProfileRequest):
     """
@@ -912,7 +2023,7 @@ async def get_recommendations(profile: UserProfileRequest):
     ⚠️ Retourne MAXIMUM 10 bourses
     """
     try:
-        recommendations, total_analyzed, execution_time = engine.recommend(profile)
+        recommendations, total_analyzed, execution_time = await scoring_executor.run(engine.recommend, profile)
         
         return RecommendationsResponse(
             status="success",
@@ -924,32 +2035,111 @@ async def get_recommendations(profile: UserProfileRequest):
             executionTimeMs=execution_time
         )
     
+    except ScoringOverloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.error(f"❌ Erreur: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/recommendations/batch", response_model=BatchRecommendationsResponse, tags=["Recommendations"])
-async def get_batch_recommendations(request: BatchRecommendationRequest):
+async def get_batch_recommendations(
+    request: BatchRecommendationRequest,
+    stream: bool = Query(False, description="Réponse NDJSON : une ligne par profil, puis les totaux")
+):
     """Traiter plusieurs profils"""
-    results = []
+    try:
+        if stream:
+            # Premier lot calculé avant la réponse : la saturation reste signalée en 429
+            first_chunk = request.profiles[:BATCH_STREAM_CHUNK]
+            first_outcomes = await scoring_executor.run(_score_profiles, first_chunk)
+            return StreamingResponse(
+                _stream_batch(request.profiles, first_outcomes),
+                media_type="application/x-ndjson"
+            )
+        return await scoring_executor.run(_process_batch, request)
+    except ScoringOverloaded as e:
+        raise _overloaded(e)
+
+async def _stream_batch(profiles: List[UserProfileRequest], first_outcomes: List[Tuple[bool, Any]]):
+    """Émettre une ligne JSON par profil réussi au fil des lots, puis les totaux"""
     failed = 0
+    outcomes = first_outcomes
+    start = 0
     
-    for profile in request.profiles:
+    while True:
+        chunk = profiles[start:start + BATCH_STREAM_CHUNK]
+        lines = []
+        for profile, outcome in zip(chunk, outcomes):
+            response = _batch_response(profile, outcome)
+            if response is None:
+                failed += 1
+            else:
+                lines.append(json.dumps(jsonable_encoder(response), ensure_ascii=False) + "\n")
+        if lines:
+            yield "".join(lines)
+        
+        start += BATCH_STREAM_CHUNK
+        if start >= len(profiles):
+            break
+        
+        # Lot suivant (attente si le pool de scoring est saturé)
+        chunk = profiles[start:start + BATCH_STREAM_CHUNK]
+        while True:
+            try:
+                outcomes = await scoring_executor.run(_score_profiles, chunk)
+                break
+            except ScoringOverloaded as e:
+                await asyncio.sleep(e.retry_after_seconds)
+    
+    summary = BatchStreamSummary(
+        totalProcessed=len(profiles),
+        totalFailed=failed,
+        timestamp=datetime.now().isoformat()
+    )
+    yield json.dumps(jsonable_encoder(summary), ensure_ascii=False) + "\n"
+
+def _score_profiles(profiles: List[UserProfileRequest]) -> List[Tuple[bool, Any]]:
+    """Scorer des profils (pool de processus pour les gros volumes) : (succès, résultat)"""
+    if batch_pool.accepts(len(profiles)):
         try:
-            recommendations, total_analyzed, execution_time = engine.recommend(profile)
-            
-            results.append(RecommendationsResponse(
-                status="success",
-                user=profile.full_name,
-                totalScholarshipsAnalyzed=total_analyzed,
-                totalScholarshipsReturned=len(recommendations),
-                recommendations=[RecommendedScholarship(**rec) for rec in recommendations],
-                timestamp=datetime.now().isoformat(),
-                executionTimeMs=execution_time
-            ))
+            return batch_pool.recommend_many(engine, profiles)
         except Exception as e:
-            logger.warning(f"⚠️  Erreur pour {profile.full_name}: {str(e)}")
+            logger.warning(f"⚠️  Pool batch indisponible, traitement dans le processus: {str(e)}")
+    return engine.recommend_batch(profiles)
+
+def _batch_response(profile: UserProfileRequest, outcome: Tuple[bool, Any]) -> Optional[RecommendationsResponse]:
+    """Réponse d'un profil du batch (None en cas d'échec)"""
+    succeeded, result = outcome
+    try:
+        if not succeeded:
+            raise RuntimeError(result)
+        recommendations, total_analyzed, execution_time = result
+        
+        return RecommendationsResponse(
+            status="success",
+            user=profile.full_name,
+            totalScholarshipsAnalyzed=total_analyzed,
+            totalScholarshipsReturned=len(recommendations),
+            recommendations=[RecommendedScholarship(**rec) for rec in recommendations],
+            timestamp=datetime.now().isoformat(),
+            executionTimeMs=execution_time
+        )
+    except Exception as e:
+        logger.warning(f"⚠️  Erreur pour {profile.full_name}: {str(e)}")
+        return None
+
+def _process_batch(request: BatchRecommendationRequest) -> BatchRecommendationsResponse:
+    """Scoring d'un batch (exécuté dans le pool de scoring)"""
+    results = []
+    failed = 0
+    
+    outcomes = _score_profiles(request.profiles)
+    for profile, outcome in zip(request.profiles, outcomes):
+        response = _batch_response(profile, outcome)
+        if response is None:
             failed += 1
+        else:
+            results.append(response)
     
     return BatchRecommendationsResponse(
         totalProcessed=len(request.profiles),
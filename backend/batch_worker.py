@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚙️ WORKERS DU POOL DE PROCESSUS BATCH (/recommendations/batch)
+Point d'entrée léger des processus workers : n'importe que le noyau de scoring
+(ni FastAPI, ni Supabase, ni le moteur global de l'API).
+- Caractéristiques des bourses et clés de diversification reçues une fois
+  par worker, à son initialisation (pas de lignes, d'index ni de colonnes)
+- Scoring complet (ScoringCore) et diversification des profils déjà résolus
+- Raisons et formatage des résultats restent dans le processus de l'API
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from scoring_core import ResolvedProfile, ScholarshipFeatures, ScoringCore, select_diversified
+
+@dataclass
+class WorkerCatalog:
+    """Catalogue d'un worker : ce que le scoring et la diversification lisent"""
+    features: Sequence[Optional[ScholarshipFeatures]]
+    diversity_keys: Sequence[Tuple[str, str]]  # (pays, domaine) par position
+    countries: int
+    core: ScoringCore
+    candidate_pool: int
+    max_per_country: Optional[int]
+    max_per_field: Optional[int]
+
+_catalog: Optional[WorkerCatalog] = None
+
+def init_worker(catalog: WorkerCatalog):
+    """Initialiser un worker (une fois par processus)"""
+    global _catalog
+    _catalog = catalog
+
+def rank_profile(profile: ResolvedProfile, today: int, top_n: int) -> List[Tuple[int, Any]]:
+    """
+    Scorer toutes les bourses pour un profil puis diversifier : (position,
+    score) des bourses retenues. Classement par score décroissant, égalités
+    départagées par position (comme les backends scalaire et vectorisé).
+    """
+    catalog = _catalog
+    scored = {}
+    for position, features in enumerate(catalog.features):
+        if features is None:
+            continue
+        try:
+            scored[position] = catalog.core.score(profile, features, today)
+        except Exception:
+            continue  # bourse ignorée, comme dans le moteur
+    
+    order = sorted(scored, key=lambda position: -scored[position]['overall_score'])
+    selected = select_diversified(
+        lambda k: order[:k], len(order), top_n, catalog.countries, catalog.candidate_pool,
+        lambda position: catalog.diversity_keys[position], catalog.max_per_country, catalog.max_per_field
+    )
+    return [(position, scored[position]) for position in selected]
+
+def score_chunk(profiles: List[ResolvedProfile], today: int, top_n: int) -> List[Tuple[bool, Any]]:
+    """Scorer un lot de profils : (True, (bourses retenues, temps ms)) ou (False, message d'erreur)"""
+    outcomes = []
+    for profile in profiles:
+        start_time = time.time()
+        try:
+            selected = rank_profile(profile, today, top_n)
+            outcomes.append((True, (selected, (time.time() - start_time) * 1000)))
+        except Exception as e:
+            outcomes.append((False, str(e)))
+    return outcomes
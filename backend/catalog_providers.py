@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📚 SOURCES DU CATALOGUE DE BOURSES
+Sources interchangeables lues par les moteurs de recommandation (CatalogProvider) :
+- Table scholarship de Supabase, lue par pages (synchronisation incrémentale)
+- Base SQLite (connexions en lecture seule par thread, SQLiteConnectionPool)
+- Catalogue déjà en mémoire (tests, outils hors ligne)
+Aucune dépendance vers les moteurs : le client Supabase est fourni par l'appelant.
+"""
+
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+# ==========================================
+# INTERFACE ET SOURCE EN MÉMOIRE
+# ==========================================
+
+class CatalogProvider:
+    """
+    Source du catalogue : pages de lignes (dict colonne -> valeur, colonnes
+    de la table scholarship). incremental : la source sait ne renvoyer que
+    les lignes modifiées depuis un watermark (synchronisation incrémentale).
+    """
+    
+    incremental = False
+    
+    def iter_pages(self, columns: Sequence[str],
+                   since: Optional[Tuple[str, Any]] = None) -> Iterator[List[Dict]]:
+        """
+        Itérer sur les pages du catalogue (colonnes demandées uniquement)
+        
+        Args:
+            columns: Colonnes à lire
+            since: (colonne, valeur) : lignes dont la colonne est >= valeur,
+                triées par cette colonne (sources incrémentales seulement)
+        """
+        raise NotImplementedError
+
+class InMemoryCatalogProvider(CatalogProvider):
+    """Catalogue déjà en mémoire (liste de dicts relue à chaque rafraîchissement)"""
+    
+    incremental = True
+    
+    def __init__(self, rows: Sequence[Mapping[str, Any]], page_size: int = 1000):
+        self.rows = rows
+        self.page_size = page_size
+    
+    def iter_pages(self, columns: Sequence[str],
+                   since: Optional[Tuple[str, Any]] = None) -> Iterator[List[Dict]]:
+        rows = self.rows
+        if since is not None:
+            column, value = since
+            rows = sorted(
+                (row for row in rows if row.get(column) is not None and str(row[column]) >= str(value)),
+                key=lambda row: str(row[column])
+            )
+        for start in range(0, len(rows), self.page_size):
+            yield [{c: row.get(c) for c in columns} for row in rows[start:start + self.page_size]]
+
+# ==========================================
+# SOURCE SUPABASE
+# ==========================================
+
+def iter_supabase_pages(build_query, page_size: int) -> Iterator[List[Dict]]:
+    """Itérer sur les pages (page_size lignes) d'une requête Supabase"""
+    start = 0
+    while True:
+        response = build_query().range(start, start + page_size - 1).execute()
+        page = response.data if response.data else []
+        yield page
+        if len(page) < page_size:
+            return
+        start += page_size
+
+class SupabaseCatalogProvider(CatalogProvider):
+    """Table scholarship de Supabase, lue par pages (synchronisation incrémentale possible)"""
+    
+    incremental = True
+    
+    def __init__(self, client: Any, page_size: int = 1000, table: str = 'scholarship'):
+        self.client = client
+        self.page_size = page_size
+        self.table = table
+    
+    def iter_pages(self, columns: Sequence[str],
+                   since: Optional[Tuple[str, Any]] = None) -> Iterator[List[Dict]]:
+        def build_query():
+            query = self.client.table(self.table).select(','.join(columns))
+            if since is not None:
+                column, value = since
+                query = query.gte(column, value).order(column)
+            return query.order('id')
+        
+        return iter_supabase_pages(build_query, self.page_size)
+
+# ==========================================
+# SOURCE SQLITE (UNE CONNEXION PAR THREAD)
+# ==========================================
+
+class _PooledConnection(sqlite3.Connection):
+    """Connexion référençable faiblement (libérée avec le thread qui l'a ouverte)"""
+
+class SQLiteConnectionPool:
+    """
+    Connexions SQLite par thread pour lecteurs concurrents (pool de threads,
+    threadpool FastAPI) :
+    - Base existante obligatoire (URI mode=ro / mode=rw : jamais de base vide créée)
+    - Base passée en WAL une fois à l'ouverture (lecteurs non bloqués par un écrivain)
+    - Connexions en lecture seule (URI mode=ro), mmap_size et cache_size réglés
+    - Connexion d'un thread terminé fermée avec lui (pool en références faibles)
+    - Connexion de surveillance partagée, jamais utilisée pour écrire :
+      PRAGMA data_version change à chaque écriture validée par n'importe
+      quelle autre connexion, y compris celles de ce processus (write(),
+      connection() en écriture), d'où aucun besoin de total_changes
+    """
+    
+    MMAP_SIZE = 256 * 1024 * 1024  # octets lus via mmap
+    CACHE_SIZE_KIB = 16 * 1024  # cache de pages par connexion
+    
+    def __init__(self, db_file: str, read_only: bool = True):
+        if not Path(db_file).is_file():
+            raise FileNotFoundError(f"Base SQLite introuvable: {db_file}")
+        self.db_file = db_file
+        self.read_only = read_only
+        self._local = threading.local()
+        self._connections: "weakref.WeakSet[sqlite3.Connection]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._enable_wal()
+        self._watcher = self._open()
+        self._watcher_lock = threading.Lock()
+    
+    def _enable_wal(self):
+        """Mode WAL (persistant dans le fichier) ; ignoré si la base n'est pas inscriptible"""
+        self.write("PRAGMA journal_mode=WAL", atomic=False)
+    
+    def write(self, *statements: str, atomic: bool = True) -> bool:
+        """
+        Écritures de maintenance (schéma, index, triggers) sur une connexion
+        dédiée, dans une seule transaction si atomic. False si la base n'est
+        pas inscriptible.
+        """
+        try:
+            conn = sqlite3.connect(self._uri('rw'), uri=True, isolation_level=None)
+            try:
+                if atomic:
+                    conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for statement in statements:
+                        conn.execute(statement)
+                    if atomic:
+                        conn.execute("COMMIT")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+        except sqlite3.OperationalError:
+            return False
+        return True
+    
+    def _uri(self, mode: str) -> str:
+        """URI de la base (mode=ro / mode=rw : échoue si le fichier n'existe pas)"""
+        return f"{Path(self.db_file).resolve().as_uri()}?mode={mode}"
+    
+    def _open(self) -> sqlite3.Connection:
+        """Nouvelle connexion réglée (fermable depuis un autre thread par close())"""
+        conn = sqlite3.connect(self._uri('ro' if self.read_only else 'rw'), uri=True,
+                               check_same_thread=False, factory=_PooledConnection)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {int(self.MMAP_SIZE)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.CACHE_SIZE_KIB)}")
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+    
+    def connection(self) -> sqlite3.Connection:
+        """Connexion du thread courant (ouverte au premier appel)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+    
+    def data_version(self) -> int:
+        """Compteur d'écritures validées par les autres connexions"""
+        with self._watcher_lock:
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+    
+    def close(self):
+        """Fermer toutes les connexions ouvertes"""
+        with self._lock:
+            connections, self._connections = list(self._connections), weakref.WeakSet()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+class SQLiteCatalogProvider(CatalogProvider):
+    """
+    Table scholarship d'une base SQLite (connexions en lecture seule) comme
+    source du catalogue du moteur FastAPI. Sans colonne de modification
+    fiable : pas de synchronisation incrémentale.
+    """
+    
+    def __init__(self, db_file: str, page_size: int = 1000):
+        self.pool = SQLiteConnectionPool(db_file)
+        self.page_size = page_size
+    
+    def iter_pages(self, columns: Sequence[str],
+                   since: Optional[Tuple[str, Any]] = None) -> Iterator[List[Dict]]:
+        if since is not None:
+            raise ValueError("Synchronisation incrémentale non supportée par la source SQLite")
+        cursor = self.pool.connection().cursor()
+        cursor.execute(f"SELECT {', '.join(columns)} FROM scholarship ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(self.page_size)
+            if not rows:
+                return
+            yield [dict(zip(columns, row)) for row in rows]
+    
+    def close(self):
+        """Fermer les connexions"""
+        self.pool.close()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📦 PRÉ-CALCUL DES RECOMMANDATIONS (JOB HORS LIGNE)
+Calcule le top 10 de chaque profil de la table `profiles` et l'enregistre
+dans la table PRECOMPUTED_TABLE (upserts par lots) :
+- Une ligne par empreinte de profil (profile_hash), valable pour un catalogue
+  (catalog_version = empreinte du catalogue) et une journée (valid_on)
+- POST /recommendations sert ces lignes tant qu'elles sont valides, sinon
+  scoring en direct
+- À lancer chaque nuit (cron Render, GitHub Actions...) :
+    python precompute_recommendations.py
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from api_recommendations_final import (
+    EducationLevel,
+    HybridRecommendationEngineV2Plus,
+    ScholarshipType,
+    UserProfileRequest,
+    init_supabase,
+    logger
+)
+from catalog_providers import iter_supabase_pages
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+PROFILE_COLUMNS = (
+    'id', 'full_name', 'age', 'origin_country', 'target_country', 'field_of_study',
+    'education_level', 'gpa', 'preferred_language', 'scholarship_type', 'finance_type'
+)
+BATCH_SIZE = 500  # profils scorés par appel à recommend_batch
+UPSERT_CHUNK = 500  # lignes par upsert Supabase
+
+# Enums de la table profiles -> enums de l'API
+PROFILE_EDUCATION_LEVELS = {
+    'high_school': EducationLevel.BACHELOR,
+    'undergraduate': EducationLevel.BACHELOR,
+    'masters': EducationLevel.MASTER,
+    'phd': EducationLevel.DOCTORATE,
+    'postdoc': EducationLevel.POSTDOC
+}
+
+PROFILE_SCHOLARSHIP_TYPES = {
+    'full': ScholarshipType.FULL,
+    'partial': ScholarshipType.PARTIAL,
+    'merit': ScholarshipType.MERIT,
+    'need_based': ScholarshipType.NEED,
+    'travel': None,
+    'research': None
+}
+
+# ==========================================
+# CONVERSION DES PROFILS
+# ==========================================
+
+def profile_from_row(row: Dict[str, Any]) -> Optional[UserProfileRequest]:
+    """Convertir une ligne `profiles` en UserProfileRequest (None si incomplète)"""
+    level = row.get('education_level')
+    level = PROFILE_EDUCATION_LEVELS.get(level, level)
+    scheme = row.get('scholarship_type')
+    scheme = PROFILE_SCHOLARSHIP_TYPES.get(scheme, scheme)
+
+    try:
+        return UserProfileRequest(
+            full_name=row.get('full_name') or str(row.get('id')),
+            age=row.get('age'),
+            origin_country=row.get('origin_country'),
+            target_country=row.get('target_country'),
+            field_of_study=row.get('field_of_study'),
+            education_level=level,
+            gpa=row.get('gpa'),
+            preferred_language=row.get('preferred_language') or 'fr',
+            scholarship_type=scheme,
+            finance_type=row.get('finance_type')
+        )
+    except Exception as e:
+        logger.warning(f"⚠️  Profil {row.get('id')} ignoré: {str(e)}")
+        return None
+
+# ==========================================
+# JOB
+# ==========================================
+
+def precompute(engine: HybridRecommendationEngineV2Plus, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Calculer et enregistrer les recommandations de tous les profils.
+    Les profils identiques (même profile_hash) ne sont calculés qu'une fois.
+    """
+    start_time = time.time()
+    snapshot = engine.refresh_catalog()
+    # Jour de référence unique : scoring et valid_on cohérents même si le job passe minuit
+    today = engine.core.today()
+    valid_on = date.fromordinal(today).isoformat()
+
+    # 1. Profils distincts (empreinte -> profil)
+    profiles: Dict[str, UserProfileRequest] = {}
+    total_rows = 0
+    skipped = 0
+    pages = iter_supabase_pages(
+        lambda: engine.supabase.table('profiles').select(','.join(PROFILE_COLUMNS)).order('id'),
+        engine.LOAD_PAGE_SIZE
+    )
+    for page in pages:
+        for row in page:
+            total_rows += 1
+            profile = profile_from_row(row)
+            if profile is None:
+                skipped += 1
+                continue
+            profiles.setdefault(engine.profile_hash(profile), profile)
+
+    logger.info(f"👥 {total_rows} profils lus, {len(profiles)} distincts, {skipped} ignorés")
+
+    # 2. Scoring par lots puis upserts par lots
+    hashes = list(profiles)
+    pending: List[Dict[str, Any]] = []
+    written = 0
+    failed = 0
+
+    for batch_start in range(0, len(hashes), BATCH_SIZE):
+        batch_hashes = hashes[batch_start:batch_start + BATCH_SIZE]
+        outcomes = engine.recommend_batch([profiles[h] for h in batch_hashes], today)
+
+        for profile_hash, (succeeded, outcome) in zip(batch_hashes, outcomes):
+            if not succeeded:
+                failed += 1
+                continue
+            recommendations, total_analyzed, _ = outcome
+            pending.append({
+                'profile_hash': profile_hash,
+                'catalog_version': snapshot.fingerprint,
+                'valid_on': valid_on,
+                'recommendations': recommendations,
+                'total_analyzed': total_analyzed,
+                'computed_at': datetime.now().isoformat()
+            })
+
+        while len(pending) >= UPSERT_CHUNK:
+            written += _upsert(engine, pending[:UPSERT_CHUNK], dry_run)
+            pending = pending[UPSERT_CHUNK:]
+
+    if pending:
+        written += _upsert(engine, pending, dry_run)
+
+    summary = {
+        'profiles': total_rows,
+        'distinctProfiles': len(profiles),
+        'skipped': skipped,
+        'failed': failed,
+        'written': written,
+        'catalogVersion': snapshot.fingerprint,
+        'validOn': valid_on,
+        'executionTimeMs': round((time.time() - start_time) * 1000, 1)
+    }
+    logger.info(f"✅ Pré-calcul terminé: {summary}")
+    return summary
+
+def _upsert(engine: HybridRecommendationEngineV2Plus, rows: List[Dict[str, Any]], dry_run: bool) -> int:
+    """Écrire un lot de lignes (clé profile_hash)"""
+    if not dry_run:
+        engine.supabase.table(engine.PRECOMPUTED_TABLE) \
+            .upsert(rows, on_conflict='profile_hash') \
+            .execute()
+    logger.info(f"💾 {len(rows)} lignes {'(dry-run) ' if dry_run else ''}enregistrées")
+    return len(rows)
+
+# ==========================================
+# LANCEMENT
+# ==========================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pré-calcul des recommandations de tous les profils")
+    parser.add_argument('--dry-run', action='store_true', help="Calculer sans écrire dans Supabase")
+    args = parser.parse_args()
+
+    supabase = init_supabase()
+    if not supabase:
+        logger.error("❌ Client Supabase requis (SUPABASE_URL / SUPABASE_KEY)")
+        return 1
+
+    precompute(HybridRecommendationEngineV2Plus(supabase), dry_run=args.dry_run)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,14 +6,26 @@ Version améliorée avec scoring multicritères avancé, diversification et opti
 """
 
 import sqlite3
-from typing import List, Dict, Tuple, Optional, Set
-from datetime import datetime, timedelta
+import sys
+import threading
+from typing import Any, Iterator, List, Dict, Tuple, Optional, Sequence, Set, FrozenSet
+from datetime import date, datetime
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import json
-from collections import defaultdict
+import hashlib
+import heapq
+import itertools
 import math
 
+from catalog_providers import SQLiteConnectionPool
+from resolver_cache import memoized_resolver
+from scoring_core import (
+    DEFAULT_SELECTIVITY, EXTENDED_OPEN_WORLD_KEYWORDS, INTERNATIONAL_KEYWORDS, LANGUAGE_TOKENS,
+    SELECTIVITY_KEYWORDS, ResolvedProfile, ScholarshipFeatures, ScoringCore,
+    country_key, estimate_memory, field_key, select_diversified
+)
+
 # ============================================================================
 # ÉNUMÉRATIONS ET CONSTANTES
 # ============================================================================
@@ -33,174 +45,34 @@ class ScholarshipType(Enum):
     NEED = "Besoin"
 
 # ============================================================================
-# DICTIONNAIRES D'AMÉLIORATION - DONNÉES GÉOGRAPHIQUES ET DOMAINES
+# CLASSES DE DONNÉES (AMÉLIORÉES)
 # ============================================================================
 
-# Mappings de régions géographiques
-REGIONS = {
-    'europe': {
-        'countries': [
-            'france', 'allemagne', 'royaume-uni', 'suisse', 'pays-bas', 'belgique',
-            'suede', 'norvege', 'danemark', 'espagne', 'italie', 'portugal', 'grece',
-            'autriche', 'pologne', 'republique tcheque', 'hongrie', 'roumanie',
-            'bulgarie', 'croatie', 'slovenie', 'slovaquie', 'luxembourg', 'malte',
-            'chypre', 'finlande', 'irlande', 'lettonie', 'lituanie', 'estonie'
-        ],
-        'continent': 'Europe'
-    },
-    'asie_du_sud_est': {
-        'countries': [
-            'vietnam', 'thaïlande', 'cambodge', 'laos', 'malaisie', 'singapour',
-            'indonésie', 'philippines', 'birmanie', 'brunei'
-        ],
-        'continent': 'Asie'
-    },
-    'asie_du_sud': {
-        'countries': ['inde', 'pakistan', 'bangladesh', 'nepal', 'sri_lanka', 'afghanistan'],
-        'continent': 'Asie'
-    },
-    'asie_centrale': {
-        'countries': ['kazakhstan', 'ouzbekistan', 'turkmenistan', 'tadjikistan', 'kirghizstan'],
-        'continent': 'Asie'
-    },
-    'asie_de_l_est': {
-        'countries': [
-            'japon', 'chine', 'corée_du_sud', 'corée_du_nord', 'mongolie',
-            'taiwan', 'hongkong', 'macao'
-        ],
-        'continent': 'Asie'
-    },
-    'moyen_orient': {
-        'countries': [
-            'arabie_saoudite', 'iran', 'irak', 'israel', 'palestine', 'liban',
-            'syrie', 'jordanie', 'yemen', 'oman', 'emirats_arabes_unis',
-            'qatar', 'bahrein', 'koweït', 'turquie'
-        ],
-        'continent': 'Asie'
-    },
-    'afrique_du_nord': {
-        'countries': ['maroc', 'algerie', 'tunisie', 'libye', 'égypte', 'soudan'],
-        'continent': 'Afrique'
-    },
-    'afrique_subsaharienne': {
-        'countries': [
-            'afrique_du_sud', 'kenya', 'nigeria', 'ghana', 'senegal', 'ethiopie',
-            'cameroun', 'congo', 'tanzanie', 'uganda', 'malawi', 'zambie',
-            'zimbabwe', 'mozambique', 'botswana', 'namibie', 'mauritius'
-        ],
-        'continent': 'Afrique'
-    },
-    'amerique_du_nord': {
-        'countries': ['usa', 'états-unis', 'canada', 'mexique'],
-        'continent': 'Amérique du Nord'
-    },
-    'amerique_centrale': {
-        'countries': [
-            'guatemala', 'honduras', 'salvador', 'nicaragua', 'costa_rica',
-            'panama', 'belize'
-        ],
-        'continent': 'Amérique Centrale'
-    },
-    'amerique_du_sud': {
-        'countries': [
-            'colombie', 'venezuela', 'guyana', 'surinam', 'brésil', 'pérou',
-            'bolivie', 'chili', 'argentine', 'uruguay', 'paraguay', 'équateur'
-        ],
-        'continent': 'Amérique du Sud'
-    },
-    'oceanie': {
-        'countries': [
-            'australie', 'nouvelle-zélande', 'fidji', 'samoa', 'vanuatu',
-            'tonga', 'kiribati', 'marshall'
-        ],
-        'continent': 'Océanie'
-    }
-}
-
-# Catégories de domaines et synonymes
-FIELD_CATEGORIES = {
-    'informatique': [
-        'computer science', 'cs', 'software', 'programmation', 'coding',
-        'développement', 'data science', 'ia', 'machine learning', 'ai',
-        'cybersécurité', 'network', 'web development', 'développement web'
-    ],
-    'ingénierie': [
-        'engineering', 'génie', 'civil', 'mécanique', 'électrique',
-        'électronique', 'aéronautique', 'chimie', 'matériaux', 'géotechnique'
-    ],
-    'santé': [
-        'médecine', 'medicine', 'nursing', 'infirmerie', 'pharmacie',
-        'pharmacy', 'dentaire', 'dentistry', 'psychologie', 'psychology',
-        'santé publique', 'public health'
-    ],
-    'sciences': [
-        'physique', 'physics', 'chimie', 'biologie', 'biology', 'mathématiques',
-        'mathematics', 'géologie', 'astronomie', 'environnement'
-    ],
-    'commerce': [
-        'business', 'économie', 'economics', 'finance', 'accounting',
-        'comptabilité', 'management', 'marketing', 'mba', 'gestion'
-    ],
-    'droit': [
-        'law', 'droit', 'jurisprudence', 'légal', 'international_law',
-        'droit_international', 'constitutionnel'
-    ],
-    'arts': [
-        'art', 'design', 'musique', 'music', 'théâtre', 'dance', 'film',
-        'cinéma', 'photographie', 'architecture', 'beaux-arts'
-    ],
-    'humaines': [
-        'philosophie', 'histoire', 'littérature', 'langue', 'linguistics',
-        'sociologie', 'anthropologie', 'géographie', 'sciences_humaines'
-    ],
-    'éducation': [
-        'education', 'enseignement', 'pédagogie', 'formation', 'training'
-    ]
-}
-
-# Langues supportées et variantes
-LANGUAGE_VARIANTS = {
-    'français': ['fr', 'french', 'fra'],
-    'anglais': ['en', 'english', 'eng'],
-    'espagnol': ['es', 'spanish', 'esp'],
-    'allemand': ['de', 'german', 'deu'],
-    'chinois': ['zh', 'chinese', 'zho', 'mandarin'],
-    'japonais': ['ja', 'japanese', 'jpn'],
-    'arabe': ['ar', 'arabic', 'ara'],
-    'russe': ['ru', 'russian', 'rus'],
-    'portugais': ['pt', 'portuguese', 'por']
-}
-
-# Hiérarchie des niveaux (important pour matching flexible)
-LEVEL_HIERARCHY = {
-    'licence': 0, 'bachelor': 0, 'undergrad': 0, 'bac+3': 0,
-    'master': 1, 'maitrise': 1, 'msc': 1, 'ma': 1, 'bac+5': 1,
-    'doctorat': 2, 'phd': 2, 'doctorate': 2, 'bac+8': 2,
-    'post-doctorat': 3, 'postdoc': 3, 'post-doc': 3
-}
-
-# Poids des critères (V2 - optimisés)
-WEIGHTS_V2 = {
-    'country_match': 0.28,        # 28% - Pays (augmenté)
-    'field_match': 0.22,          # 22% - Domaine (augmenté)
-    'level_match': 0.18,          # 18% - Niveau
-    'type_match': 0.10,           # 10% - Type
-    'origin_bonus': 0.08,         # 8% - Origine
-    'language_match': 0.08,       # 8% - Langue
-    'gpa_match': 0.06,            # 6% - GPA (réduit)
-}
+def _intern(value):
+    """Interner une chaîne (valeurs répétées stockées une seule fois)"""
+    return sys.intern(value) if type(value) is str else value
 
-# Sélectivité des bourses (estimée)
-SCHOLARSHIP_SELECTIVITY = {
-    'très_sélective': {'gpa_min': 3.7, 'multiplier': 1.0},
-    'sélective': {'gpa_min': 3.3, 'multiplier': 0.85},
-    'modérée': {'gpa_min': 3.0, 'multiplier': 0.7},
-    'accessible': {'gpa_min': 2.5, 'multiplier': 0.5}
-}
+@memoized_resolver
+def _language_tags(value: str) -> FrozenSet[str]:
+    """Langues détectées stockées en base ('fr french ...') -> ensemble partagé"""
+    return frozenset(value.split())
 
-# ============================================================================
-# CLASSES DE DONNÉES (AMÉLIORÉES)
-# ============================================================================
+def text_tags(titre: str, description: str, domaine_etude: str) -> Tuple[FrozenSet[str], bool, str]:
+    """
+    Tags d'une bourse (langues, international, sélectivité) : mêmes règles de
+    sous-chaînes que les triggers de scholarship_tags, calculées en Python
+    quand la base ne les fournit pas
+    """
+    text = (titre + " " + description).lower()
+    languages = _language_tags(' '.join(token for token in LANGUAGE_TOKENS if token in text))
+    international = any(kw in text for kw in INTERNATIONAL_KEYWORDS)
+    
+    selectivity_text = (titre + " " + domaine_etude).lower()
+    selectivity = next(
+        (tier for tier, keywords in SELECTIVITY_KEYWORDS if any(kw in selectivity_text for kw in keywords)),
+        DEFAULT_SELECTIVITY
+    )
+    return languages, international, selectivity
 
 @dataclass
 class UserProfile:
@@ -236,9 +108,9 @@ class UserProfile:
             finance_type=data.get('finance_type')
         )
 
-@dataclass
+@dataclass(slots=True)
 class Scholarship:
-    """Bourse d'études enrichie"""
+    """Bourse d'études enrichie (__slots__, chaînes répétées internées)"""
     id: int
     titre: str
     description: str
@@ -250,24 +122,41 @@ class Scholarship:
     date_limite: str
     montant: str
     devise: str
-    lien_candidature: str
+    lien_candidature: Optional[str]  # texte froid : None tant que non chargé (load_cold_text)
+    # Tags pré-calculés (scholarship_tags), sinon calculés à la construction
+    languages: Optional[FrozenSet[str]] = None
+    international: Optional[bool] = None
+    selectivity: Optional[str] = None
+    
+    def __post_init__(self):
+        if self.languages is None:
+            self.languages, self.international, self.selectivity = text_tags(
+                self.titre, self.description, self.domaine_etude)
     
     @classmethod
-    def from_tuple(cls, t: Tuple):
-        """Créer depuis un tuple"""
+    def from_tuple(cls, t: Tuple, tags: Optional[Tuple] = None):
+        """
+        Créer depuis un tuple (sans lien_candidature si le tuple s'arrête à devise).
+        tags : (langues, international, sélectivité) lus dans scholarship_tags
+        """
+        intern = _intern
+        languages, international, selectivity = tags if tags and tags[0] is not None else (None, None, None)
         return cls(
             id=t[0],
             titre=t[1],
             description=t[2],
-            pays=t[3],
-            pays_cibles=t[4],
-            domaine_etude=t[5],
-            niveau_etude=t[6],
-            type_bourse=t[7],
-            date_limite=t[8],
-            montant=t[9],
-            devise=t[10],
-            lien_candidature=t[11] if len(t) > 11 else ""
+            pays=intern(t[3]),
+            pays_cibles=intern(t[4]),
+            domaine_etude=intern(t[5]),
+            niveau_etude=intern(t[6]),
+            type_bourse=intern(t[7]),
+            date_limite=intern(t[8]),
+            montant=intern(t[9]),
+            devise=intern(t[10]),
+            lien_candidature=t[11] if len(t) > 11 else None,
+            languages=_language_tags(languages) if languages is not None else None,
+            international=bool(international) if languages is not None else None,
+            selectivity=intern(selectivity)
         )
 
 @dataclass
@@ -294,6 +183,7 @@ class RecommendationScore:
     reasons: List[str] = field(default_factory=list)
     deadline_status: str = "ouvert"
     days_until_deadline: Optional[int] = None
+    domaine_etude: str = ""
     
     def to_dict(self) -> Dict:
         """Convertir en dictionnaire JSON-friendly"""
@@ -314,6 +204,15 @@ class RecommendationScore:
         """Convertir en JSON"""
         return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
 
+@dataclass(frozen=True)
+class LoadedCatalog:
+    """Catalogue en cache, publié d'un bloc : un thread ne mélange jamais deux versions"""
+    scholarships: List[Scholarship]
+    features: List[ScholarshipFeatures]  # caractéristiques du noyau de scoring, même ordre
+    by_id: Dict[int, Scholarship]
+    countries: int
+    data_version: int  # PRAGMA data_version lors du chargement
+
 # ============================================================================
 # MOTEUR DE RECOMMANDATION HYBRIDE V2
 # ============================================================================
@@ -327,23 +226,208 @@ class HybridRecommendationEngineV2:
     ✅ Optimisations de performance
     ✅ Explications détaillées et claires
     ✅ Gestion intelligente des deadlines
+    ✅ Règles de scoring partagées avec le moteur FastAPI (ScoringCore)
     """
     
-    def __init__(self, db_file: str = 'scholarships.db'):
+    CANDIDATE_POOL = 200  # meilleurs candidats entièrement triés avant diversification
+    
+    # Index SQL : valeurs distinctes (_prepare_data) et contraintes du mode préfiltre
+    INDEXES = {
+        'idx_scholarship_pays': 'pays',
+        'idx_scholarship_domaine_etude': 'domaine_etude',
+        'idx_scholarship_niveau_etude': 'niveau_etude',
+        'idx_scholarship_date_limite': 'date_limite'
+    }
+    ISO_DATE_GLOB = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+    
+    # Tags de langue / sélectivité calculés en SQL et tenus à jour par triggers
+    TAGS_TABLE = 'scholarship_tags'
+    TAG_COLUMNS = ('languages', 'international', 'selectivity')
+    
+    # Colonnes chargées en mémoire ; les colonnes froides sont lues à la demande
+    HOT_COLUMNS = ('id', 'titre', 'description', 'pays', 'pays_cibles', 'domaine_etude',
+                   'niveau_etude', 'type_bourse', 'date_limite', 'montant', 'devise')
+    COLD_COLUMNS = ('lien_candidature',)
+    
+    # Noms des composantes (raisons, to_dict) pour les clés de ScoringCore.score
+    COMPONENT_NAMES = {
+        'country': 'pays',
+        'field': 'domaine',
+        'level': 'niveau',
+        'type': 'type',
+        'origin': 'origine',
+        'language': 'langue',
+        'gpa': 'gpa'
+    }
+    
+    def __init__(self, db_file: str = 'scholarships.db',
+                 max_per_country: Optional[int] = None, max_per_field: Optional[int] = None,
+                 prefilter: bool = False):
+        """
+        Args:
+            db_file: Base SQLite des bourses
+            max_per_country: Plafond de bourses par pays lors de la diversification (None = sans plafond)
+            max_per_field: Plafond de bourses par domaine lors de la diversification (None = sans plafond)
+            prefilter: Exclure en SQL les bourses fermées et de niveau incompatible, puis
+                scorer les lignes restantes en flux (catalogue jamais gardé en mémoire)
+        """
+        if (max_per_country is not None and max_per_country < 1) or \
+           (max_per_field is not None and max_per_field < 1):
+            raise ValueError("Les plafonds de diversification doivent être >= 1")
+        
         self.db_file = db_file
-        self.conn = sqlite3.connect(db_file)
-        self.conn.row_factory = sqlite3.Row
+        self.max_per_country = max_per_country
+        self.max_per_field = max_per_field
+        self.prefilter = prefilter
+        self.pool = SQLiteConnectionPool(db_file)
+        # Règles partagées ; 'anywhere' reste un pays cible "monde ouvert" ici
+        self.core = ScoringCore(EXTENDED_OPEN_WORLD_KEYWORDS)
+        self._shared_values: Dict[Any, Any] = {}
         
         # Caches pour optimisation
-        self.scholarships_cache: Optional[List[Scholarship]] = None
+        self._catalog: Optional[LoadedCatalog] = None
+        self._catalog_lock = threading.Lock()
+        self._prepared_version: Optional[int] = None  # data_version des index de valeurs distinctes
         self.countries_cache: Set[str] = set()
         self.fields_cache: Set[str] = set()
         self.levels_cache: Set[str] = set()
+        self.level_labels: Tuple[str, ...] = ()
         
+        self._ensure_indexes()
+        self._tags_available = self._ensure_tags()
         self._prepare_data()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connexion SQLite du thread courant"""
+        return self.pool.connection()
+    
+    @property
+    def scholarships_cache(self) -> Optional[List[Scholarship]]:
+        """Bourses en cache (None si pas encore chargées)"""
+        catalog = self._catalog
+        return catalog.scholarships if catalog else None
+    
+    @property
+    def catalog_countries(self) -> int:
+        """Nombre de pays distincts du catalogue en cache"""
+        catalog = self._catalog
+        return catalog.countries if catalog else 0
+    
+    def _ensure_indexes(self):
+        """Créer les index manquants (SQLite les maintient ensuite à chaque écriture)"""
+        self.pool.write(*(
+            f"CREATE INDEX IF NOT EXISTS {name} ON scholarship({column})"
+            for name, column in self.INDEXES.items()
+        ))
+    
+    # ===== TAGS PRÉ-CALCULÉS (LANGUES, INTERNATIONAL, SÉLECTIVITÉ) =====
+    
+    @classmethod
+    def _tag_rules_digest(cls) -> str:
+        """Empreinte du SQL des tags (nouvelles règles = triggers recréés, tags recalculés)"""
+        return hashlib.sha256(cls._tags_select('scholarship').encode('utf-8')).hexdigest()[:12]
+    
+    @staticmethod
+    def _sql_contains(text: str, keyword: str) -> str:
+        """
+        Test de sous-chaîne SQL. lower() de SQLite ne traite que l'ASCII : les
+        lettres accentuées du mot-clé sont aussi cherchées en majuscule (ç / Ç)
+        """
+        variants = sorted({''.join(chars) for chars in itertools.product(*(
+            (c, c.upper()) if not c.isascii() and len(c.upper()) == 1 else (c,) for c in keyword
+        ))})
+        return '(' + ' OR '.join(
+            f"instr({text}, '{variant.replace(chr(39), chr(39) * 2)}') > 0" for variant in variants
+        ) + ')'
+    
+    @classmethod
+    def _tags_select(cls, source: str) -> str:
+        """
+        SELECT (id, langues, international, sélectivité) sur source (colonnes id,
+        titre, description, domaine_etude) : mêmes sous-chaînes que text_tags,
+        sur le texte en minuscules
+        """
+        languages = " || ".join(
+            f"CASE WHEN {cls._sql_contains('t', token)} THEN ' {token}' ELSE '' END"
+            for token in LANGUAGE_TOKENS
+        )
+        international = " OR ".join(cls._sql_contains('t', kw) for kw in INTERNATIONAL_KEYWORDS)
+        selectivity = " ".join(
+            f"WHEN {' OR '.join(cls._sql_contains('s', kw) for kw in keywords)} THEN '{tier}'"
+            for tier, keywords in SELECTIVITY_KEYWORDS
+        )
+        return (
+            f"SELECT id, trim({languages}), {international}, "
+            f"CASE {selectivity} ELSE '{DEFAULT_SELECTIVITY}' END "
+            f"FROM (SELECT id, lower(coalesce(titre, '') || ' ' || coalesce(description, '')) AS t, "
+            f"lower(coalesce(titre, '') || ' ' || coalesce(domaine_etude, '')) AS s FROM {source})"
+        )
+    
+    def _ensure_tags(self) -> bool:
+        """
+        Créer scholarship_tags et ses triggers (insert / update / delete sur
+        scholarship) puis calculer les tags de tout le catalogue, si les
+        triggers des règles courantes n'existent pas encore. True si les tags
+        stockés sont utilisables.
+        """
+        digest = self._tag_rules_digest()
+        triggers = {f"{self.TAGS_TABLE}_{event}_{digest}" for event in ('ai', 'au', 'ad')}
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                       (f"{self.TAGS_TABLE}_%",))
+        existing = {row[0] for row in cursor.fetchall()}
+        if triggers <= existing:
+            return True
+        
+        insert = f"INSERT OR REPLACE INTO {self.TAGS_TABLE} (id, {', '.join(self.TAG_COLUMNS)}) "
+        new_row = ("(SELECT new.id AS id, new.titre AS titre, new.description AS description, "
+                   "new.domaine_etude AS domaine_etude)")
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {self.TAGS_TABLE} ("
+            f"id INTEGER PRIMARY KEY, languages TEXT NOT NULL, international INTEGER NOT NULL, "
+            f"selectivity TEXT NOT NULL)",
+            *(f"DROP TRIGGER IF EXISTS {name}" for name in existing - triggers),
+            f"DELETE FROM {self.TAGS_TABLE}",
+            f"CREATE TRIGGER IF NOT EXISTS {self.TAGS_TABLE}_ai_{digest} AFTER INSERT ON scholarship BEGIN "
+            f"{insert}{self._tags_select(new_row)}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.TAGS_TABLE}_au_{digest} "
+            f"AFTER UPDATE OF id, titre, description, domaine_etude ON scholarship BEGIN "
+            f"DELETE FROM {self.TAGS_TABLE} WHERE id = old.id; {insert}{self._tags_select(new_row)}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.TAGS_TABLE}_ad_{digest} AFTER DELETE ON scholarship BEGIN "
+            f"DELETE FROM {self.TAGS_TABLE} WHERE id = old.id; END",
+            insert + self._tags_select('scholarship')
+        ]
+        return self.pool.write(*statements)
+    
+    def _select_scholarships(self, where: str = '') -> str:
+        """SELECT des colonnes chaudes (+ tags stockés si disponibles)"""
+        columns = ', '.join(f"s.{column}" for column in self.HOT_COLUMNS)
+        if not self._tags_available:
+            return f"SELECT {columns} FROM scholarship AS s {where}"
+        tags = ', '.join(f"t.{column}" for column in self.TAG_COLUMNS)
+        return (f"SELECT {columns}, {tags} FROM scholarship AS s "
+                f"LEFT JOIN {self.TAGS_TABLE} AS t ON t.id = s.id {where}")
+    
+    def _scholarship_from_row(self, row: Tuple) -> Scholarship:
+        """Bourse depuis une ligne de _select_scholarships (tags recalculés s'ils manquent)"""
+        width = len(self.HOT_COLUMNS)
+        return Scholarship.from_tuple(row[:width], tuple(row[width:]) or None)
+    
+    def _features_from_row(self, row: Tuple, scholarship: Scholarship) -> ScholarshipFeatures:
+        """Caractéristiques normalisées (ScoringCore) d'une ligne, tags de la bourse réutilisés"""
+        return self.core.build_features(
+            dict(zip(self.HOT_COLUMNS, row)), share=self._share,
+            tags=(scholarship.languages, scholarship.international, scholarship.selectivity)
+        )
+    
+    def _share(self, value: Any) -> Any:
+        """Instance partagée d'une valeur immuable (tuple, frozenset) entre bourses"""
+        return self._shared_values.setdefault(value, value)
+    
     def _prepare_data(self):
-        """Préparer et indexer les données"""
+        """Préparer les valeurs distinctes (lues dans les index, sans parcourir la table)"""
+        self._prepared_version = self.pool.data_version()
         cursor = self.conn.cursor()
         
         # Cache des pays
@@ -356,7 +440,8 @@ class HybridRecommendationEngineV2:
         
         # Cache des niveaux
         cursor.execute("SELECT DISTINCT niveau_etude FROM scholarship")
-        self.levels_cache = {row[0].lower() for row in cursor.fetchall() if row[0]}
+        self.level_labels = tuple(row[0] for row in cursor.fetchall() if row[0])
+        self.levels_cache = {label.lower() for label in self.level_labels}
     
     def recommend(self, user_profile: UserProfile, top_n: int = 10,
                  min_score: float = 0.15, diversify: bool = True) -> List[RecommendationScore]:
@@ -373,93 +458,252 @@ class HybridRecommendationEngineV2:
             Liste de exactement top_n recommandations (même si scores faibles)
         """
         
-        # 1. Récupérer toutes les bourses
-        scholarships = self._get_all_scholarships()
+        # Profil résolu et jour de référence : une seule fois par requête
+        profile = self.resolve_profile(user_profile)
+        today = ScoringCore.today()
         
-        if not scholarships:
+        # 1-2. Charger et scorer en une seule passe : catalogue en cache (rechargé
+        # si la base a changé) ou, en mode préfiltre, lignes filtrées en SQL
+        if self.prefilter:
+            scored, catalog_countries = self._score_prefiltered(profile, today)
+        else:
+            catalog = self._load_catalog()
+            scored = [
+                self._calculate_score(profile, scholarship, features, today)
+                for scholarship, features in zip(catalog.scholarships, catalog.features)
+            ]
+            catalog_countries = catalog.countries
+        
+        if not scored:
             return []
         
-        # 2. Scorer chaque bourse
-        recommendations = []
-        for scholarship in scholarships:
-            score = self._calculate_score(user_profile, scholarship)
-            recommendations.append(score)
+        # 3-4. Classer : top-k (tri partiel) puis diversification si demandée
+        if diversify and len(scored) > top_n:
+            recommendations = self._select_diversified(scored, top_n, catalog_countries)
+        else:
+            # Prendre simplement les top N
+            recommendations = heapq.nlargest(top_n, scored, key=lambda x: x.overall_score)
         
-        # 3. Trier par score descendant
-        recommendations.sort(key=lambda x: x.overall_score, reverse=True)
+        # 5. Compléter jusqu'à top_n si besoin, depuis la liste déjà scorée
+        recommendations = self._pad_results(recommendations, scored, top_n)
         
-        # 4. Appliquer diversification si demandée
-        if diversify and len(recommendations) > top_n:
-            recommendations = self._diversify_results(recommendations, top_n)
+        # Raisons générées pour les bourses retournées seulement
+        if self.prefilter:
+            by_id = self._fetch_scholarships([score.scholarship_id for score in recommendations])
         else:
-            # Prendre simplement les top N
-            recommendations = recommendations[:top_n]
+            by_id = catalog.by_id
+        for score in recommendations:
+            scholarship = by_id[score.scholarship_id]
+            score.reasons = self._generate_reasons(user_profile, scholarship, score)
         
-        # 5. Compléter jusqu'à top_n si besoin (avec bourses de score faible)
+        return recommendations
+    
+    @staticmethod
+    def _pad_results(recommendations: List[RecommendationScore], scored: List[RecommendationScore],
+                     top_n: int) -> List[RecommendationScore]:
+        """Compléter avec les bourses non retenues (ordre du catalogue, scores faibles inclus)"""
         if len(recommendations) < top_n:
-            all_recommendations = self._get_all_scholarships()
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM scholarship")
-            all_scholarships = [Scholarship.from_tuple(row) for row in cursor.fetchall()]
-            
-            for scholarship in all_scholarships:
+            chosen_ids = {r.scholarship_id for r in recommendations}
+            for score in scored:
                 if len(recommendations) >= top_n:
                     break
-                # Vérifier que la bourse n'est pas déjà présente
-                if not any(r.scholarship_id == scholarship.id for r in recommendations):
-                    score = self._calculate_score(user_profile, scholarship)
+                if score.scholarship_id not in chosen_ids:
                     recommendations.append(score)
-        
+                    chosen_ids.add(score.scholarship_id)
         return recommendations[:top_n]
     
-    def _diversify_results(self, recommendations: List[RecommendationScore],
-                          top_n: int) -> List[RecommendationScore]:
+    def _select_diversified(self, recommendations: List[RecommendationScore],
+                            top_n: int, catalog_countries: int) -> List[RecommendationScore]:
         """
-        Diversifier les résultats pour éviter redondance
-        Stratégie: favoriser différents pays et domaines
+        Diversifier sur les meilleurs candidats seulement (tri partiel O(n log k)),
+        cf. select_diversified
         """
-        diverse = []
-        countries_used = set()
-        
-        # Passer 1: Ajouter les meilleurs de chaque pays
-        for rec in recommendations:
-            if rec.pays.lower() not in countries_used and len(diverse) < top_n:
-                diverse.append(rec)
-                countries_used.add(rec.pays.lower())
-        
-        # Passe 2: Compléter avec les meilleurs restants
-        for rec in recommendations:
-            if len(diverse) >= top_n:
-                break
-            if rec not in diverse:
-                diverse.append(rec)
-        
-        return diverse[:top_n]
+        return select_diversified(
+            lambda k: heapq.nlargest(k, recommendations, key=lambda x: x.overall_score),
+            len(recommendations), top_n, catalog_countries, max(self.CANDIDATE_POOL, top_n),
+            self._diversity_keys, self.max_per_country, self.max_per_field
+        )
+    
+    @staticmethod
+    def _diversity_keys(score: RecommendationScore) -> Tuple[str, str]:
+        """Clés (pays, domaine) d'un résultat pour la diversification"""
+        return country_key(score.pays), field_key(score.domaine_etude)
     
     def _get_all_scholarships(self) -> List[Scholarship]:
-        """Récupérer toutes les bourses (avec cache)"""
-        if self.scholarships_cache is not None:
-            return self.scholarships_cache
-        
+        """Récupérer toutes les bourses (avec cache, rechargé si la base a été modifiée)"""
+        return self._load_catalog().scholarships
+    
+    def _load_catalog(self) -> LoadedCatalog:
+        """
+        Catalogue en cache, rechargé (un seul thread à la fois) si une
+        écriture a été validée depuis son chargement (PRAGMA data_version)
+        """
+        data_version = self.pool.data_version()
+        catalog = self._catalog
+        if catalog is not None and catalog.data_version == data_version:
+            return catalog
+        
+        with self._catalog_lock:
+            catalog = self._catalog
+            if catalog is not None and catalog.data_version == data_version:
+                return catalog
+            if self._prepared_version != data_version:
+                self._prepare_data()  # valeurs distinctes périmées elles aussi
+            
+            cursor = self.conn.cursor()
+            cursor.execute(self._select_scholarships())
+            self._shared_values = {}
+            scholarships, features = [], []
+            for row in cursor.fetchall():
+                scholarship = self._scholarship_from_row(row)
+                scholarships.append(scholarship)
+                features.append(self._features_from_row(row, scholarship))
+            self._catalog = LoadedCatalog(
+                scholarships=scholarships,
+                features=features,
+                by_id={s.id: s for s in scholarships},
+                countries=len({country_key(s.pays) for s in scholarships}),
+                data_version=data_version
+            )
+            return self._catalog
+    
+    def invalidate_cache(self):
+        """Forcer le rechargement du catalogue et des valeurs distinctes à la prochaine requête"""
+        self._prepared_version = None
+        self._catalog = None
+    
+    # ===== MODE PRÉFILTRE (CONTRAINTES DURES EN SQL) =====
+    
+    def _score_prefiltered(self, profile: ResolvedProfile, today: int) -> Tuple[List[RecommendationScore], int]:
+        """
+        Scorer en flux les bourses qui passent les contraintes dures : seuls
+        les scores sont conservés. Retourne (scores, nombre de pays distincts).
+        """
+        where, params = self._prefilter_clause(profile, today)
+        cursor = self.conn.cursor()
+        cursor.execute(self._select_scholarships(f"WHERE {where}"), params)
+        
+        scored = []
+        countries: Set[str] = set()
+        for row in cursor:
+            scholarship = self._scholarship_from_row(row)
+            features = self._features_from_row(row, scholarship)
+            score = self._calculate_score(profile, scholarship, features, today)
+            if score.deadline_status == 'fermé':
+                continue  # date non normalisée (ex. 2024-1-5) que le SQL n'a pas reconnue
+            scored.append(score)
+            countries.add(scholarship.pays.lower())
+        return scored, len(countries)
+    
+    def _prefilter_clause(self, profile: ResolvedProfile, today: int) -> Tuple[str, List[str]]:
+        """
+        Clause WHERE des contraintes dures :
+        - Deadline passée ('fermé' pour ScoringCore.analyze_deadline : date AAAA-MM-JJ valide <= aujourd'hui)
+        - Niveau hors fourchette (ScoringCore.LEVEL_MISMATCH_SCORE) pour le niveau du profil
+        """
+        clauses = [
+            "(date_limite IS NULL OR date_limite > ? OR date_limite NOT GLOB ? "
+            "OR date(date_limite, '+0 days') IS NOT date_limite)"  # modificateur : 2025-02-30 invalide
+        ]
+        params = [date.fromordinal(today).isoformat(), self.ISO_DATE_GLOB]
+        
+        excluded = self._incompatible_levels(profile)
+        if excluded:
+            clauses.append(f"(niveau_etude IS NULL OR niveau_etude NOT IN ({', '.join('?' * len(excluded))}))")
+            params.extend(excluded)
+        return ' AND '.join(clauses), params
+    
+    def _incompatible_levels(self, profile: ResolvedProfile) -> List[str]:
+        """Valeurs distinctes de niveau_etude incompatibles avec le niveau du profil"""
+        user_level_value = profile.level_value
+        if user_level_value is None:
+            return []
+        if self._prepared_version != self.pool.data_version():
+            self._prepare_data()
+        return [
+            label for label in self.level_labels
+            if self.core.score_level_label(user_level_value, label) == ScoringCore.LEVEL_MISMATCH_SCORE
+        ]
+    
+    def _fetch_scholarships(self, ids: List[int]) -> Dict[int, Scholarship]:
+        """Relire les bourses retournées (mode préfiltre : catalogue non gardé en mémoire)"""
+        if not ids:
+            return {}
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM scholarship")
-        self.scholarships_cache = [Scholarship.from_tuple(row) for row in cursor.fetchall()]
-        return self.scholarships_cache
+        cursor.execute(self._select_scholarships(f"WHERE s.id IN ({', '.join('?' * len(ids))})"), ids)
+        return {row[0]: self._scholarship_from_row(row) for row in cursor.fetchall()}
+    
+    def load_cold_text(self, scholarship: Scholarship) -> Scholarship:
+        """Charger les colonnes froides d'une bourse (lien de candidature) à la demande"""
+        if scholarship.lien_candidature is None:
+            cursor = self.conn.cursor()
+            cursor.execute(f"SELECT {', '.join(self.COLD_COLUMNS)} FROM scholarship WHERE id = ?",
+                           (scholarship.id,))
+            row = cursor.fetchone()
+            scholarship.lien_candidature = (row[0] or "") if row else ""
+        return scholarship
+    
+    def memory_footprint(self) -> Dict[str, int]:
+        """Empreinte mémoire approximative (octets) du catalogue en cache et des index"""
+        catalog = self._catalog
+        footprint = {
+            'scholarships': estimate_memory(catalog.scholarships if catalog else [], modules=(__name__,)),
+            'features': estimate_memory(catalog.features if catalog else []),
+            'indexes': estimate_memory(self.countries_cache, self.fields_cache, self.levels_cache)
+        }
+        footprint['total'] = sum(footprint.values())
+        return footprint
     
-    def _calculate_score(self, user: UserProfile, scholarship: Scholarship) -> RecommendationScore:
+    def resolve_profile(self, user: UserProfile) -> ResolvedProfile:
+        """Normaliser et résoudre les champs du profil (une fois par requête)"""
+        return self.core.resolve_profile(
+            target_country=user.target_country,
+            origin_country=user.origin_country,
+            field_of_study=user.field_of_study,
+            education_level=user.education_level,
+            preferred_language=user.preferred_language,
+            scholarship_type=user.scholarship_type,
+            gpa=user.gpa
+        )
+    
+    def _calculate_score(self, profile: ResolvedProfile, scholarship: Scholarship,
+                         features: ScholarshipFeatures, today: int) -> RecommendationScore:
         """
-        Calculer le score de recommandation multicritères V2
+        Calculer le score de recommandation multicritères V2 (ScoringCore.score)
         
         Critères pondérés:
         28% Pays | 22% Domaine | 18% Niveau | 10% Type | 8% Origine | 8% Langue | 6% GPA
+        Deadline : urgent +10% | proche +5% | fermé -50% | sinon 0
+        Les raisons sont générées ensuite, pour les bourses retenues seulement.
         """
+        result = self.core.score(profile, features, today)
+        overall_score = result['overall_score']
         
-        component_scores = {}
+        return RecommendationScore(
+            scholarship_id=scholarship.id,
+            titre=scholarship.titre,
+            montant=scholarship.montant,
+            pays=scholarship.pays,
+            overall_score=overall_score,
+            match_percentage=overall_score * 100,
+            component_scores={self.COMPONENT_NAMES[k]: v for k, v in result['scores'].items()},
+            deadline_status=result['deadline_status'],
+            days_until_deadline=result['days_until_deadline'],
+            domaine_etude=scholarship.domaine_etude
+        )
+    
+    def _generate_reasons(self, user: UserProfile, scholarship: Scholarship,
+                          score: RecommendationScore) -> List[str]:
+        """
+        Raisons lisibles d'une recommandation, générées pour les bourses
+        retournées seulement (pas pendant le scoring du catalogue)
+        """
+        component_scores = score.component_scores
+        deadline_status, days_left = score.deadline_status, score.days_until_deadline
         reasons = []
         
         # ===== CRITÈRE 1: PAYS (28%) =====
-        country_score = self._score_country_match_v2(user, scholarship)
-        component_scores['pays'] = country_score
+        country_score = component_scores['pays']
         
         if country_score >= 0.95:
             reasons.append(f"✅ Destiné pour {scholarship.pays} - Match exact")
@@ -471,8 +715,7 @@ class HybridRecommendationEngineV2:
             reasons.append("📍 Bourse générale multi-régionale")
         
         # ===== CRITÈRE 2: DOMAINE (22%) =====
-        field_score = self._score_field_match_v2(user, scholarship)
-        component_scores['domaine'] = field_score
+        field_score = component_scores['domaine']
         
         if field_score >= 0.95:
             reasons.append(f"✅ {user.field_of_study} - Correspondance parfaite")
@@ -482,8 +725,7 @@ class HybridRecommendationEngineV2:
             reasons.append("✅ Domaine compatible")
         
         # ===== CRITÈRE 3: NIVEAU (18%) =====
-        level_score = self._score_level_match_v2(user, scholarship)
-        component_scores['niveau'] = level_score
+        level_score = component_scores['niveau']
         
         if level_score >= 0.95:
             reasons.append(f"✅ {scholarship.niveau_etude} - Niveau exact")
@@ -493,8 +735,7 @@ class HybridRecommendationEngineV2:
             reasons.append("⚠️  Niveau compatible")
         
         # ===== CRITÈRE 4: TYPE (10%) =====
-        type_score = self._score_type_match_v2(user, scholarship)
-        component_scores['type'] = type_score
+        type_score = component_scores['type']
         
         if type_score >= 0.90:
             reasons.append(f"✅ {scholarship.type_bourse} - Exactement ce que vous cherchez")
@@ -502,8 +743,7 @@ class HybridRecommendationEngineV2:
             reasons.append(f"✅ Type {scholarship.type_bourse} disponible")
         
         # ===== CRITÈRE 5: PAYS D'ORIGINE (8%) =====
-        origin_score = self._score_origin_bonus_v2(user, scholarship)
-        component_scores['origine'] = origin_score
+        origin_score = component_scores['origine']
         
         if origin_score >= 0.85:
             reasons.append(f"🌍 Spécialisée pour les ressortissants de {user.origin_country}")
@@ -511,8 +751,7 @@ class HybridRecommendationEngineV2:
             reasons.append(f"🌍 Accepte votre région (origine {user.origin_country})")
         
         # ===== CRITÈRE 6: LANGUE (8%) =====
-        language_score = self._score_language_match_v2(user, scholarship)
-        component_scores['langue'] = language_score
+        language_score = component_scores['langue']
         
         if language_score >= 0.85:
             reasons.append(f"🗣️  Entièrement en {user.preferred_language}")
@@ -522,8 +761,7 @@ class HybridRecommendationEngineV2:
             reasons.append("🗣️  Langues internationales supportées")
         
         # ===== CRITÈRE 7: GPA (6%) =====
-        gpa_score = self._score_gpa_match_v2(user, scholarship)
-        component_scores['gpa'] = gpa_score
+        gpa_score = component_scores['gpa']
         
         if gpa_score >= 0.90:
             reasons.append(f"📊 Votre GPA {user.gpa} surpasse les exigences")
@@ -532,413 +770,23 @@ class HybridRecommendationEngineV2:
         elif gpa_score >= 0.40:
             reasons.append("📊 GPA acceptable pour cette bourse")
         
-        # ===== GESTION DES DEADLINES =====
-        deadline_status, days_left, deadline_boost = self._analyze_deadline(scholarship.date_limite)
-        
+        # ===== DEADLINE =====
         if deadline_status == "urgent":
             reasons.append(f"⏰ URGENT: {days_left} jours avant fermeture")
-            deadline_boost = 0.10  # +10% boost
         elif deadline_status == "proche":
             reasons.append(f"⏰ Deadline dans {days_left} jours - À prévoir")
-            deadline_boost = 0.05  # +5% boost
-        elif deadline_status == "fermé":
-            deadline_boost = -0.50  # -50% malus
-        else:
-            deadline_boost = 0.0
-        
-        # ===== CALCUL DU SCORE PONDÉRÉ =====
-        overall_score = (
-            component_scores['pays'] * WEIGHTS_V2['country_match'] +
-            component_scores['domaine'] * WEIGHTS_V2['field_match'] +
-            component_scores['niveau'] * WEIGHTS_V2['level_match'] +
-            component_scores['type'] * WEIGHTS_V2['type_match'] +
-            component_scores['origine'] * WEIGHTS_V2['origin_bonus'] +
-            component_scores['langue'] * WEIGHTS_V2['language_match'] +
-            component_scores['gpa'] * WEIGHTS_V2['gpa_match']
-        )
-        
-        # Appliquer boost deadline
-        overall_score = max(0, min(1, overall_score * (1 + deadline_boost)))
-        
-        # Match percentage
-        match_percentage = overall_score * 100
-        
-        return RecommendationScore(
-            scholarship_id=scholarship.id,
-            titre=scholarship.titre,
-            montant=scholarship.montant,
-            pays=scholarship.pays,
-            overall_score=overall_score,
-            match_percentage=match_percentage,
-            component_scores=component_scores,
-            reasons=reasons,
-            deadline_status=deadline_status,
-            days_until_deadline=days_left
-        )
-    
-    # =========================================================================
-    # MÉTHODES DE SCORING AVANCÉES V2
-    # =========================================================================
-    
-    def _score_country_match_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring pays V2 amélioré:
-        - Match exact (1.0)
-        - Match dans pays cibles (0.95)
-        - Monde ouvert (0.70)
-        - Même région (0.60)
-        - Même continent (0.40)
-        - Autre (0.10)
-        """
-        user_country = user.target_country.lower().strip()
-        scholarship_country = scholarship.pays.lower().strip()
-        scholarship_targets = scholarship.pays_cibles.lower().strip()
-        
-        # Match exact du pays
-        if user_country == scholarship_country:
-            return 1.0
-        
-        # Match dans la liste des pays cibles
-        targets_list = [c.strip() for c in scholarship_targets.replace(';', ',').split(',')]
-        if any(user_country in target or target in user_country for target in targets_list):
-            return 0.95
-        
-        # Monde ouvert
-        world_keywords = ['monde', 'all', 'international', 'anywhere', 'partout']
-        if any(kw in scholarship_targets for kw in world_keywords):
-            return 0.70
-        
-        # Match par région
-        user_region = self._get_region(user_country)
-        scholarship_region = self._get_region(scholarship_country)
-        
-        if user_region and scholarship_region:
-            if user_region == scholarship_region:
-                return 0.60
-            # Même continent
-            if REGIONS.get(user_region, {}).get('continent') == \
-               REGIONS.get(scholarship_region, {}).get('continent'):
-                return 0.40
-        
-        # Check if scholarship targets the user's region
-        for region_name, region_data in REGIONS.items():
-            if any(c in scholarship_targets for c in region_data['countries']):
-                if user_region == region_name:
-                    return 0.65
-        
-        return 0.10
-    
-    def _score_field_match_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring domaine V2 amélioré:
-        - Match exact (1.0)
-        - Match catégorie (0.90)
-        - Substring/synonyme (0.75)
-        - Domaine ouvert (0.60)
-        """
-        user_field = user.field_of_study.lower().strip()
-        scholarship_field = scholarship.domaine_etude.lower().strip()
-        
-        # Match exact
-        if user_field == scholarship_field:
-            return 1.0
-        
-        # Substring match
-        if user_field in scholarship_field or scholarship_field in user_field:
-            return 0.92
-        
-        # Check if in same category
-        user_category = self._get_field_category(user_field)
-        scholarship_category = self._get_field_category(scholarship_field)
-        
-        if user_category and scholarship_category == user_category:
-            return 0.85
-        
-        # Check synonymes dans la catégorie
-        for category, synonyms in FIELD_CATEGORIES.items():
-            if any(syn in user_field for syn in synonyms) and \
-               any(syn in scholarship_field for syn in synonyms):
-                return 0.78
-        
-        # Tous les domaines
-        open_keywords = ['tous', 'all', 'any', 'toutes']
-        if any(kw in scholarship_field for kw in open_keywords):
-            return 0.60
-        
-        # Word similarity
-        user_words = set(user_field.split())
-        scholarship_words = set(scholarship_field.split())
-        if user_words & scholarship_words:
-            intersection = len(user_words & scholarship_words)
-            union = len(user_words | scholarship_words)
-            return 0.50 + (intersection / union if union > 0 else 0) * 0.30
-        
-        return 0.10
-    
-    def _score_level_match_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring niveau V2 avec hiérarchie stricte:
-        - Match exact (1.0)
-        - Niveau accepté dans fourchette (0.95)
-        - Niveau inférieur accepté (0.80)
-        - Niveau supérieur accepté (0.60)
-        """
-        user_level = user.education_level.lower().strip()
-        scholarship_level = scholarship.niveau_etude.lower().strip()
-        
-        # Get hierarchical values
-        user_level_value = self._get_level_value(user_level)
-        scholarship_level_values = self._get_level_values(scholarship_level)
-        
-        if user_level_value is None or not scholarship_level_values:
-            return 0.50
-        
-        # Match exact
-        if user_level_value in scholarship_level_values:
-            return 1.0
-        
-        # Niveau inférieur accepté (fourchette)
-        min_level = min(scholarship_level_values)
-        max_level = max(scholarship_level_values)
         
-        if min_level <= user_level_value <= max_level:
-            return 0.95
-        
-        # Niveau inférieur à la fourchette mais proche
-        if user_level_value < min_level and (min_level - user_level_value) == 1:
-            return 0.80
-        
-        # Niveau supérieur à la fourchette
-        if user_level_value > max_level and (user_level_value - max_level) == 1:
-            return 0.60
-        
-        # Tous les niveaux
-        if 'tous' in scholarship_level or 'all' in scholarship_level:
-            return 0.70
-        
-        return 0.20
-    
-    def _score_type_match_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring type de bourse V2:
-        - Match exact (1.0)
-        - Type acceptable (0.75)
-        - Type générique (0.50)
-        """
-        if not user.scholarship_type:
-            return 0.65  # Pas de préférence
-        
-        user_type = user.scholarship_type.lower().strip()
-        scholarship_type = scholarship.type_bourse.lower().strip()
-        
-        # Match exact
-        if user_type in scholarship_type or scholarship_type in user_type:
-            return 1.0
-        
-        # Mapping entre les préférences
-        type_mapping = {
-            'complète': ['full', 'complet', 'intégrale'],
-            'partielle': ['partial', 'partiell'],
-            'mérite': ['merit', 'excellence', 'académique'],
-            'besoin': ['need', 'besoin', 'financier', 'ressources']
-        }
-        
-        for pref_type, variations in type_mapping.items():
-            if user_type in pref_type or pref_type in user_type:
-                if any(v in scholarship_type for v in variations):
-                    return 0.85
-        
-        # Bourse complète est meilleure que partielle
-        if 'complet' in scholarship_type and user_type in ['complète', 'full']:
-            return 0.90
-        
-        return 0.50
-    
-    def _score_origin_bonus_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring pays d'origine V2 avec régions:
-        - Cible spécifique du pays (1.0)
-        - Même région (0.75)
-        - Même continent (0.50)
-        - Autre (0.0)
-        """
-        user_origin = user.origin_country.lower().strip()
-        scholarship_targets = scholarship.pays_cibles.lower().strip()
-        scholarship_country = scholarship.pays.lower().strip()
-        
-        # Match exact du pays d'origine dans les cibles
-        if user_origin in scholarship_targets or \
-           (user_origin in scholarship_country and scholarship_country in scholarship_targets):
-            return 1.0
-        
-        # Check if same region
-        user_region = self._get_region(user_origin)
-        scholarship_region = self._get_region(scholarship_country)
-        
-        if user_region and scholarship_region == user_region:
-            # Check if scholarship targets this region
-            region_data = REGIONS.get(user_region, {})
-            if any(c in scholarship_targets for c in region_data.get('countries', [])):
-                return 0.80
-        
-        # Same continent
-        if user_region and scholarship_region:
-            user_continent = REGIONS.get(user_region, {}).get('continent')
-            scholarship_continent = REGIONS.get(scholarship_region, {}).get('continent')
-            
-            if user_continent and user_continent == scholarship_continent:
-                return 0.50
-        
-        # Monde ouvert accepte toute origine
-        if 'monde' in scholarship_targets or 'all' in scholarship_targets:
-            return 0.40
-        
-        return 0.0
-    
-    def _score_language_match_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring langue V2 avec détection multi-niveaux:
-        - Langue exacte (1.0)
-        - Langue acceptée (0.80)
-        - Langue générale (0.50)
-        """
-        user_lang = user.preferred_language.lower().strip()
-        # Assume scholarship description contains language info (pour test)
-        # En production, ajouter champ 'languages' à Scholarship
-        
-        # Chercher langue dans description/titre
-        scholarship_text = (scholarship.titre + " " + scholarship.description).lower()
-        
-        # Get all variant for user's language
-        for lang, variants in LANGUAGE_VARIANTS.items():
-            if user_lang in lang or user_lang in variants:
-                # Check if scholarship mentions this language
-                if user_lang in scholarship_text or \
-                   any(v in scholarship_text for v in variants):
-                    return 1.0
-                else:
-                    # Default pour pays anglophone
-                    if 'usa' in scholarship.pays.lower() or 'uk' in scholarship.pays.lower():
-                        if user_lang == 'en' or user_lang == 'anglais':
-                            return 0.90
-                    # Assumer français si pays francophone
-                    if 'france' in scholarship.pays.lower():
-                        if user_lang == 'fr' or user_lang == 'français':
-                            return 0.90
-        
-        # International/multilingual
-        if any(kw in scholarship_text for kw in ['international', 'multilingual', 'multiple languages']):
-            return 0.70
-        
-        # Default
-        if user_lang == 'en' or user_lang == 'english':
-            return 0.60  # Beaucoup de bourses sont en anglais
-        
-        return 0.40
-    
-    def _score_gpa_match_v2(self, user: UserProfile, scholarship: Scholarship) -> float:
-        """
-        Scoring GPA V2 avec sélectivité réaliste:
-        - Dépasse exigences (1.0)
-        - Conforme exigences (0.85)
-        - Minimum acceptable (0.60)
-        - Autre (0.30)
-        """
-        if not user.gpa:
-            return 0.65  # GPA non fourni = moyenne
-        
-        # Estimer sélectivité de la bourse (simplifié)
-        # En production, avoir champ 'selectivity' dans DB
-        scholarship_text = (scholarship.titre + " " + scholarship.domaine_etude).lower()
-        
-        selectivity = 'modérée'
-        if any(kw in scholarship_text for kw in ['excellence', 'prestigious', 'prestig', 'top']):
-            selectivity = 'très_sélective'
-        elif any(kw in scholarship_text for kw in ['advanced', 'competitive', 'master', 'phd']):
-            selectivity = 'sélective'
-        elif any(kw in scholarship_text for kw in ['accessible', 'open', 'ouvert', 'besoin']):
-            selectivity = 'accessible'
-        
-        gpa_req = SCHOLARSHIP_SELECTIVITY[selectivity]
-        gpa_min = gpa_req['gpa_min']
-        
-        if user.gpa >= gpa_min + 0.5:
-            return 1.0  # Dépasse nettement
-        elif user.gpa >= gpa_min:
-            return 0.85  # Conforme
-        elif user.gpa >= gpa_min - 0.3:
-            return 0.65  # Limite basse mais possible
-        elif user.gpa >= gpa_min - 0.5:
-            return 0.45  # Risqué
-        else:
-            return 0.20  # Peu probable
-    
-    def _analyze_deadline(self, deadline_str: str) -> Tuple[str, Optional[int], float]:
-        """
-        Analyser le statut de la deadline
-        Retourne: (status, days_left, boost)
-        - 'urgent': < 7 jours (+10%)
-        - 'proche': 7-30 jours (+5%)
-        - 'ouvert': > 30 jours (0%)
-        - 'fermé': date passée (-50%)
-        """
-        try:
-            deadline_date = datetime.strptime(deadline_str, '%Y-%m-%d')
-            days_left = (deadline_date - datetime.now()).days
-            
-            if days_left < 0:
-                return 'fermé', 0, -0.50
-            elif days_left <= 7:
-                return 'urgent', days_left, 0.10
-            elif days_left <= 30:
-                return 'proche', days_left, 0.05
-            else:
-                return 'ouvert', days_left, 0.0
-        except:
-            return 'inconnu', None, 0.0
-    
-    # =========================================================================
-    # MÉTHODES UTILITAIRES D'ANALYSE
-    # =========================================================================
-    
-    def _get_region(self, country: str) -> Optional[str]:
-        """Obtenir la région d'un pays"""
-        country = country.lower().strip()
-        for region_name, region_data in REGIONS.items():
-            if any(c in country for c in region_data['countries']):
-                return region_name
-        return None
-    
-    def _get_field_category(self, field: str) -> Optional[str]:
-        """Obtenir la catégorie d'un domaine"""
-        field = field.lower().strip()
-        for category, synonyms in FIELD_CATEGORIES.items():
-            if field in synonyms or any(syn in field for syn in synonyms):
-                return category
-        return None
-    
-    def _get_level_value(self, level: str) -> Optional[int]:
-        """Obtenir la valeur hiérarchique d'un niveau"""
-        level = level.lower().strip()
-        for key, value in LEVEL_HIERARCHY.items():
-            if key in level or level in key:
-                return value
-        return None
+        return reasons
     
-    def _get_level_values(self, level_str: str) -> List[int]:
-        """Obtenir les valeurs hiérarchiques possibles"""
-        level_str = level_str.lower().strip()
-        values = []
-        for key, value in LEVEL_HIERARCHY.items():
-            if key in level_str or level_str in key:
-                if value not in values:
-                    values.append(value)
-        return sorted(values) if values else []
+    def close(self):
+        """Fermer les connexions de tous les threads"""
+        self.pool.close()
     
     def __del__(self):
-        """Fermer la connexion"""
-        if self.conn:
-            self.conn.close()
+        """Fermer les connexions"""
+        pool = getattr(self, 'pool', None)
+        if pool is not None:
+            pool.close()
 
 
 # ============================================================================
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧠 CACHE DES RÉSOLVEURS (PAYS -> RÉGION, DOMAINE -> CATÉGORIE, NIVEAU -> VALEUR)
+Mémoïsation bornée partagée par les deux moteurs de recommandation :
+- Résolveurs purs : une chaîne en entrée, un résultat immuable en sortie
+- LRU borné à RESOLVER_CACHE_SIZE entrées par résolveur, thread-safe
+- Statistiques hit/miss par résolveur (resolver_cache_stats)
+"""
+
+import functools
+from typing import Any, Callable, Dict
+
+RESOLVER_CACHE_SIZE = 4096  # entrées par résolveur
+
+_RESOLVERS: Dict[str, Callable] = {}
+
+def memoized_resolver(func: Callable) -> Callable:
+    """Mémoïser un résolveur pur (arguments hashables, résultat immuable)"""
+    cached = functools.lru_cache(maxsize=RESOLVER_CACHE_SIZE)(func)
+    module = func.__module__.rsplit('.', 1)[-1]
+    _RESOLVERS[f"{module}.{func.__qualname__}"] = cached
+    return cached
+
+def resolver_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistiques par résolveur (taille, hits, misses, taux de hit)"""
+    stats = {}
+    for name, resolver in _RESOLVERS.items():
+        info = resolver.cache_info()
+        total = info.hits + info.misses
+        stats[name] = {
+            'size': info.currsize,
+            'maxEntries': info.maxsize,
+            'hits': info.hits,
+            'misses': info.misses,
+            'hitRate': round(info.hits / total, 3) if total else 0.0
+        }
+    return stats
+
+def clear_resolver_caches():
+    """Vider tous les caches (tables de référence modifiées)"""
+    for resolver in _RESOLVERS.values():
+        resolver.cache_clear()
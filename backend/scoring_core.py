@@ -0,0 +1,1009 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🎯 NOYAU DE SCORING V2 - PARTAGÉ PAR LES MOTEURS SQLITE ET SUPABASE
+Règles de recommandation indépendantes de la source des données :
+- Tables de référence (régions, domaines, langues, niveaux, pondérations)
+- Caractéristiques pré-calculées des bourses (ScholarshipFeatures) et profil résolu
+- Les 7 critères pondérés + boost deadline (ScoringCore)
+- Diversification par pays et domaine des résultats classés
+"""
+
+import logging
+import sys
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from resolver_cache import memoized_resolver
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# DICTIONNAIRES DONNÉES V2 - RÉGIONS & DOMAINES
+# ==========================================
+
+REGIONS = {
+    'europe': {
+        'countries': [
+            'france', 'allemagne', 'royaume-uni', 'suisse', 'pays-bas', 'belgique',
+            'suede', 'norvege', 'danemark', 'espagne', 'italie', 'portugal', 'grece',
+            'autriche', 'pologne', 'republique tcheque', 'hongrie', 'roumanie',
+            'bulgarie', 'croatie', 'slovenie', 'slovaquie', 'luxembourg', 'malte',
+            'chypre', 'finlande', 'irlande', 'lettonie', 'lituanie', 'estonie'
+        ],
+        'continent': 'Europe'
+    },
+    'asie_du_sud_est': {
+        'countries': [
+            'vietnam', 'thaïlande', 'cambodge', 'laos', 'malaisie', 'singapour',
+            'indonésie', 'philippines', 'birmanie', 'brunei'
+        ],
+        'continent': 'Asie'
+    },
+    'asie_du_sud': {
+        'countries': ['inde', 'pakistan', 'bangladesh', 'nepal', 'sri_lanka', 'afghanistan'],
+        'continent': 'Asie'
+    },
+    'asie_centrale': {
+        'countries': ['kazakhstan', 'ouzbekistan', 'turkmenistan', 'tadjikistan', 'kirghizstan'],
+        'continent': 'Asie'
+    },
+    'asie_de_l_est': {
+        'countries': [
+            'japon', 'chine', 'corée_du_sud', 'corée_du_nord', 'mongolie',
+            'taiwan', 'hongkong', 'macao'
+        ],
+        'continent': 'Asie'
+    },
+    'moyen_orient': {
+        'countries': [
+            'arabie_saoudite', 'iran', 'irak', 'israel', 'palestine', 'liban',
+            'syrie', 'jordanie', 'yemen', 'oman', 'emirats_arabes_unis',
+            'qatar', 'bahrein', 'koweït', 'turquie'
+        ],
+        'continent': 'Asie'
+    },
+    'afrique_du_nord': {
+        'countries': ['maroc', 'algerie', 'tunisie', 'libye', 'égypte', 'soudan'],
+        'continent': 'Afrique'
+    },
+    'afrique_subsaharienne': {
+        'countries': [
+            'afrique_du_sud', 'kenya', 'nigeria', 'ghana', 'senegal', 'ethiopie',
+            'cameroun', 'congo', 'tanzanie', 'uganda', 'malawi', 'zambie',
+            'zimbabwe', 'mozambique', 'botswana', 'namibie', 'mauritius'
+        ],
+        'continent': 'Afrique'
+    },
+    'amerique_du_nord': {
+        'countries': ['usa', 'états-unis', 'canada', 'mexique'],
+        'continent': 'Amérique du Nord'
+    },
+    'amerique_centrale': {
+        'countries': [
+            'guatemala', 'honduras', 'salvador', 'nicaragua', 'costa_rica',
+            'panama', 'belize'
+        ],
+        'continent': 'Amérique Centrale'
+    },
+    'amerique_du_sud': {
+        'countries': [
+            'colombie', 'venezuela', 'guyana', 'surinam', 'brésil', 'pérou',
+            'bolivie', 'chili', 'argentine', 'uruguay', 'paraguay', 'équateur'
+        ],
+        'continent': 'Amérique du Sud'
+    },
+    'oceanie': {
+        'countries': [
+            'australie', 'nouvelle-zélande', 'fidji', 'samoa', 'vanuatu',
+            'tonga', 'kiribati', 'marshall'
+        ],
+        'continent': 'Océanie'
+    }
+}
+
+FIELD_CATEGORIES = {
+    'informatique': [
+        'computer science', 'cs', 'software', 'programmation', 'coding',
+        'développement', 'data science', 'ia', 'machine learning', 'ai',
+        'cybersécurité', 'network', 'web development', 'développement web'
+    ],
+    'ingénierie': [
+        'engineering', 'génie', 'civil', 'mécanique', 'électrique',
+        'électronique', 'aéronautique', 'chimie', 'matériaux', 'géotechnique'
+    ],
+    'santé': [
+        'médecine', 'medicine', 'nursing', 'infirmerie', 'pharmacie',
+        'pharmacy', 'dentaire', 'dentistry', 'psychologie', 'psychology',
+        'santé publique', 'public health'
+    ],
+    'sciences': [
+        'physique', 'physics', 'chimie', 'biologie', 'biology', 'mathématiques',
+        'mathematics', 'géologie', 'astronomie', 'environnement'
+    ],
+    'commerce': [
+        'business', 'économie', 'economics', 'finance', 'accounting',
+        'comptabilité', 'management', 'marketing', 'mba', 'gestion'
+    ],
+    'droit': [
+        'law', 'droit', 'jurisprudence', 'légal', 'international_law',
+        'droit_international', 'constitutionnel'
+    ],
+    'arts': [
+        'art', 'design', 'musique', 'music', 'théâtre', 'dance', 'film',
+        'cinéma', 'photographie', 'architecture', 'beaux-arts'
+    ],
+    'humaines': [
+        'philosophie', 'histoire', 'littérature', 'langue', 'linguistics',
+        'sociologie', 'anthropologie', 'géographie', 'sciences_humaines'
+    ],
+    'éducation': [
+        'education', 'enseignement', 'pédagogie', 'formation', 'training'
+    ]
+}
+
+LANGUAGE_VARIANTS = {
+    'français': ['fr', 'french', 'fra'],
+    'anglais': ['en', 'english', 'eng'],
+    'espagnol': ['es', 'spanish', 'esp'],
+    'allemand': ['de', 'german', 'deu'],
+    'chinois': ['zh', 'chinese', 'zho', 'mandarin'],
+    'japonais': ['ja', 'japanese', 'jpn'],
+    'arabe': ['ar', 'arabic', 'ara'],
+    'russe': ['ru', 'russian', 'rus'],
+    'portugais': ['pt', 'portuguese', 'por']
+}
+
+LEVEL_HIERARCHY = {
+    'licence': 0, 'bachelor': 0, 'undergrad': 0, 'bac+3': 0,
+    'master': 1, 'maitrise': 1, 'msc': 1, 'ma': 1, 'bac+5': 1,
+    'doctorat': 2, 'phd': 2, 'doctorate': 2, 'bac+8': 2,
+    'post-doctorat': 3, 'postdoc': 3, 'post-doc': 3
+}
+
+# Poids V2 optimisés
+WEIGHTS_V2 = {
+    'country_match': 0.28,
+    'field_match': 0.22,
+    'level_match': 0.18,
+    'type_match': 0.10,
+    'origin_bonus': 0.08,
+    'language_match': 0.08,
+    'gpa_match': 0.06,
+}
+
+SCHOLARSHIP_SELECTIVITY = {
+    'très_sélective': {'gpa_min': 3.7, 'multiplier': 1.0},
+    'sélective': {'gpa_min': 3.3, 'multiplier': 0.85},
+    'modérée': {'gpa_min': 3.0, 'multiplier': 0.7},
+    'accessible': {'gpa_min': 2.5, 'multiplier': 0.5}
+}
+
+# Mots-clés d'ouverture (pays cibles / domaines / niveaux)
+OPEN_WORLD_KEYWORDS = ['monde', 'all', 'international', 'partout']
+EXTENDED_OPEN_WORLD_KEYWORDS = ['monde', 'all', 'international', 'anywhere', 'partout']  # moteur SQLite
+OPEN_ORIGIN_KEYWORDS = ['monde', 'all']
+OPEN_FIELD_KEYWORDS = ['tous', 'all', 'any', 'toutes']
+OPEN_LEVEL_KEYWORDS = ['tous', 'all']
+INTERNATIONAL_KEYWORDS = ['international', 'multilingual', 'multiple languages']
+
+# Mots-clés de sélectivité (titre + domaine), par ordre de priorité
+SELECTIVITY_KEYWORDS = (
+    ('très_sélective', ('excellence', 'prestigious', 'prestig', 'top')),
+    ('sélective', ('advanced', 'competitive', 'master', 'phd')),
+    ('accessible', ('accessible', 'open', 'ouvert', 'besoin'))
+)
+DEFAULT_SELECTIVITY = 'modérée'
+
+# Préférence de type -> variantes acceptées
+TYPE_MAPPING = {
+    'complète': ['full', 'complet', 'intégrale'],
+    'partielle': ['partial', 'partiell'],
+    'mérite': ['merit', 'excellence', 'académique'],
+    'besoin': ['need', 'besoin', 'financier', 'ressources']
+}
+
+# Vocabulaire de langues détecté dans titre + description
+LANGUAGE_TOKENS = tuple(dict.fromkeys(
+    token
+    for lang, variants in LANGUAGE_VARIANTS.items()
+    for token in [lang, *variants]
+))
+
+# ==========================================
+# DÉTECTION DE MOTS-CLÉS (AHO-CORASICK)
+# ==========================================
+
+class KeywordMatcher:
+    """
+    Automate d'Aho-Corasick: un seul passage sur le texte renvoie tous les
+    motifs présents (mêmes résultats que `motif in texte` pour chaque motif)
+    """
+    
+    def __init__(self, patterns: Iterable[str]):
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        outputs: List[Set[str]] = [set()]
+        self.patterns: FrozenSet[str] = frozenset(p for p in patterns if p)
+        
+        # 1. Trie des motifs
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                following = self._transitions[state].get(char)
+                if following is None:
+                    following = len(self._transitions)
+                    self._transitions[state][char] = following
+                    self._transitions.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = following
+            outputs[state].add(pattern)
+        
+        # 2. Liens d'échec (parcours en largeur), sorties héritées du suffixe
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._transitions[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._transitions[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._transitions[fallback].get(char, 0)
+                outputs[following] |= outputs[self._fail[following]]
+                queue.append(following)
+        
+        self._outputs: List[FrozenSet[str]] = [frozenset(out) for out in outputs]
+    
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Motifs présents dans le texte"""
+        transitions, fail, outputs = self._transitions, self._fail, self._outputs
+        hits: Set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                hits |= outputs[state]
+        return frozenset(hits)
+
+REGION_KEYWORDS = {name: frozenset(data['countries']) for name, data in REGIONS.items()}
+FIELD_KEYWORDS = {category: frozenset(synonyms) for category, synonyms in FIELD_CATEGORIES.items()}
+
+# Automate unique: pays des régions, synonymes de domaines, langues, ouverture, sélectivité
+KEYWORD_MATCHER = KeywordMatcher(dict.fromkeys([
+    *(country for countries in REGION_KEYWORDS.values() for country in countries),
+    *(syn for synonyms in FIELD_KEYWORDS.values() for syn in synonyms),
+    *LANGUAGE_TOKENS,
+    *EXTENDED_OPEN_WORLD_KEYWORDS, *OPEN_ORIGIN_KEYWORDS, *OPEN_FIELD_KEYWORDS, *OPEN_LEVEL_KEYWORDS,
+    *INTERNATIONAL_KEYWORDS,
+    *(kw for _, keywords in SELECTIVITY_KEYWORDS for kw in keywords)
+]))
+
+def regions_in(hits: FrozenSet[str]) -> List[str]:
+    """Régions (ordre de REGIONS) dont au moins un pays figure dans les motifs trouvés"""
+    return [name for name, countries in REGION_KEYWORDS.items() if not countries.isdisjoint(hits)]
+
+def field_categories_in(hits: FrozenSet[str]) -> List[str]:
+    """Catégories (ordre de FIELD_CATEGORIES) dont au moins un synonyme figure dans les motifs trouvés"""
+    return [category for category, synonyms in FIELD_KEYWORDS.items() if not synonyms.isdisjoint(hits)]
+
+# Sous-chaînes de noms de langues hors LANGUAGE_TOKENS ('ang', 'a'...) : une telle
+# langue saisie est reconnue (get_language_tokens) et cherchée telle quelle dans le texte
+LANGUAGE_PROBE_BITS = {
+    probe: 1 << i for i, probe in enumerate(sorted(
+        {lang[start:end] for lang in LANGUAGE_VARIANTS
+         for start in range(len(lang)) for end in range(start + 1, len(lang) + 1)} - set(LANGUAGE_TOKENS)
+    ))
+}
+
+def _probe_prefixes() -> List[Tuple[str, int, Tuple[int, ...]]]:
+    """(nom, début, bits cumulés des sous-chaînes nom[début:début + n] pour n = 0..)"""
+    prefixes = []
+    for lang in LANGUAGE_VARIANTS:
+        for start in range(len(lang)):
+            masks = [0]
+            for end in range(start + 1, len(lang) + 1):
+                masks.append(masks[-1] | LANGUAGE_PROBE_BITS.get(lang[start:end], 0))
+            prefixes.append((lang, start, tuple(masks)))
+    return prefixes
+
+_PROBE_PREFIXES = _probe_prefixes()
+
+def language_probe_mask(text: str) -> int:
+    """Bits (LANGUAGE_PROBE_BITS) des sous-chaînes de noms de langues présentes dans le texte"""
+    mask = 0
+    for lang, start, masks in _PROBE_PREFIXES:
+        end = start
+        # Une sous-chaîne absente : ses prolongements le sont aussi
+        while end < len(lang) and lang[start:end + 1] in text:
+            end += 1
+        mask |= masks[end - start]
+    return mask
+
+# ==========================================
+# CARACTÉRISTIQUES PRÉ-CALCULÉES
+# ==========================================
+
+@dataclass(frozen=True, slots=True)
+class ScholarshipFeatures:
+    """
+    Caractéristiques normalisées d'une bourse, calculées une seule fois
+    au chargement du catalogue. Les méthodes de scoring ne font plus que
+    des lectures sur ces champs (__slots__, chaînes internées).
+    """
+    id: str
+    country: str
+    targets: str
+    targets_list: Tuple[str, ...]
+    region: Optional[str]
+    continent: Optional[str]
+    target_regions: FrozenSet[str]
+    open_world: bool
+    open_origin: bool
+    country_in_targets: bool
+    field: str
+    field_category: Optional[str]
+    field_synonym_categories: FrozenSet[str]
+    field_words: FrozenSet[str]
+    open_field: bool
+    level: str
+    level_values: Tuple[int, ...]
+    open_level: bool
+    scholarship_type: str
+    languages: FrozenSet[str]
+    language_probes: int  # bits LANGUAGE_PROBE_BITS présents dans titre + description
+    international: bool
+    francophone: bool
+    anglophone: bool
+    selectivity: str
+    deadline_day: Optional[int]  # date limite en numéro de jour (date.toordinal())
+
+@dataclass(frozen=True)
+class ResolvedProfile:
+    """
+    Champs du profil normalisés et résolus (régions, catégorie, niveau,
+    langues) une seule fois par requête, puis lus par chaque critère
+    """
+    target_country: str
+    target_region: Optional[str]
+    target_continent: Optional[str]
+    origin_country: str
+    origin_region: Optional[str]
+    origin_continent: Optional[str]
+    field: str
+    field_category: Optional[str]
+    field_categories: FrozenSet[str]
+    field_words: FrozenSet[str]
+    level_value: Optional[int]
+    language: str
+    language_matched: bool
+    language_tokens: FrozenSet[str]
+    language_probe_bit: int  # langue reconnue hors LANGUAGE_TOKENS (LANGUAGE_PROBE_BITS), 0 sinon
+    scholarship_type: Optional[str]
+    gpa: Optional[float]
+
+# ==========================================
+# RÉSOLVEURS (MÉMOÏSÉS)
+# ==========================================
+
+@memoized_resolver
+def get_region(country: str) -> Optional[str]:
+    """Obtenir région d'un pays"""
+    regions = regions_in(KEYWORD_MATCHER.scan(country.lower().strip()))
+    return regions[0] if regions else None
+
+def continent_of(region: Optional[str]) -> Optional[str]:
+    """Continent d'une région (None si région inconnue)"""
+    return REGIONS.get(region, {}).get('continent') if region else None
+
+@memoized_resolver
+def get_field_category(field: str) -> Optional[str]:
+    """Obtenir catégorie d'un domaine"""
+    categories = field_categories_in(KEYWORD_MATCHER.scan(field.lower().strip()))
+    return categories[0] if categories else None
+
+@memoized_resolver
+def get_field_categories(field: str) -> FrozenSet[str]:
+    """Catégories dont un synonyme apparaît dans le domaine"""
+    return frozenset(field_categories_in(KEYWORD_MATCHER.scan(field.lower().strip())))
+
+@memoized_resolver
+def get_language_tokens(user_lang: str) -> Tuple[bool, FrozenSet[str]]:
+    """(langue reconnue, langue + variantes des langues correspondantes)"""
+    matched = False
+    tokens = {user_lang}
+    for lang, variants in LANGUAGE_VARIANTS.items():
+        if user_lang in lang or user_lang in variants:
+            matched = True
+            tokens.update(variants)
+    return matched, frozenset(tokens)
+
+@memoized_resolver
+def get_level_value(level: str) -> Optional[int]:
+    """Obtenir valeur hiérarchique"""
+    level = level.lower().strip()
+    for key, value in LEVEL_HIERARCHY.items():
+        if key in level or level in key:
+            return value
+    return None
+
+@memoized_resolver
+def get_level_values(level_str: str) -> Tuple[int, ...]:
+    """Obtenir valeurs possibles"""
+    level_str = level_str.lower().strip()
+    values = []
+    for key, value in LEVEL_HIERARCHY.items():
+        if key in level_str or level_str in key:
+            if value not in values:
+                values.append(value)
+    return tuple(sorted(values))
+
+def _identity(value: Any) -> Any:
+    return value
+
+def estimate_memory(*roots: Any, modules: Iterable[str] = ()) -> int:
+    """
+    Taille mémoire approximative (octets) d'objets et de leur contenu
+    (conteneurs, tableaux NumPy, objets de ce module et des modules listés) ;
+    un objet partagé (chaîne internée, frozenset commun) n'est compté qu'une fois.
+    """
+    modules = {__name__, *modules}
+    seen: Set[int] = set()
+    stack = list(roots)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif type(obj).__module__ in modules and not isinstance(obj, type):
+            for slot in getattr(type(obj), '__slots__', ()):
+                stack.append(getattr(obj, slot, None))
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+    return total
+
+# ==========================================
+# NOYAU DE SCORING
+# ==========================================
+
+class ScoringCore:
+    """
+    Règles de scoring V2, indépendantes de la source du catalogue : une ligne
+    (dict aux colonnes de la table scholarship) est normalisée une fois en
+    ScholarshipFeatures, un profil en ResolvedProfile, puis chaque critère
+    ne fait plus que des lectures sur ces champs.
+    """
+    
+    LEVEL_MISMATCH_SCORE = 0.20  # niveau hors fourchette et non ouvert
+    
+    def __init__(self, open_world_keywords: Sequence[str] = OPEN_WORLD_KEYWORDS):
+        """
+        Args:
+            open_world_keywords: Mots-clés de pays cibles "monde ouvert"
+                (EXTENDED_OPEN_WORLD_KEYWORDS pour le moteur SQLite)
+        """
+        missing = set(open_world_keywords) - KEYWORD_MATCHER.patterns
+        if missing:
+            raise ValueError(f"Mots-clés absents de KEYWORD_MATCHER: {sorted(missing)}")
+        self.open_world_keywords = tuple(open_world_keywords)
+    
+    # ===== CARACTÉRISTIQUES DES BOURSES =====
+    
+    def build_features(self, scholarship: Mapping[str, Any], share: Callable[[Any], Any] = _identity,
+                       tags: Optional[Tuple[FrozenSet[str], bool, str]] = None) -> ScholarshipFeatures:
+        """
+        Normaliser une bourse une seule fois (pays, régions, domaine, niveaux, langues, deadline)
+        
+        Args:
+            scholarship: Ligne du catalogue (colonnes de la table scholarship)
+            share: Instance partagée d'une valeur immuable déjà vue (tuple, frozenset)
+            tags: (langues, international, sélectivité) déjà calculés par la source
+                (table scholarship_tags) : titre et description ne sont relus que pour
+                les sous-chaînes de noms de langues (language_probe_mask)
+        """
+        # Chaînes internées : valeurs répétées partagées entre bourses
+        country = sys.intern(str(scholarship.get('pays', '')).lower().strip())
+        targets = sys.intern(str(scholarship.get('pays_cibles', '')).lower().strip())
+        field_name = sys.intern(str(scholarship.get('domaine_etude', '')).lower().strip())
+        level = sys.intern(str(scholarship.get('niveau_etude', '')).lower().strip())
+        
+        # Un passage de l'automate par champ
+        target_hits = KEYWORD_MATCHER.scan(targets)
+        field_hits = KEYWORD_MATCHER.scan(field_name)
+        level_hits = KEYWORD_MATCHER.scan(level)
+        field_categories = field_categories_in(field_hits)
+        region = get_region(country)
+        
+        text = (str(scholarship.get('titre', '')) + " " +
+                str(scholarship.get('description', ''))).lower()
+        if tags is None:
+            text_hits = KEYWORD_MATCHER.scan(text)
+            languages = share(frozenset(t for t in LANGUAGE_TOKENS if t in text_hits))
+            international = not text_hits.isdisjoint(INTERNATIONAL_KEYWORDS)
+            selectivity = self.estimate_selectivity(scholarship)
+        else:
+            languages, international, selectivity = tags
+        
+        return ScholarshipFeatures(
+            id=str(scholarship.get('id', '')),
+            country=country,
+            targets=targets,
+            targets_list=share(tuple(sys.intern(c.strip()) for c in targets.replace(';', ',').split(','))),
+            region=region,
+            continent=continent_of(region),
+            target_regions=share(frozenset(regions_in(target_hits))),
+            open_world=not target_hits.isdisjoint(self.open_world_keywords),
+            open_origin=not target_hits.isdisjoint(OPEN_ORIGIN_KEYWORDS),
+            country_in_targets=country in targets,
+            field=field_name,
+            field_category=field_categories[0] if field_categories else None,
+            field_synonym_categories=share(frozenset(field_categories)),
+            field_words=share(frozenset(field_name.split())),
+            open_field=not field_hits.isdisjoint(OPEN_FIELD_KEYWORDS),
+            level=level,
+            level_values=get_level_values(level),
+            open_level=not level_hits.isdisjoint(OPEN_LEVEL_KEYWORDS),
+            scholarship_type=sys.intern(str(scholarship.get('type_bourse', '')).lower().strip()),
+            languages=languages,
+            language_probes=share(language_probe_mask(text)),
+            international=international,
+            francophone='france' in country,
+            anglophone='usa' in country or 'uk' in country,
+            selectivity=selectivity,
+            deadline_day=self.parse_deadline(scholarship.get('date_limite'))
+        )
+    
+    @staticmethod
+    def estimate_selectivity(scholarship: Mapping[str, Any]) -> str:
+        """Estimer la sélectivité d'une bourse (titre + domaine)"""
+        scholarship_text = (str(scholarship.get('titre', '')) + " " +
+                          str(scholarship.get('domaine_etude', ''))).lower()
+        hits = KEYWORD_MATCHER.scan(scholarship_text)
+        
+        for selectivity, keywords in SELECTIVITY_KEYWORDS:
+            if not hits.isdisjoint(keywords):
+                return selectivity
+        return DEFAULT_SELECTIVITY
+    
+    @staticmethod
+    def parse_deadline(deadline_str: Any) -> Optional[int]:
+        """Parser la date limite en numéro de jour (None si absente ou invalide)"""
+        if not deadline_str:
+            return None
+        try:
+            return datetime.strptime(str(deadline_str), '%Y-%m-%d').toordinal()
+        except ValueError:
+            return None
+    
+    # ===== PROFIL RÉSOLU =====
+    
+    def resolve_profile(self, target_country: str, origin_country: str, field_of_study: str,
+                        education_level: str, preferred_language: str,
+                        scholarship_type: Optional[str] = None, gpa: Optional[float] = None) -> ResolvedProfile:
+        """Normaliser et résoudre les champs du profil (une fois par requête)"""
+        target_country = target_country.lower().strip()
+        origin_country = origin_country.lower().strip()
+        field_name = field_of_study.lower().strip()
+        language = preferred_language.lower().strip()
+        target_region = get_region(target_country)
+        origin_region = get_region(origin_country)
+        language_matched, language_tokens = get_language_tokens(language)
+        
+        return ResolvedProfile(
+            target_country=target_country,
+            target_region=target_region,
+            target_continent=continent_of(target_region),
+            origin_country=origin_country,
+            origin_region=origin_region,
+            origin_continent=continent_of(origin_region),
+            field=field_name,
+            field_category=get_field_category(field_name),
+            field_categories=get_field_categories(field_name),
+            field_words=frozenset(field_name.split()),
+            level_value=get_level_value(education_level),
+            language=language,
+            language_matched=language_matched,
+            language_tokens=language_tokens,
+            language_probe_bit=LANGUAGE_PROBE_BITS.get(language, 0) if language_matched else 0,
+            scholarship_type=scholarship_type.lower().strip() if scholarship_type else None,
+            gpa=gpa
+        )
+    
+    # ===== SCORE GLOBAL =====
+    
+    def score(self, profile: ResolvedProfile, features: ScholarshipFeatures, today: int) -> Dict[str, Any]:
+        """
+        Calculer score global V2 avec pondérations:
+        28% Pays | 22% Domaine | 18% Niveau | 10% Type | 8% Origine | 8% Langue | 6% GPA
+        (sans les raisons, propres à chaque moteur)
+        """
+        # Calculer chaque composante
+        scores = {
+            'country': self.score_country(profile, features),
+            'field': self.score_field(profile, features),
+            'level': self.score_level(profile, features),
+            'type': self.score_type(profile, features),
+            'origin': self.score_origin(profile, features),
+            'language': self.score_language(profile, features),
+            'gpa': self.score_gpa(profile, features)
+        }
+        
+        # Boost deadline
+        deadline_status, days_left, deadline_boost = self.analyze_deadline(features, today)
+        overall_score = max(0, min(1, self.weighted_score(scores) * (1 + deadline_boost)))
+        
+        return {
+            'overall_score': overall_score,
+            'scores': scores,
+            'deadline_status': deadline_status,
+            'days_until_deadline': days_left,
+            'deadline_boost': deadline_boost
+        }
+    
+    @staticmethod
+    def weighted_score(scores: Mapping[str, Any]) -> Any:
+        """Somme pondérée des critères (scalaires ou colonnes NumPy, même ordre d'opérations)"""
+        return (
+            scores['country'] * WEIGHTS_V2['country_match'] +
+            scores['field'] * WEIGHTS_V2['field_match'] +
+            scores['level'] * WEIGHTS_V2['level_match'] +
+            scores['type'] * WEIGHTS_V2['type_match'] +
+            scores['origin'] * WEIGHTS_V2['origin_bonus'] +
+            scores['language'] * WEIGHTS_V2['language_match'] +
+            scores['gpa'] * WEIGHTS_V2['gpa_match']
+        )
+    
+    # ===== CRITÈRES V2 =====
+    
+    def score_country(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score pays (28%) - V2 avancé"""
+        user_country = profile.target_country
+        
+        # Match exact
+        if user_country == features.country:
+            return 1.0
+        
+        # Match dans pays cibles
+        if any(user_country in target or target in user_country for target in features.targets_list):
+            return 0.95
+        
+        # Monde ouvert
+        if features.open_world:
+            return 0.70
+        
+        # Même région
+        user_region = profile.target_region
+        scholarship_region = features.region
+        
+        if user_region and scholarship_region == user_region:
+            return 0.60
+        
+        # Même continent
+        if user_region and scholarship_region:
+            if profile.target_continent == features.continent:
+                return 0.40
+        
+        # Cible régionale
+        if user_region in features.target_regions:
+            return 0.65
+        
+        return 0.10
+    
+    def score_field(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score domaine (22%) - V2 avancé"""
+        user_field = profile.field
+        scholarship_field = features.field
+        
+        # Match exact
+        if user_field == scholarship_field:
+            return 1.0
+        
+        # Substring match
+        if user_field in scholarship_field or scholarship_field in user_field:
+            return 0.92
+        
+        # Même catégorie
+        user_category = profile.field_category
+        
+        if user_category and features.field_category == user_category:
+            return 0.85
+        
+        # Synonymes
+        if not profile.field_categories.isdisjoint(features.field_synonym_categories):
+            return 0.78
+        
+        # Tous les domaines
+        if features.open_field:
+            return 0.60
+        
+        # Word similarity
+        user_words = profile.field_words
+        scholarship_words = features.field_words
+        if user_words & scholarship_words:
+            intersection = len(user_words & scholarship_words)
+            union = len(user_words | scholarship_words)
+            return 0.50 + (intersection / union if union > 0 else 0) * 0.30
+        
+        return 0.10
+    
+    def score_level(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score niveau (18%) - V2 hiérarchique"""
+        return self.level_match(profile.level_value, features.level_values, features.open_level)
+    
+    def score_level_label(self, user_level_value: Optional[int], level: str) -> float:
+        """Score niveau d'un libellé brut de niveau_etude (niveau du profil déjà résolu)"""
+        level = level.lower().strip()
+        return self.level_match(user_level_value, get_level_values(level),
+                                not KEYWORD_MATCHER.scan(level).isdisjoint(OPEN_LEVEL_KEYWORDS))
+    
+    @classmethod
+    def level_match(cls, user_level_value: Optional[int], scholarship_level_values: Tuple[int, ...],
+                    open_level: bool) -> float:
+        """Règles du critère niveau sur des valeurs hiérarchiques déjà résolues"""
+        if user_level_value is None or not scholarship_level_values:
+            return 0.50
+        
+        # Match exact
+        if user_level_value in scholarship_level_values:
+            return 1.0
+        
+        # Fourchette acceptable
+        min_level = scholarship_level_values[0]
+        max_level = scholarship_level_values[-1]
+        
+        if min_level <= user_level_value <= max_level:
+            return 0.95
+        
+        # Proche de fourchette
+        if user_level_value < min_level and (min_level - user_level_value) == 1:
+            return 0.80
+        
+        if user_level_value > max_level and (user_level_value - max_level) == 1:
+            return 0.60
+        
+        # Tous les niveaux
+        if open_level:
+            return 0.70
+        
+        return cls.LEVEL_MISMATCH_SCORE
+    
+    def score_type(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score type (10%)"""
+        if profile.scholarship_type is None:
+            return 0.65
+        
+        user_type = profile.scholarship_type
+        scholarship_type = features.scholarship_type
+        
+        # Match exact
+        if user_type in scholarship_type or scholarship_type in user_type:
+            return 1.0
+        
+        # Mapping
+        for pref_type, variations in TYPE_MAPPING.items():
+            if user_type in pref_type or pref_type in user_type:
+                if any(v in scholarship_type for v in variations):
+                    return 0.85
+        
+        if 'complet' in scholarship_type and user_type in ['complète', 'full']:
+            return 0.90
+        
+        return 0.50
+    
+    def score_origin(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score origine (8%)"""
+        user_origin = profile.origin_country
+        
+        # Match exact
+        if user_origin in features.targets or \
+           (user_origin in features.country and features.country_in_targets):
+            return 1.0
+        
+        # Même région
+        user_region = profile.origin_region
+        scholarship_region = features.region
+        
+        if user_region and scholarship_region == user_region:
+            if user_region in features.target_regions:
+                return 0.80
+        
+        # Même continent
+        if user_region and scholarship_region:
+            user_continent = profile.origin_continent
+            
+            if user_continent and user_continent == features.continent:
+                return 0.50
+        
+        # Monde ouvert
+        if features.open_origin:
+            return 0.40
+        
+        return 0.0
+    
+    def score_language(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score langue (8%)"""
+        user_lang = profile.language
+        
+        # Check language variants (détectées au chargement), langue saisie présente dans le texte
+        if profile.language_matched:
+            if not user_lang or profile.language_probe_bit & features.language_probes or \
+               not profile.language_tokens.isdisjoint(features.languages):
+                return 1.0
+        
+        # Default pour pays
+        if features.francophone:
+            if user_lang == 'fr' or user_lang == 'français':
+                return 0.90
+        if features.anglophone:
+            if user_lang == 'en' or user_lang == 'anglais':
+                return 0.90
+        
+        # International
+        if features.international:
+            return 0.70
+        
+        # Default EN
+        if user_lang == 'en' or user_lang == 'english':
+            return 0.60
+        
+        return 0.40
+    
+    def score_gpa(self, profile: ResolvedProfile, features: ScholarshipFeatures) -> float:
+        """Score GPA (6%)"""
+        gpa = profile.gpa
+        if not gpa:
+            return 0.65
+        
+        # Sélectivité estimée au chargement
+        gpa_req = SCHOLARSHIP_SELECTIVITY[features.selectivity]
+        gpa_min = gpa_req['gpa_min']
+        
+        if gpa >= gpa_min + 0.5:
+            return 1.0
+        elif gpa >= gpa_min:
+            return 0.85
+        elif gpa >= gpa_min - 0.3:
+            return 0.65
+        elif gpa >= gpa_min - 0.5:
+            return 0.45
+        else:
+            return 0.20
+    
+    # ===== DEADLINE =====
+    
+    @staticmethod
+    def today() -> int:
+        """Jour courant (numéro de jour), lu une seule fois par requête"""
+        return date.today().toordinal()
+    
+    @staticmethod
+    def days_left(deadline_day: Any, today: int) -> Any:
+        """
+        Jours pleins avant minuit du jour limite, soit (deadline - now).days :
+        la veille de la date limite compte 0 jour. Scalaire ou colonne NumPy.
+        """
+        return deadline_day - today - 1
+    
+    def analyze_deadline(self, features: ScholarshipFeatures, today: int) -> Tuple[str, Optional[int], float]:
+        """Analyser deadline avec boost (jour de référence de la requête)"""
+        if features.deadline_day is None:
+            return 'inconnu', None, 0.0
+        
+        days_left = self.days_left(features.deadline_day, today)
+        
+        if days_left < 0:
+            return 'fermé', 0, -0.50
+        elif days_left <= 7:
+            return 'urgent', days_left, 0.10
+        elif days_left <= 30:
+            return 'proche', days_left, 0.05
+        else:
+            return 'ouvert', days_left, 0.0
+
+# ==========================================
+# DIVERSIFICATION (PAYS / DOMAINE)
+# ==========================================
+
+def country_key(country: Any) -> str:
+    """Clé pays utilisée pour la diversification"""
+    return str(country or '').lower()
+
+def field_key(field_name: Any) -> str:
+    """Clé domaine utilisée pour la diversification"""
+    return str(field_name or '').lower().strip()
+
+def diversify_ranked(items: Sequence[Any], top_n: int, catalog_countries: int,
+                     keys: Callable[[Any], Tuple[str, str]], max_per_country: Optional[int] = None,
+                     max_per_field: Optional[int] = None) -> Tuple[List[Any], bool]:
+    """
+    Diversifier par pays et domaine (temps linéaire sur la liste pré-classée)
+    - Passe 1: meilleur de chaque pays
+    - Passe 2: compléter dans la limite de max_per_country / max_per_field
+    - Passe 3: compléter sans plafond si les plafonds bloquent
+    
+    Args:
+        keys: Accesseur (clé pays, clé domaine) d'un élément, cf. country_key / field_key
+    
+    Returns:
+        - Éléments retenus (max top_n)
+        - True si le résultat ne peut plus changer avec des candidats
+          moins bien classés que ceux fournis
+    """
+    diverse = []
+    chosen: Set[int] = set()
+    per_country: Dict[str, int] = defaultdict(int)
+    per_field: Dict[str, int] = defaultdict(int)
+    item_keys = [keys(item) for item in items]
+    
+    def under_field_cap(field_name: str) -> bool:
+        return max_per_field is None or per_field[field_name] < max_per_field
+    
+    def under_country_cap(country: str) -> bool:
+        return max_per_country is None or per_country[country] < max_per_country
+    
+    def take(i: int):
+        country, field_name = item_keys[i]
+        diverse.append(items[i])
+        chosen.add(i)
+        per_country[country] += 1
+        per_field[field_name] += 1
+    
+    # Passe 1: Meilleur de chaque pays
+    for i, (country, field_name) in enumerate(item_keys):
+        if len(diverse) >= top_n:
+            return diverse, True
+        if per_country[country] == 0 and under_field_cap(field_name):
+            take(i)
+    if len(diverse) >= top_n:
+        return diverse, True
+    
+    # Tous les pays du catalogue déjà représentés : la passe 1 est définitive
+    settled = len(per_country) >= catalog_countries
+    
+    # Passe 2: Compléter (plafonds par pays / domaine)
+    for i, (country, field_name) in enumerate(item_keys):
+        if len(diverse) >= top_n:
+            return diverse, settled
+        if i not in chosen and under_country_cap(country) and under_field_cap(field_name):
+            take(i)
+    if len(diverse) >= top_n:
+        return diverse, settled
+    
+    # Passe 3: Compléter sans plafond
+    for i in range(len(items)):
+        if len(diverse) >= top_n:
+            break
+        if i not in chosen:
+            take(i)
+    
+    return diverse, False
+
+def select_diversified(rank: Callable[[int], Sequence[Any]], total: int, top_n: int,
+                       catalog_countries: int, pool_size: int, keys: Callable[[Any], Tuple[str, str]],
+                       max_per_country: Optional[int] = None,
+                       max_per_field: Optional[int] = None) -> List[Any]:
+    """
+    Diversifier sur les pool_size meilleurs candidats seulement (rank(k) = k
+    meilleurs, triés). Élargit le pool (x4) tant que le résultat de la
+    diversification pourrait encore dépendre des candidats suivants.
+    """
+    while True:
+        diverse, settled = diversify_ranked(
+            rank(pool_size), top_n, catalog_countries, keys, max_per_country, max_per_field
+        )
+        if settled or pool_size >= total:
+            return diverse
+        
+        logger.info(f"🔁 Pool de {pool_size} candidats insuffisant pour la diversification, élargissement")
+        pool_size *= 4
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 FIXTURES PARTAGÉES - MOTEURS SQLITE ET SUPABASE
+Petit catalogue fixe (deadlines lointaines : pas de boost) et profil de
+référence, servis aux deux moteurs pour comparer leurs scores au noyau.
+"""
+
+import random
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resolver_cache import clear_resolver_caches
+from scoring_core import FIELD_CATEGORIES, REGIONS
+
+SCHOLARSHIP_COLUMNS = (
+    'id', 'titre', 'description', 'pays', 'pays_cibles', 'domaine_etude', 'niveau_etude',
+    'type_bourse', 'date_limite', 'montant', 'devise', 'lien_candidature'
+)
+
+SCHOLARSHIPS = [
+    dict(id=1, titre='Bourse Excellence Master', description='Programme taught in English', pays='France',
+         pays_cibles='Afrique', domaine_etude='Informatique', niveau_etude='Master', type_bourse='Complète',
+         date_limite='2099-06-30', montant='5000', devise='EUR', lien_candidature='https://example.org/1'),
+    dict(id=2, titre='Open grant', description='cours en anglais', pays='Canada', pays_cibles='monde',
+         domaine_etude='Data Science', niveau_etude='Master, Doctorat', type_bourse='Partielle',
+         date_limite='2099-01-15', montant='1000', devise='CAD', lien_candidature='https://example.org/2'),
+    # 'German language' : seule la sous-chaîne brute 'ang' correspond à la langue 'ang'
+    dict(id=3, titre='Competitive PhD', description='German language', pays='Allemagne',
+         pays_cibles='international', domaine_etude='Ingénierie', niveau_etude='Doctorat', type_bourse='Mérite',
+         date_limite='', montant='', devise='EUR', lien_candidature='https://example.org/3'),
+    dict(id=4, titre='Programme licence', description='cours en français', pays='Maroc',
+         pays_cibles='senegal, maroc', domaine_etude='Business', niveau_etude='Licence', type_bourse='Besoin',
+         date_limite='2099-12-01', montant='', devise='MAD', lien_candidature='https://example.org/4'),
+    dict(id=5, titre='Top scholarship', description='multilingual', pays='Japon', pays_cibles='',
+         domaine_etude='Tous domaines', niveau_etude='Tous niveaux', type_bourse='full',
+         date_limite='2099-03-01', montant='', devise='JPY', lien_candidature='https://example.org/5'),
+]
+
+PROFILE = dict(
+    full_name='Awa Diop', origin_country='Sénégal', target_country='France', field_of_study='Informatique',
+    education_level='Master', gpa=3.5, preferred_language='ang', scholarship_type='Complète'
+)
+
+# Scores attendus (arrondis à 3 décimales comme dans les réponses des moteurs), par ordre de classement
+EXPECTED_RANKING = [(1, 0.899), (5, 0.668), (2, 0.62), (3, 0.543), (4, 0.348)]
+
+TODAY = date(2030, 1, 1).toordinal()
+
+# Valeurs des catalogues aléatoires (tests différentiels) : pays et domaines connus des
+# tables de référence, valeurs inconnues, vides et listes de pays cibles
+COUNTRIES = sorted({country for region in REGIONS.values() for country in region['countries']})
+FIELDS = sorted({name for synonyms in FIELD_CATEGORIES.values() for name in synonyms}) + [
+    'Informatique', 'Tous domaines', 'histoire', 'musique', 'architecture', ''
+]
+TARGETS = ['', 'monde', 'international', 'Afrique', 'maroc, senegal', 'kenya; nigeria', 'partout', 'europe']
+LEVELS = ['Master', 'Licence', 'Doctorat', 'Master, Doctorat', 'Bachelor', 'PhD', 'Tous niveaux', 'bac+5', '']
+TYPES = ['Complète', 'Partielle', 'Mérite', 'Besoin', 'full', 'merit scholarship', '']
+TITLES = ['Bourse Excellence', 'Top scholarship', 'Advanced research', 'Open grant', 'Competitive PhD', 'Programme']
+DESCRIPTIONS = ['taught in english', 'cours en français', 'spanish program', 'German language',
+                'international students', 'multilingual', 'chinese mandarin', 'arabic and french', '']
+LANGUAGES = ['fr', 'en', 'français', 'anglais', 'english', 'es', 'de', 'zh', 'ar', '', 'ang', 'a', 'fran', 'xx']
+
+def random_catalog(size: int, seed: int) -> list:
+    """Catalogue aléatoire reproductible (deadlines autour de TODAY : boosts inclus)"""
+    rng = random.Random(seed)
+    today = date.fromordinal(TODAY)
+    rows = []
+    for i in range(1, size + 1):
+        deadline = rng.choice(['', 'bad', (today + timedelta(days=rng.randint(-30, 365))).isoformat(),
+                               (today + timedelta(days=rng.randint(-2, 10))).isoformat()])
+        rows.append(dict(
+            id=i, titre=f"{rng.choice(TITLES)} {i}", description=rng.choice(DESCRIPTIONS),
+            pays=rng.choice(COUNTRIES).title(), pays_cibles=rng.choice(TARGETS + COUNTRIES),
+            domaine_etude=rng.choice(FIELDS), niveau_etude=rng.choice(LEVELS), type_bourse=rng.choice(TYPES),
+            date_limite=deadline, montant=rng.choice(['', '1000', '5000']), devise='EUR',
+            lien_candidature=f"https://example.org/{i}"
+        ))
+    return rows
+
+def random_profiles(count: int, seed: int) -> list:
+    """Profils aléatoires reproductibles (champs de UserProfileRequest)"""
+    rng = random.Random(seed)
+    return [
+        dict(full_name=f"Profil {i}", origin_country=rng.choice(COUNTRIES + ['Ghana', '']),
+             target_country=rng.choice(COUNTRIES + ['Europe', '']), field_of_study=rng.choice(FIELDS),
+             education_level=rng.choice(['Licence', 'Master', 'Doctorat', 'Post-doctorat']),
+             gpa=rng.choice([None, 2.0, 2.8, 3.3, 3.8, 4.0]), preferred_language=rng.choice(LANGUAGES),
+             scholarship_type=rng.choice([None, 'Complète', 'Partielle', 'Mérite', 'Besoin']))
+        for i in range(count)
+    ]
+
+def create_scholarship_db(db_file: str, rows: list) -> str:
+    """Base SQLite contenant la table scholarship (colonnes SCHOLARSHIP_COLUMNS)"""
+    conn = sqlite3.connect(db_file)
+    try:
+        conn.execute(f"CREATE TABLE scholarship (id INTEGER PRIMARY KEY, "
+                     f"{', '.join(f'{column} TEXT' for column in SCHOLARSHIP_COLUMNS[1:])})")
+        conn.executemany(
+            f"INSERT INTO scholarship VALUES ({', '.join('?' for _ in SCHOLARSHIP_COLUMNS)})",
+            [[row[column] for column in SCHOLARSHIP_COLUMNS] for row in rows]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return db_file
+
+@pytest.fixture(autouse=True)
+def fresh_resolver_caches():
+    """Caches des résolveurs vides au début de chaque test"""
+    clear_resolver_caches()
+    yield
+    clear_resolver_caches()
+
+@pytest.fixture
+def scholarship_db(tmp_path) -> str:
+    """Base SQLite contenant la table scholarship du catalogue de test"""
+    return create_scholarship_db(str(tmp_path / 'scholarships.db'), SCHOLARSHIPS)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 ROUTES FASTAPI - SATURATION DU SCORING (429) ET BATCH NDJSON
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider
+from conftest import random_catalog, random_profiles
+
+api = pytest.importorskip('api_recommendations_final')
+testclient = pytest.importorskip('fastapi.testclient')
+
+def test_executor_rejects_beyond_capacity_and_releases_slots():
+    executor = api.ScoringExecutor(max_workers=1, max_queue=1, retry_after_seconds=3)
+    release = threading.Event()
+    
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(time.sleep, 0))
+        await asyncio.sleep(0.05)
+        assert executor.stats()['inFlight'] == 2 and executor.stats()['queued'] == 1
+        
+        with pytest.raises(api.ScoringOverloaded) as overloaded:
+            await executor.run(time.sleep, 0)
+        assert overloaded.value.retry_after_seconds == 3
+        
+        # Tâche en attente annulée : place libérée aussitôt
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        assert executor.stats()['inFlight'] == 1
+        
+        # Tâche en cours annulée (client déconnecté) : comptée jusqu'à la fin de son exécution
+        running.cancel()
+        await asyncio.sleep(0.05)
+        assert executor.stats()['inFlight'] == 1
+        release.set()
+        for _ in range(100):
+            if executor.stats()['inFlight'] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.stats()['inFlight'] == 0
+        assert await executor.run(lambda x: x * 2, 21) == 42
+    
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
+    assert executor.stats()['rejected'] == 1
+
+class SaturatedExecutor:
+    """Pool de scoring plein : toute tâche est refusée"""
+    
+    async def run(self, func, *args):
+        raise api.ScoringOverloaded(7)
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(random_catalog(150, seed=5)))
+    monkeypatch.setattr(api, 'engine', engine)
+    monkeypatch.setattr(api, 'batch_pool', api.BatchProcessPool(0))
+    return testclient.TestClient(api.app)  # sans lifespan : pas de tâche de fond
+
+@pytest.mark.parametrize('url', ['/recommendations', '/recommendations/batch', '/recommendations/batch?stream=true'])
+def test_saturated_scoring_returns_429(client, monkeypatch, url):
+    monkeypatch.setattr(api, 'scoring_executor', SaturatedExecutor())
+    profile = random_profiles(1, seed=1)[0]
+    
+    response = client.post(url, json=profile if url == '/recommendations' else {'profiles': [profile]})
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '7'
+
+def test_streamed_batch_matches_batch_response(client, monkeypatch):
+    chunks = []
+    score_profiles = api._score_profiles
+    
+    def recording_score_profiles(profiles):
+        chunks.append(len(profiles))
+        return score_profiles(profiles)
+    
+    monkeypatch.setattr(api, '_score_profiles', recording_score_profiles)
+    profiles = random_profiles(75, seed=3)
+    
+    full = client.post('/recommendations/batch', json={'profiles': profiles}).json()
+    chunks.clear()
+    response = client.post('/recommendations/batch?stream=true', json={'profiles': profiles})
+    
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert chunks == [api.BATCH_STREAM_CHUNK, api.BATCH_STREAM_CHUNK, 75 - 2 * api.BATCH_STREAM_CHUNK]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    summary = lines.pop()
+    assert (summary['totalProcessed'], summary['totalFailed']) == (75, 0)
+    strip = lambda results: [(result['user'], result['recommendations']) for result in results]
+    assert strip(lines) == strip(full['results'])
+
+def test_streamed_empty_batch_sends_summary_only(client):
+    response = client.post('/recommendations/batch?stream=true', json={'profiles': []})
+    
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 1 and lines[0]['totalProcessed'] == 0
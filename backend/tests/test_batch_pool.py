@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 POOL DE PROCESSUS BATCH - MÊMES RÉSULTATS QUE recommend
+"""
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider
+from conftest import TODAY, random_catalog, random_profiles
+
+api = pytest.importorskip('api_recommendations_final')
+
+def test_process_pool_matches_recommend():
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(random_catalog(300, seed=3)))
+    profiles = [api.UserProfileRequest(**profile) for profile in random_profiles(40, seed=4)]
+    profiles.append(profiles[0])  # doublon : calculé une fois
+    
+    pool = api.BatchProcessPool(2)
+    try:
+        outcomes = pool.recommend_many(engine, profiles, TODAY)
+    finally:
+        pool.shutdown()
+    
+    engine._result_cache.clear()
+    expected = [engine.recommend(profile, TODAY) for profile in profiles]
+    assert [succeeded for succeeded, _ in outcomes] == [True] * len(profiles)
+    assert [result[:2] for _, result in outcomes] == [result[:2] for result in expected]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 SNAPSHOT DISQUE DU CATALOGUE - DÉMARRAGE À FROID ET FICHIERS REFUSÉS
+"""
+
+import os
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider
+from conftest import TODAY, random_catalog, random_profiles
+
+api = pytest.importorskip('api_recommendations_final')
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    directory = tmp_path / 'snapshots'
+    directory.mkdir(mode=0o700)
+    return directory
+
+def test_cold_start_serves_saved_catalog(snapshot_dir):
+    rows = random_catalog(200, seed=12)
+    path = str(snapshot_dir / 'catalog.snapshot')
+    writer = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows), snapshot_path=path)
+    writer.refresh_catalog()
+    
+    # Source vide : seul le snapshot disque peut fournir le catalogue
+    reader = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider([]), snapshot_path=path)
+    snapshot = reader._load_catalog_file()
+    assert snapshot is not None and snapshot.fingerprint == writer.catalog_fingerprint
+    
+    users = [api.UserProfileRequest(**profile) for profile in random_profiles(20, seed=3)]
+    assert [reader.recommend(user, TODAY)[0] for user in users] == [writer.recommend(user, TODAY)[0] for user in users]
+
+def test_missing_or_incompatible_file_ignored(snapshot_dir):
+    path = str(snapshot_dir / 'catalog.snapshot')
+    assert api.CatalogFile(path, ['schéma']).load() is None
+    
+    api.CatalogFile(path, ['schéma']).save({'scholarships': []})
+    assert api.CatalogFile(path, ['schéma']).load() == {'scholarships': []}
+    assert api.CatalogFile(path, ['autre schéma']).load() is None
+    
+    with open(path, 'wb') as fh:
+        fh.write(b'pas un snapshot')
+    assert api.CatalogFile(path, ['schéma']).load() is None
+
+@pytest.mark.parametrize('target', ['directory', 'file'])
+def test_writable_by_others_refused(snapshot_dir, target):
+    path = snapshot_dir / 'catalog.snapshot'
+    catalog_file = api.CatalogFile(str(path), ['schéma'])
+    catalog_file.save({'scholarships': []})
+    os.chmod(snapshot_dir if target == 'directory' else path, 0o777 if target == 'directory' else 0o666)
+    
+    with pytest.raises(PermissionError):
+        catalog_file.load()
+    if target == 'directory':
+        with pytest.raises(PermissionError):
+            catalog_file.save({'scholarships': []})
+
+def test_other_owner_refused(snapshot_dir, monkeypatch):
+    catalog_file = api.CatalogFile(str(snapshot_dir / 'catalog.snapshot'), ['schéma'])
+    catalog_file.save({'scholarships': []})
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(snapshot_dir).st_uid + 1, raising=False)
+    
+    with pytest.raises(PermissionError):
+        catalog_file.load()
+
+def test_refused_file_falls_back_to_source(snapshot_dir):
+    rows = random_catalog(50, seed=1)
+    path = str(snapshot_dir / 'catalog.snapshot')
+    api.HybridRecommendationEngineV2Plus(
+        catalog_provider=InMemoryCatalogProvider(rows), snapshot_path=path
+    ).refresh_catalog()
+    os.chmod(path, 0o666)
+    
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows), snapshot_path=path)
+    assert engine._load_catalog_file() is None
+    assert len(engine.refresh_catalog().scholarships) == len(rows)
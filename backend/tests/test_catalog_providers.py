@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 SOURCES DU CATALOGUE - POOL SQLITE ET PAGINATION
+"""
+
+import gc
+import os
+import threading
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider, SQLiteCatalogProvider, SQLiteConnectionPool
+from conftest import SCHOLARSHIP_COLUMNS, SCHOLARSHIPS
+
+def test_missing_database_is_not_created(tmp_path):
+    db_file = tmp_path / 'absent.db'
+    with pytest.raises(FileNotFoundError):
+        SQLiteConnectionPool(str(db_file))
+    assert not db_file.exists()
+
+def test_write_does_not_create_database(scholarship_db):
+    pool = SQLiteConnectionPool(scholarship_db, read_only=False)
+    try:
+        os.remove(scholarship_db)
+        assert not pool.write("CREATE TABLE other (id INTEGER)")
+        assert not os.path.exists(scholarship_db)
+    finally:
+        pool.close()
+
+def test_connections_of_finished_threads_are_released(scholarship_db):
+    pool = SQLiteConnectionPool(scholarship_db)
+    try:
+        def read():
+            pool.connection().execute("SELECT COUNT(*) FROM scholarship").fetchone()
+        
+        for _ in range(8):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        gc.collect()
+        
+        # Seule la connexion de surveillance reste ouverte
+        assert len(pool._connections) == 1
+        read()
+        assert len(pool._connections) == 2
+    finally:
+        pool.close()
+    assert len(pool._connections) == 0
+
+def test_sqlite_provider_pages(scholarship_db):
+    provider = SQLiteCatalogProvider(scholarship_db, page_size=2)
+    try:
+        pages = list(provider.iter_pages(['id', 'pays']))
+    finally:
+        provider.close()
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [row['pays'] for page in pages for row in page] == [row['pays'] for row in SCHOLARSHIPS]
+
+def test_in_memory_provider_since_watermark():
+    rows = [dict(row, updated_at=f"2030-01-0{row['id']}") for row in SCHOLARSHIPS]
+    provider = InMemoryCatalogProvider(rows, page_size=2)
+    
+    pages = list(provider.iter_pages(SCHOLARSHIP_COLUMNS, since=('updated_at', '2030-01-04')))
+    assert [row['id'] for page in pages for row in page] == [4, 5]
+    assert set(pages[0][0]) == set(SCHOLARSHIP_COLUMNS)
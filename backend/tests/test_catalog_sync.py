@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 SYNCHRONISATION DU CATALOGUE - RECHARGEMENTS, EMPREINTE, CACHE DE RÉSULTATS
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider, SQLiteCatalogProvider
+from conftest import PROFILE, TODAY, random_catalog, random_profiles
+
+api = pytest.importorskip('api_recommendations_final')
+
+class RecordingProvider(InMemoryCatalogProvider):
+    """Catalogue en mémoire qui note les lignes servies à chaque lecture"""
+    
+    def __init__(self, rows):
+        super().__init__(rows, page_size=50)
+        self.reads = []
+    
+    def iter_pages(self, columns, since=None):
+        read = []
+        self.reads.append((since, read))
+        for page in super().iter_pages(columns, since):
+            read.extend(row['id'] for row in page)
+            yield page
+
+def timestamped_catalog(size: int, seed: int) -> list:
+    return [dict(row, updated_at=f"2030-01-01T00:{row['id'] % 60:02d}:00") for row in random_catalog(size, seed)]
+
+def recommend_all(engine, profiles) -> list:
+    return [engine.recommend(api.UserProfileRequest(**profile), TODAY)[0] for profile in profiles]
+
+def language_scores(engine, **overrides) -> dict:
+    recommendations, _, _ = engine.recommend(api.UserProfileRequest(**dict(PROFILE, **overrides)), TODAY)
+    return {int(rec['id']): rec['criteriaBreakdown']['language'] for rec in recommendations}
+
+def test_description_only_edit_changes_fingerprint(scholarship_db):
+    conn = sqlite3.connect(scholarship_db)
+    conn.execute("UPDATE scholarship SET description = 'programme xyz' WHERE id = 3")
+    conn.commit()
+    provider = SQLiteCatalogProvider(scholarship_db)
+    try:
+        engine = api.HybridRecommendationEngineV2Plus(catalog_provider=provider)
+        engine.refresh_catalog()
+        before = engine._snapshot
+        assert language_scores(engine)[3] < 1.0
+        
+        # Seules les sous-chaînes de langues ('ang' dans 'gang') changent
+        conn.execute("UPDATE scholarship SET description = 'programme gang' WHERE id = 3")
+        conn.commit()
+        snapshot = engine.refresh_catalog()
+        
+        assert snapshot is not before
+        assert snapshot.fingerprint != before.fingerprint
+        assert language_scores(engine)[3] == 1.0
+        
+        fresh = api.HybridRecommendationEngineV2Plus(catalog_provider=provider)
+        assert fresh.refresh_catalog().fingerprint == snapshot.fingerprint
+    finally:
+        conn.close()
+        provider.close()
+
+def test_incremental_sync_matches_full_reload():
+    rows = timestamped_catalog(300, seed=8)
+    provider = RecordingProvider(rows)
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=provider, scoring_backend='scalar')
+    first = engine.refresh_catalog()
+    assert provider.reads[-1][0] is None
+    
+    # Ligne au watermark courant relue mais inchangée : même version
+    assert engine.refresh_catalog() is first
+    since, at_watermark = provider.reads[-1]
+    assert since == ('updated_at', '2030-01-01T00:59:00') and at_watermark
+    
+    rows[10] = dict(rows[10], description='programme gang', pays='Japon', updated_at='2030-02-01T00:00:00')
+    rows[20] = dict(rows[20], niveau_etude='Doctorat', updated_at='2030-02-01T00:00:00')
+    rows.append(dict(rows[30], id=301, titre='Top scholarship 301', updated_at='2030-02-02T00:00:00'))
+    snapshot = engine.refresh_catalog()
+    
+    assert provider.reads[-1] == (since, at_watermark + [11, 21, 301])
+    assert snapshot.version == first.version + 1
+    assert engine._watermark == '2030-02-02T00:00:00'
+    
+    fresh = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows),
+                                                 scoring_backend='scalar')
+    assert fresh.refresh_catalog().fingerprint == snapshot.fingerprint
+    assert snapshot.features == fresh._snapshot.features
+    profiles = random_profiles(30, seed=9)
+    assert recommend_all(engine, profiles) == recommend_all(fresh, profiles)
+
+def test_full_reload_drops_deleted_rows():
+    rows = timestamped_catalog(50, seed=2)
+    provider = RecordingProvider(rows)
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=provider, scoring_backend='scalar')
+    engine.refresh_catalog()
+    
+    # Suppression invisible pour la synchronisation incrémentale...
+    del rows[5]
+    assert len(engine.refresh_catalog().scholarships) == 50
+    
+    # ...rattrapée par le rechargement complet (FULL_RELOAD_HOURS)
+    engine._full_sync_timestamp -= timedelta(hours=engine.FULL_RELOAD_HOURS)
+    snapshot = engine.refresh_catalog()
+    assert provider.reads[-1][0] is None
+    assert len(snapshot.scholarships) == 49 and 6 not in snapshot.positions_by_id
+
+def test_result_cache_invalidated_by_new_catalog_version():
+    rows = timestamped_catalog(100, seed=4)
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows))
+    user = api.UserProfileRequest(**PROFILE)
+    
+    recommendations, _, _ = engine.recommend(user, TODAY)
+    assert engine.recommend(user, TODAY)[0] is recommendations
+    assert engine.cache_stats()['hits'] == 1
+    
+    # Rafraîchissement sans changement : version et cache conservés
+    engine.refresh_catalog()
+    assert engine.recommend(user, TODAY)[0] is recommendations
+    
+    top_id = int(recommendations[0]['id'])
+    rows[top_id - 1] = dict(rows[top_id - 1], date_limite=date.fromordinal(TODAY - 1).isoformat(),
+                            updated_at='2030-02-01T00:00:00')
+    version = engine.catalog_version
+    engine.refresh_catalog()
+    
+    assert engine.catalog_version == version + 1
+    assert engine.cache_stats()['size'] == 0
+    # Deadline passée : la bourse en tête perd sa place
+    assert engine.recommend(user, TODAY)[0][0]['id'] != str(top_id)
+
+# ===== RECOMMANDATIONS PRÉ-CALCULÉES =====
+
+class FakePrecomputedTable:
+    """Client Supabase réduit à la table profile_recommendations (select / eq / limit)"""
+    
+    def __init__(self):
+        self.rows = []
+        self.queries = 0
+        self.failing = False
+        self._filters = {}
+    
+    def table(self, name):
+        assert name == api.HybridRecommendationEngineV2Plus.PRECOMPUTED_TABLE
+        self._filters = {}
+        return self
+    
+    def select(self, columns):
+        return self
+    
+    def eq(self, column, value):
+        self._filters[column] = value
+        return self
+    
+    def limit(self, count):
+        return self
+    
+    def execute(self):
+        self.queries += 1
+        if self.failing:
+            raise RuntimeError('relation "profile_recommendations" does not exist')
+        data = [row for row in self.rows if all(row[k] == v for k, v in self._filters.items())]
+        return type('Response', (), {'data': data})()
+
+def precomputed_engine(rows):
+    client = FakePrecomputedTable()
+    engine = api.HybridRecommendationEngineV2Plus(
+        client, catalog_provider=InMemoryCatalogProvider(rows), use_precomputed=True
+    )
+    engine.refresh_catalog()
+    return engine, client
+
+def test_precomputed_rows_served_for_same_catalog_and_day():
+    rows = random_catalog(100, seed=6)
+    engine, client = precomputed_engine(rows)
+    user = api.UserProfileRequest(**PROFILE)
+    live = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows)).recommend(user, TODAY)[0]
+    stored = [dict(rec, reasons=['pré-calculé']) for rec in live]
+    client.rows = [
+        dict(profile_hash=engine.profile_hash(user), catalog_version=engine.catalog_fingerprint,
+             valid_on=date.fromordinal(TODAY).isoformat(), recommendations=stored),
+        dict(profile_hash=engine.profile_hash(user), catalog_version='autre-catalogue',
+             valid_on=date.fromordinal(TODAY + 1).isoformat(), recommendations=[])
+    ]
+    
+    assert engine.recommend(user, TODAY)[0] == stored
+    # Autre jour : pas de ligne valide, scoring en direct
+    assert engine.recommend(user, TODAY + 1)[0] == api.HybridRecommendationEngineV2Plus(
+        catalog_provider=InMemoryCatalogProvider(rows)).recommend(user, TODAY + 1)[0]
+
+def test_missing_precomputed_row_queried_once():
+    engine, client = precomputed_engine(random_catalog(100, seed=6))
+    user = api.UserProfileRequest(**PROFILE)
+    
+    recommendations = engine.recommend(user, TODAY)[0]
+    engine._result_cache.clear()
+    assert engine.recommend(user, TODAY)[0] == recommendations
+    assert client.queries == 1
+
+def test_precomputed_disabled_after_repeated_errors():
+    rows = timestamped_catalog(100, seed=6)
+    engine, client = precomputed_engine(rows)
+    client.failing = True
+    profiles = [api.UserProfileRequest(**profile) for profile in random_profiles(5, seed=1)]
+    
+    for user in profiles:
+        assert engine.recommend(user, TODAY)[0]  # scoring en direct malgré l'erreur
+    assert client.queries == engine.PRECOMPUTED_MAX_FAILURES
+    
+    # Réactivé avec le catalogue suivant
+    client.failing = False
+    rows[0] = dict(rows[0], titre='Changed', updated_at='2030-02-01T00:00:00')
+    engine.refresh_catalog()
+    engine.recommend(profiles[0], TODAY)
+    assert client.queries == engine.PRECOMPUTED_MAX_FAILURES + 1
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 MOTEURS SQLITE ET SUPABASE - MÊMES SCORES QUE LE NOYAU PARTAGÉ
+"""
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider, SQLiteCatalogProvider
+from conftest import EXPECTED_RANKING, PROFILE, SCHOLARSHIPS, TODAY
+
+api = pytest.importorskip('api_recommendations_final')
+import recommendation_engine_v2 as v2
+
+BACKENDS = ['scalar', pytest.param('vectorized', marks=pytest.mark.skipif(api.np is None, reason='numpy absent'))]
+
+def api_ranking(engine) -> list:
+    recommendations, total, _ = engine.recommend(api.UserProfileRequest(**PROFILE), TODAY)
+    assert total == len(SCHOLARSHIPS)
+    return [(int(rec['id']), rec['score']) for rec in recommendations]
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_api_engine_matches_reference(backend):
+    engine = api.HybridRecommendationEngineV2Plus(
+        catalog_provider=InMemoryCatalogProvider(SCHOLARSHIPS), scoring_backend=backend
+    )
+    assert api_ranking(engine) == EXPECTED_RANKING
+
+def test_api_engine_language_from_raw_text():
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(SCHOLARSHIPS))
+    recommendations, _, _ = engine.recommend(api.UserProfileRequest(**PROFILE), TODAY)
+    language = {int(rec['id']): rec['criteriaBreakdown']['language'] for rec in recommendations}
+    assert language == {1: 1.0, 2: 1.0, 3: 1.0, 4: 1.0, 5: 0.7}
+
+def test_api_engine_reads_sqlite_provider(scholarship_db):
+    provider = SQLiteCatalogProvider(scholarship_db)
+    try:
+        engine = api.HybridRecommendationEngineV2Plus(catalog_provider=provider)
+        assert api_ranking(engine) == EXPECTED_RANKING
+    finally:
+        provider.close()
+
+@pytest.mark.parametrize('prefilter', [False, True])
+def test_sqlite_engine_matches_reference(scholarship_db, prefilter):
+    engine = v2.HybridRecommendationEngineV2(scholarship_db, prefilter=prefilter)
+    try:
+        user = v2.UserProfile.from_dict(dict(PROFILE, id='u1', email='awa@example.org'))
+        recommendations = engine.recommend(user, top_n=len(SCHOLARSHIPS))
+        
+        # Aucune bourse écartée par le préfiltre ici (deadlines lointaines, niveaux compatibles) :
+        # même classement ; exclusions couvertes par test_sqlite_engine
+        assert [(rec.scholarship_id, round(rec.overall_score, 3)) for rec in recommendations] == EXPECTED_RANKING
+        language = {rec.scholarship_id: rec.component_scores['langue'] for rec in recommendations}
+        assert language == {1: 1.0, 2: 1.0, 3: 1.0, 4: 1.0, 5: 0.7}
+    finally:
+        engine.close()
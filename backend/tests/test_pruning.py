@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 BACKEND SCALAIRE ÉLAGUÉ - MÊME CLASSEMENT QUE LE SCAN COMPLET
+"""
+
+import logging
+import re
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider
+from conftest import TODAY, random_catalog, random_profiles
+
+api = pytest.importorskip('api_recommendations_final')
+
+CATALOG_SIZE = 600  # > PRUNED_CANDIDATE_POOL x 4 x 4 : plusieurs élargissements du pool possibles
+
+def make_engine(rows, **overrides):
+    engine = api.HybridRecommendationEngineV2Plus(
+        catalog_provider=InMemoryCatalogProvider(rows), scoring_backend='scalar'
+    )
+    for name, value in overrides.items():
+        setattr(engine, name, value)
+    engine.refresh_catalog()
+    return engine
+
+def recommend_all(engine, profiles) -> list:
+    return [engine.recommend(api.UserProfileRequest(**profile), TODAY)[0] for profile in profiles]
+
+@pytest.fixture(scope='module', params=['uniform', 'skewed'])
+def catalog(request):
+    rows = random_catalog(CATALOG_SIZE, seed=7)
+    if request.param == 'skewed':
+        # 9 bourses sur 10 en France : la diversification doit élargir le pool
+        for row in rows:
+            if row['id'] % 10:
+                row['pays'] = 'France'
+    return rows
+
+@pytest.fixture(scope='module')
+def profiles():
+    return random_profiles(60, seed=11)
+
+@pytest.fixture(scope='module')
+def full_scan(catalog, profiles):
+    # PRUNE_MAX_FRACTION = 0 : aucun élagage, toutes les bourses sont scorées
+    return recommend_all(make_engine(catalog, PRUNE_MAX_FRACTION=0), profiles)
+
+def test_pruned_ranking_matches_full_scan(catalog, profiles, full_scan, caplog):
+    with caplog.at_level(logging.INFO):
+        pruned = recommend_all(make_engine(catalog), profiles)
+    
+    assert pruned == full_scan
+    messages = [record.getMessage() for record in caplog.records]
+    scored = [int(match.group(1)) for match in (re.search(r'(\d+)/\d+ bourses scorées', m) for m in messages)
+              if match]
+    assert scored and min(scored) < CATALOG_SIZE // 2
+    if sum(row['pays'] == 'France' for row in catalog) > CATALOG_SIZE // 2:
+        assert any('élargissement' in m for m in messages)
+
+@pytest.mark.parametrize('bounds', [
+    {'PRUNE_MAX_TIERS': 1},
+    {'PRUNE_MAX_PLAN_NODES': 1},
+    {'PRUNED_CANDIDATE_POOL': 1, 'PRUNE_MAX_TIERS': 2, 'PRUNE_MAX_PLAN_NODES': 50},
+], ids=['tiers', 'nodes', 'all'])
+def test_bounded_plan_search_keeps_ranking(catalog, profiles, full_scan, bounds):
+    assert recommend_all(make_engine(catalog, **bounds), profiles) == full_scan
+
+def test_country_cap_matches_full_scan(catalog, profiles):
+    capped = recommend_all(make_engine(catalog, max_per_country=2, max_per_field=3), profiles)
+    reference = recommend_all(make_engine(catalog, max_per_country=2, max_per_field=3, PRUNE_MAX_FRACTION=0),
+                              profiles)
+    assert capped == reference
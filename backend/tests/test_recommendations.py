@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 MOTEUR SUPABASE - MÊMES RÉSULTATS QUE LE SCORING DE RÉFÉRENCE
+Catalogues aléatoires : scan complet par ScoringCore puis diversification sur
+toute la liste classée, comparés à recommend et recommend_batch.
+"""
+
+import pytest
+
+from catalog_providers import InMemoryCatalogProvider
+from conftest import TODAY, random_catalog, random_profiles
+from scoring_core import ScoringCore, country_key, diversify_ranked, field_key
+
+api = pytest.importorskip('api_recommendations_final')
+
+BACKENDS = ['scalar', pytest.param('vectorized', marks=pytest.mark.skipif(api.np is None, reason='numpy absent'))]
+
+def reference_ranking(rows, profile) -> list:
+    """(id, score) attendus : toutes les bourses scorées, tri stable, diversification sans pool"""
+    core = ScoringCore()
+    resolved = core.resolve_profile(
+        target_country=profile['target_country'],
+        origin_country=profile['origin_country'],
+        field_of_study=profile['field_of_study'],
+        education_level=profile['education_level'],
+        preferred_language=profile['preferred_language'],
+        scholarship_type=profile['scholarship_type'],
+        gpa=profile['gpa']
+    )
+    scored = [(row, core.score(resolved, core.build_features(row), TODAY)['overall_score']) for row in rows]
+    ranked = sorted(scored, key=lambda item: -item[1])
+    countries = len({country_key(row['pays']) for row in rows})
+    diverse, _ = diversify_ranked(
+        ranked, api.HybridRecommendationEngineV2Plus.MAX_RESULTS, countries,
+        lambda item: (country_key(item[0]['pays']), field_key(item[0]['domaine_etude']))
+    )
+    return [(str(row['id']), round(score, 3)) for row, score in diverse]
+
+def ranking(recommendations) -> list:
+    return [(rec['id'], rec['score']) for rec in recommendations]
+
+@pytest.fixture(scope='module', params=[0, 1, 2], ids=lambda seed: f"catalogue-{seed}")
+def case(request):
+    rows = random_catalog(300, seed=request.param)
+    profiles = random_profiles(40, seed=request.param + 20)
+    return rows, profiles, [reference_ranking(rows, profile) for profile in profiles]
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_recommend_matches_reference(case, backend):
+    rows, profiles, expected = case
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows),
+                                                  scoring_backend=backend)
+    
+    results = [engine.recommend(api.UserProfileRequest(**profile), TODAY) for profile in profiles]
+    assert [ranking(recommendations) for recommendations, _, _ in results] == expected
+    assert {total for _, total, _ in results} == {len(rows)}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_recommend_batch_matches_recommend(case, backend):
+    rows, profiles, expected = case
+    engine = api.HybridRecommendationEngineV2Plus(catalog_provider=InMemoryCatalogProvider(rows),
+                                                  scoring_backend=backend)
+    engine.BATCH_BLOCK_CELLS = 7 * len(rows)  # plusieurs blocs
+    users = [api.UserProfileRequest(**profile) for profile in profiles]
+    users += users[:3]  # doublons : calculés une fois
+    
+    outcomes = engine.recommend_batch(users, TODAY)
+    assert [succeeded for succeeded, _ in outcomes] == [True] * len(users)
+    assert [ranking(result[0]) for _, result in outcomes] == expected + expected[:3]
+    
+    engine._result_cache.clear()
+    assert [result[0] for _, result in outcomes] == [engine.recommend(user, TODAY)[0] for user in users]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 NOYAU DE SCORING PARTAGÉ - SCORES DE RÉFÉRENCE
+"""
+
+import dataclasses
+
+import pytest
+
+from conftest import PROFILE, SCHOLARSHIPS, TODAY
+from resolver_cache import clear_resolver_caches, resolver_cache_stats
+from scoring_core import ScoringCore, country_key, diversify_ranked, field_key
+
+# Critères attendus par bourse pour PROFILE
+EXPECTED_SCORES = {
+    1: {'country': 1.0, 'field': 1.0, 'level': 1.0, 'type': 1.0, 'origin': 0.0, 'language': 1.0, 'gpa': 0.65},
+    2: {'country': 0.7, 'field': 0.1, 'level': 1.0, 'type': 0.5, 'origin': 0.4, 'language': 1.0, 'gpa': 1.0},
+    3: {'country': 0.7, 'field': 0.1, 'level': 0.8, 'type': 0.5, 'origin': 0.0, 'language': 1.0, 'gpa': 0.85},
+    4: {'country': 0.1, 'field': 0.1, 'level': 0.6, 'type': 0.5, 'origin': 0.0, 'language': 1.0, 'gpa': 1.0},
+    5: {'country': 0.95, 'field': 0.6, 'level': 0.5, 'type': 0.85, 'origin': 0.0, 'language': 0.7, 'gpa': 0.65},
+}
+EXPECTED_OVERALL = {1: 0.899, 2: 0.62, 3: 0.543, 4: 0.348, 5: 0.668}
+
+def resolve(core: ScoringCore, **overrides):
+    profile = dict(PROFILE, **overrides)
+    return core.resolve_profile(
+        target_country=profile['target_country'],
+        origin_country=profile['origin_country'],
+        field_of_study=profile['field_of_study'],
+        education_level=profile['education_level'],
+        preferred_language=profile['preferred_language'],
+        scholarship_type=profile['scholarship_type'],
+        gpa=profile['gpa']
+    )
+
+@pytest.mark.parametrize('scholarship', SCHOLARSHIPS, ids=lambda s: f"bourse-{s['id']}")
+def test_core_scores_match_reference(scholarship):
+    core = ScoringCore()
+    result = core.score(resolve(core), core.build_features(scholarship), TODAY)
+    
+    assert result['scores'] == pytest.approx(EXPECTED_SCORES[scholarship['id']])
+    assert round(result['overall_score'], 3) == EXPECTED_OVERALL[scholarship['id']]
+    assert result['deadline_boost'] == 0.0
+
+def test_language_matches_raw_text_substring():
+    # 'ang' n'apparaît dans 'German language' que comme sous-chaîne brute
+    core = ScoringCore()
+    features = core.build_features(SCHOLARSHIPS[2])
+    profile = resolve(core)
+    
+    assert profile.language_tokens.isdisjoint(features.languages)
+    assert core.score_language(profile, features) == 1.0
+    assert core.score_language(dataclasses.replace(profile, language_probe_bit=0), features) < 1.0
+
+def test_language_not_mentioned_falls_back_to_defaults():
+    core = ScoringCore()
+    features = core.build_features(SCHOLARSHIPS[4])
+    
+    assert core.score_language(resolve(core, preferred_language='ang'), features) == 0.7
+    assert core.score_language(resolve(core, preferred_language=''), features) == 1.0
+
+def test_tags_from_source_give_same_features():
+    core = ScoringCore()
+    for scholarship in SCHOLARSHIPS:
+        features = core.build_features(scholarship)
+        tags = (features.languages, features.international, features.selectivity)
+        assert core.build_features(scholarship, tags=tags) == features
+
+def test_diversify_ranked_caps_per_country():
+    items = [('France', 'Informatique'), ('france', 'Droit'), ('Canada', 'Informatique'), ('France ', 'Arts')]
+    keys = lambda item: (country_key(item[0].strip()), field_key(item[1]))
+    
+    diverse, settled = diversify_ranked(items, 3, 2, keys, max_per_country=1)
+    assert diverse == [items[0], items[2], items[1]]
+    assert not settled
+    
+    diverse, settled = diversify_ranked(items, 2, 2, keys)
+    assert diverse == [items[0], items[2]]
+    assert settled
+
+def test_clear_resolver_caches():
+    core = ScoringCore()
+    resolve(core)
+    assert any(stats['size'] for stats in resolver_cache_stats().values())
+    
+    clear_resolver_caches()
+    assert all(stats['size'] == 0 for stats in resolver_cache_stats().values())
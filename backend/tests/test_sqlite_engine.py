@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 MOTEUR SQLITE - RECHARGEMENT SUR ÉCRITURE (PRAGMA DATA_VERSION), TAGS, PRÉFILTRE
+"""
+
+import sqlite3
+
+import pytest
+
+import recommendation_engine_v2 as v2
+from conftest import PROFILE, TODAY, create_scholarship_db, random_catalog, random_profiles
+from scoring_core import ScoringCore
+
+def recommend_ids(engine, top_n: int = 5) -> list:
+    user = v2.UserProfile.from_dict(dict(PROFILE, id='u1', email='awa@example.org'))
+    return [rec.scholarship_id for rec in engine.recommend(user, top_n=top_n)]
+
+def test_reload_after_write_from_same_process(scholarship_db):
+    engine = v2.HybridRecommendationEngineV2(scholarship_db)
+    try:
+        recommend_ids(engine)
+        loaded = engine._catalog
+        
+        # Connexion de maintenance du pool (même processus)
+        assert engine.pool.write("UPDATE scholarship SET pays = 'France' WHERE id = 5")
+        recommend_ids(engine)
+        assert engine._catalog is not loaded
+        assert engine._catalog.by_id[5].pays == 'France'
+        
+        # Connexion ouverte directement par le processus
+        loaded = engine._catalog
+        conn = sqlite3.connect(scholarship_db)
+        conn.execute("DELETE FROM scholarship WHERE id = 4")
+        conn.commit()
+        conn.close()
+        assert 4 not in recommend_ids(engine)
+        assert engine._catalog is not loaded
+        
+        # Sans écriture : catalogue en cache conservé
+        loaded = engine._catalog
+        recommend_ids(engine)
+        assert engine._catalog is loaded
+    finally:
+        engine.close()
+
+def stored_tags(engine) -> dict:
+    cursor = engine.conn.cursor()
+    cursor.execute(f"SELECT id, {', '.join(engine.TAG_COLUMNS)} FROM {engine.TAGS_TABLE}")
+    return {row[0]: (frozenset(row[1].split()), bool(row[2]), row[3]) for row in cursor.fetchall()}
+
+def test_tags_follow_inserts_updates_and_deletes(tmp_path):
+    rows = random_catalog(40, seed=5)
+    db_file = create_scholarship_db(str(tmp_path / 'tags.db'), rows[:30])
+    engine = v2.HybridRecommendationEngineV2(db_file)
+    conn = sqlite3.connect(db_file)
+    try:
+        by_id = {row['id']: dict(row) for row in rows[:30]}
+        
+        columns = list(rows[0])
+        conn.executemany(f"INSERT INTO scholarship ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                         [[row[column] for column in columns] for row in rows[30:]])
+        by_id.update((row['id'], dict(row)) for row in rows[30:])
+        
+        for scholarship_id, description in [(3, 'german language'), (4, 'programme gang'), (5, '')]:
+            conn.execute("UPDATE scholarship SET description = ? WHERE id = ?", (description, scholarship_id))
+            by_id[scholarship_id]['description'] = description
+        conn.execute("UPDATE scholarship SET titre = 'Top excellence', pays = 'Japon' WHERE id = 6")
+        by_id[6]['titre'] = 'Top excellence'
+        conn.execute("DELETE FROM scholarship WHERE id IN (7, 35)")
+        del by_id[7], by_id[35]
+        conn.commit()
+        
+        assert stored_tags(engine) == {
+            scholarship_id: v2.text_tags(row['titre'], row['description'], row['domaine_etude'])
+            for scholarship_id, row in by_id.items()
+        }
+    finally:
+        conn.close()
+        engine.close()
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_prefilter_matches_full_scan_of_kept_rows(tmp_path, monkeypatch, seed):
+    monkeypatch.setattr(v2.ScoringCore, 'today', staticmethod(lambda: TODAY))
+    rows = random_catalog(300, seed=seed)
+    engine = v2.HybridRecommendationEngineV2(create_scholarship_db(str(tmp_path / 'full.db'), rows), prefilter=True)
+    references = {}
+    try:
+        for i, profile in enumerate(random_profiles(40, seed=seed + 10)):
+            user = v2.UserProfile.from_dict(dict(profile, id=f"u{i}", email='profil@example.org'))
+            level_value = engine.resolve_profile(user).level_value
+            
+            # Référence : scan complet d'une base sans les bourses que le préfiltre doit écarter
+            if level_value not in references:
+                kept = [
+                    row for row in rows
+                    if engine.core.analyze_deadline(engine.core.build_features(row), TODAY)[0] != 'fermé'
+                    and (level_value is None or not row['niveau_etude']
+                         or engine.core.score_level_label(level_value, row['niveau_etude'])
+                         != ScoringCore.LEVEL_MISMATCH_SCORE)
+                ]
+                assert len(kept) < len(rows)
+                references[level_value] = v2.HybridRecommendationEngineV2(
+                    create_scholarship_db(str(tmp_path / f"kept-{level_value}.db"), kept)
+                )
+            expected = [(rec.scholarship_id, rec.overall_score) for rec in references[level_value].recommend(user)]
+            
+            assert [(rec.scholarship_id, rec.overall_score) for rec in engine.recommend(user)] == expected
+    finally:
+        engine.close()
+        for reference in references.values():
+            reference.close()
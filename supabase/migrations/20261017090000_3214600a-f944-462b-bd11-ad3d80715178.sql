@@ -0,0 +1,15 @@
+-- Precomputed recommendations (nightly job: backend/precompute_recommendations.py)
+-- One row per scoring profile hash, valid for one catalog fingerprint and one day
+CREATE TABLE public.profile_recommendations (
+  profile_hash text PRIMARY KEY,
+  catalog_version text NOT NULL,
+  valid_on date NOT NULL,
+  recommendations jsonb NOT NULL,
+  total_analyzed integer NOT NULL DEFAULT 0,
+  computed_at timestamptz NOT NULL DEFAULT now()
+);
+
+ALTER TABLE public.profile_recommendations ENABLE ROW LEVEL SECURITY;
+
+-- No policy: anon and authenticated clients can neither read nor write this table.
+-- Only the backend (API and nightly job) uses it, with the service role, which bypasses RLS.